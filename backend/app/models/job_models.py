@@ -13,6 +13,12 @@ class ExperienceLevel(str, Enum):
     EXECUTIVE = "executive"
 
 
+class TailorMode(str, Enum):
+    """Enum for resume tailoring modes"""
+    FULL = "full"
+    SECTIONS = "sections"
+
+
 class ApiKeys(BaseModel):
     """Model for API keys"""
     serpapi_key: Optional[str] = Field(None, description="SerpAPI key for job searching")
@@ -26,6 +32,18 @@ class JobSearchRequest(BaseModel):
     experience: Optional[ExperienceLevel] = Field(None, description="Experience level requirement")
     job_count: int = Field(default=10, ge=1, le=50, description="Number of jobs to return (1-50)")
     api_keys: ApiKeys = Field(..., description="API keys for external services")
+    resume_text: Optional[str] = Field(None, description="Resume text to score every job against (sets ats_score)")
+
+
+class AtsScore(BaseModel):
+    """ATS-style match of a resume against one job description"""
+    score: float = Field(..., description="Overall match from 0 to 100")
+    keyword_coverage: float = Field(..., description="Weighted share of the job's keywords found in the resume (0-1)")
+    section_completeness: float = Field(..., description="Share of the sections the job calls for that the resume has (0-1)")
+    length_balance: float = Field(..., description="1 when the resume length is in the recommended range, lower outside it")
+    matched_keywords: List[str] = Field(default_factory=list, description="Most important job keywords the resume contains")
+    missing_keywords: List[str] = Field(default_factory=list, description="Most important job keywords the resume lacks")
+    missing_sections: List[str] = Field(default_factory=list, description="Sections the job calls for that the resume lacks")
 
 
 class JobResult(BaseModel):
@@ -37,6 +55,7 @@ class JobResult(BaseModel):
     job_url: Optional[str] = Field(None, description="URL to apply for the job")
     job_id: Optional[str] = Field(None, description="Unique job identifier")
     raw_data: Optional[Dict[str, Any]] = Field(None, description="Raw job data from API")
+    ats_score: Optional[AtsScore] = Field(None, description="Match against the resume, when the request included one")
 
 
 class JobSearchResponse(BaseModel):
@@ -47,13 +66,83 @@ class JobSearchResponse(BaseModel):
     total_count: int = Field(default=0, description="Total number of jobs found")
 
 
+class MultiJobSearchRequest(BaseModel):
+    """Request model for a search fanned out over several titles and locations"""
+    job_titles: List[str] = Field(..., min_length=1, max_length=5, description="Job titles to search for (1-5)")
+    locations: List[str] = Field(..., min_length=1, max_length=5, description="Locations to search in (1-5)")
+    experience: Optional[ExperienceLevel] = Field(None, description="Experience level requirement")
+    job_count: int = Field(default=10, ge=1, le=50, description="Number of jobs to fetch per title and location (1-50)")
+    rank: bool = Field(default=False, description="Rank jobs returned by several queries and near the top of results first")
+    api_keys: ApiKeys = Field(..., description="API keys for external services")
+    resume_text: Optional[str] = Field(None, description="Resume text to score every job against (sets ats_score)")
+
+
+class QueryTiming(BaseModel):
+    """Outcome of one title and location query of a fan-out search"""
+    job_title: str = Field(..., description="Job title searched")
+    location: str = Field(..., description="Location searched")
+    job_count: int = Field(default=0, description="Number of jobs the query returned")
+    duration_ms: float = Field(..., description="Time taken by the query in milliseconds")
+    error: Optional[str] = Field(None, description="Error message if the query failed")
+
+
+class MultiJobSearchResponse(BaseModel):
+    """Response model for a fan-out job search"""
+    success: bool = Field(..., description="Whether the search was successful")
+    message: str = Field(..., description="Response message")
+    jobs: List[JobResult] = Field(default_factory=list, description="Merged job results, deduplicated by job id")
+    total_count: int = Field(default=0, description="Total number of unique jobs found")
+    queries: List[QueryTiming] = Field(default_factory=list, description="Per-query job counts and timings")
+
+
+class AtsScoreRequest(BaseModel):
+    """Request model for scoring a resume against job results"""
+    resume_text: str = Field(..., min_length=1, description="Resume text to score")
+    jobs: List[JobResult] = Field(..., min_length=1, max_length=1000, description="Jobs to score the resume against (1-1000)")
+    sort: bool = Field(default=False, description="Return the best matching jobs first")
+
+
+class AtsScoreResponse(BaseModel):
+    """Response model for ATS scoring"""
+    success: bool = Field(..., description="Whether the scoring was successful")
+    message: str = Field(..., description="Response message")
+    jobs: List[JobResult] = Field(default_factory=list, description="The jobs with ats_score set")
+    total_count: int = Field(default=0, description="Number of jobs scored")
+
+
+class TopJobsRequest(BaseModel):
+    """Request model for streaming the best matching jobs of several searches"""
+    job_titles: List[str] = Field(..., min_length=1, max_length=5, description="Job titles to search for (1-5)")
+    locations: List[str] = Field(..., min_length=1, max_length=5, description="Locations to search in (1-5)")
+    experience: Optional[ExperienceLevel] = Field(None, description="Experience level requirement")
+    pages: int = Field(default=3, ge=1, le=10, description="Result pages to fetch per title and location (1-10)")
+    top_k: int = Field(default=10, ge=1, le=50, description="Number of best matching jobs to keep (1-50)")
+    resume_text: str = Field(..., min_length=1, description="Resume text the jobs are ranked against")
+    api_keys: ApiKeys = Field(..., description="API keys for external services")
+
+
+class TopJobsSnapshot(BaseModel):
+    """One line of the top jobs stream: the best jobs among those scored so far"""
+    final: bool = Field(..., description="Whether every page has been scored; earlier snapshots are provisional")
+    jobs: List[JobResult] = Field(default_factory=list, description="Best matching jobs so far, highest ats_score first")
+    jobs_scored: int = Field(default=0, description="Unique jobs scored so far")
+    pages_fetched: int = Field(default=0, description="Result pages scored so far")
+    queries: List[QueryTiming] = Field(default_factory=list, description="Per-query job counts and timings, in the final snapshot")
+
+
 class ResumeTailorRequest(BaseModel):
     """Request model for resume tailoring"""
-    resume_text: str = Field(..., min_length=1, description="Original resume text content")
+    resume_text: Optional[str] = Field(None, min_length=1, description="Original resume text content; send this or resume_id")
+    resume_id: Optional[str] = Field(None, description="resume_id of a stored resume profile, instead of resume_text")
     job_description: str = Field(..., min_length=1, description="Job description to tailor resume for")
     job_title: str = Field(..., min_length=1, max_length=200, description="Job title")
     company_name: str = Field(..., min_length=1, max_length=200, description="Company name")
     api_keys: ApiKeys = Field(..., description="API keys for external services")
+    mode: TailorMode = Field(TailorMode.FULL, description="Rewrite the whole resume, or only its job-sensitive sections")
+    allow_draft: bool = Field(False, description="Accept a cached tailoring of this resume for a near-identical job description")
+    refresh_draft: bool = Field(True, description="When a draft is returned, tailor for this exact job description in the background")
+    fit_pages: int = Field(0, ge=0, le=4, description="PDF only: scale fonts and spacing to fill at most this many pages; 0, the default, keeps the fixed layout")
+    theme: str = Field("classic", description="PDF only: layout theme, see GET /api/v1/resume/themes")
 
 
 class ResumeTailorResponse(BaseModel):
@@ -62,11 +151,14 @@ class ResumeTailorResponse(BaseModel):
     message: str = Field(..., description="Response message")
     tailored_resume_text: Optional[str] = Field(None, description="Tailored resume text")
     filename: Optional[str] = Field(None, description="Suggested filename for the tailored resume")
+    draft: bool = Field(False, description="Whether the text was tailored for a similar job description rather than this one")
+    similarity: Optional[float] = Field(None, description="Similarity of the job description the cached text was tailored for")
 
 
 class ResumeParseRequest(BaseModel):
     """Request model for resume parsing"""
-    resume_text: str = Field(..., min_length=1, description="Resume text to parse")
+    resume_text: Optional[str] = Field(None, min_length=1, description="Resume text to parse; send this or resume_id")
+    resume_id: Optional[str] = Field(None, description="resume_id of a stored resume profile, instead of resume_text")
     api_keys: ApiKeys = Field(..., description="API keys for external services")
 
 
@@ -75,14 +167,19 @@ class ResumeParseResponse(BaseModel):
     success: bool = Field(..., description="Whether the parsing was successful")
     message: str = Field(..., description="Response message")
     parsed_data: Optional[Dict[str, str]] = Field(None, description="Parsed resume data in sections")
+    resume_id: Optional[str] = Field(None, description="Id of the stored resume profile, to send instead of the resume text")
+    keywords: List[str] = Field(default_factory=list, description="Most frequent keywords of the resume")
 
 
 class ResumePDFGenerateRequest(BaseModel):
     """Request model for generating PDF from tailored resume text"""
-    tailored_resume_text: str = Field(..., min_length=1, description="Tailored resume text content")
+    tailored_resume_text: Optional[str] = Field(None, min_length=1, description="Tailored resume text content; send this or resume_id")
+    resume_id: Optional[str] = Field(None, description="resume_id of a stored resume profile, instead of tailored_resume_text")
     job_title: str = Field(..., min_length=1, max_length=200, description="Job title")
     company_name: str = Field(..., min_length=1, max_length=200, description="Company name")
     api_keys: ApiKeys = Field(..., description="API keys for external services")
+    fit_pages: int = Field(0, ge=0, le=4, description="Scale fonts and spacing to fill at most this many pages; 0, the default, keeps the fixed layout")
+    theme: str = Field("classic", description="Layout theme, see GET /api/v1/resume/themes")
 
 
 class ErrorResponse(BaseModel):
@@ -0,0 +1,74 @@
+from fastapi import APIRouter, HTTPException, status, Header
+from fastapi.responses import FileResponse
+from typing import List, Optional
+import os
+import re
+import logging
+
+from app.models.job_models import ErrorResponse
+from app.services.profiler import is_admin_token, list_profiles, profile_path
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/api/v1/admin",
+    tags=["admin"],
+    responses={
+        403: {"model": ErrorResponse},
+        404: {"model": ErrorResponse}
+    }
+)
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]{8}_[0-9]{6}_[0-9a-f]{8}$")
+
+
+def require_admin(x_admin_token: Optional[str]) -> None:
+    """Reject requests without a valid admin token."""
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin token is required"
+        )
+
+
+@router.get(
+    "/profiles",
+    response_model=List[str],
+    status_code=status.HTTP_200_OK,
+    summary="List request profiles",
+    description="List ids of stored request profiles, newest first"
+)
+async def get_profiles(x_admin_token: Optional[str] = Header(None)) -> List[str]:
+    """
+    List stored request profiles. Requires the `X-Admin-Token` header.
+    """
+    require_admin(x_admin_token)
+    return list_profiles()
+
+
+@router.get(
+    "/profiles/{profile_id}",
+    status_code=status.HTTP_200_OK,
+    summary="Download a request profile",
+    description="Download a profile in collapsed-stack format for flamegraph.pl or speedscope",
+    response_class=FileResponse
+)
+async def get_profile(profile_id: str, x_admin_token: Optional[str] = Header(None)):
+    """
+    Download a stored request profile. Requires the `X-Admin-Token` header.
+
+    Profiles are recorded by sending `X-Profile: 1` and `X-Admin-Token` with any request;
+    the id is returned in the `X-Profile-Id` response header.
+    """
+    require_admin(x_admin_token)
+
+    path = profile_path(profile_id)
+    if not PROFILE_ID_PATTERN.match(profile_id) or not os.path.exists(path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+
+    return FileResponse(path, media_type="text/plain", filename=f"{profile_id}.collapsed")
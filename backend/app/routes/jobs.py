@@ -1,15 +1,27 @@
-from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import JSONResponse
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import List, Optional
+import asyncio
 import logging
+import time
 
 from app.models.job_models import (
     JobSearchRequest, 
     JobSearchResponse, 
+    MultiJobSearchRequest,
+    MultiJobSearchResponse,
+    AtsScoreRequest,
+    AtsScoreResponse,
+    TopJobsRequest,
     ErrorResponse,
     JobResult
 )
-from app.services.job_service import find_jobs
+from app.services.ats_score import score_job_results
+from app.services.fanout_search import fan_out_search
+from app.services.job_store import JOB_STORE_ENABLED, search_local_jobs
+from app.services.json_response import json_response
+from app.services.search_cache import search_jobs_cached
+from app.services.top_jobs import stream_top_jobs
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -41,6 +53,7 @@ async def search_jobs(request: JobSearchRequest) -> JobSearchResponse:
     - **experience**: Experience level (optional)
     - **job_count**: Number of jobs to return (1-50, default: 10)
     - **api_keys**: API keys including serpapi_key (required)
+    - **resume_text**: Resume to score every job against, setting `ats_score` (optional)
     
     Returns a list of job results with company information, descriptions, and application links.
     """
@@ -51,14 +64,16 @@ async def search_jobs(request: JobSearchRequest) -> JobSearchResponse:
         if not request.api_keys or not request.api_keys.serpapi_key:
             raise ValueError("SerpAPI key is required")
         
-        # Call the job service
-        jobs = await find_jobs(
+        # Call the job service; popular searches are answered from the search cache
+        jobs = await search_jobs_cached(
             job_title=request.job_title,
             location=request.location,
             experience=request.experience.value if request.experience else None,
             job_count=request.job_count,
             serpapi_key=request.api_keys.serpapi_key
         )
+        if request.resume_text:
+            jobs = await asyncio.to_thread(score_job_results, request.resume_text, jobs)
         
         response = JobSearchResponse(
             success=True,
@@ -68,7 +83,7 @@ async def search_jobs(request: JobSearchRequest) -> JobSearchResponse:
         )
         
         logger.info(f"Successfully returned {len(jobs)} jobs")
-        return response
+        return json_response(response)
         
     except ValueError as e:
         logger.error(f"Configuration error: {e}")
@@ -84,6 +99,203 @@ async def search_jobs(request: JobSearchRequest) -> JobSearchResponse:
         )
 
 
+@router.post(
+    "/search-multi",
+    response_model=MultiJobSearchResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Search several titles and locations at once",
+    description="Run a job search for every combination of titles and locations concurrently and merge the results"
+)
+async def search_jobs_multi(request: MultiJobSearchRequest) -> MultiJobSearchResponse:
+    """
+    Fan a job search out over several titles and locations.
+
+    - **job_titles**: Job titles to search for (1-5)
+    - **locations**: Locations to search in (1-5)
+    - **experience**: Experience level (optional)
+    - **job_count**: Number of jobs to fetch per title and location (1-50, default: 10)
+    - **rank**: Put jobs returned by several queries, and near the top of results, first
+    - **api_keys**: API keys including serpapi_key (required)
+    - **resume_text**: Resume to score every job against, setting `ats_score` (optional)
+
+    Returns the merged jobs, deduplicated by job id, and the job count and time of each query.
+    Queries that fail are reported in `queries` without failing the whole search.
+    """
+    try:
+        logger.info(f"Fan-out job search request: {request.job_titles} in {request.locations}")
+
+        if not request.api_keys or not request.api_keys.serpapi_key:
+            raise ValueError("SerpAPI key is required")
+
+        jobs, queries = await fan_out_search(
+            job_titles=request.job_titles,
+            locations=request.locations,
+            experience=request.experience.value if request.experience else None,
+            job_count=request.job_count,
+            serpapi_key=request.api_keys.serpapi_key,
+            rank=request.rank
+        )
+
+        failed = [query for query in queries if query.error]
+        if len(failed) == len(queries):
+            raise Exception(failed[0].error)
+        if request.resume_text:
+            jobs = await asyncio.to_thread(score_job_results, request.resume_text, jobs)
+
+        logger.info(f"Fan-out search returned {len(jobs)} unique jobs from {len(queries)} queries")
+        return json_response(MultiJobSearchResponse(
+            success=True,
+            message=f"Found {len(jobs)} unique jobs across {len(queries) - len(failed)} of {len(queries)} searches",
+            jobs=jobs,
+            total_count=len(jobs),
+            queries=queries
+        ))
+
+    except ValueError as e:
+        logger.error(f"Configuration error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Server configuration error. Please contact support."
+        )
+    except Exception as e:
+        logger.error(f"Error during fan-out job search: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search for jobs: {str(e)}"
+        )
+
+
+@router.post(
+    "/ats-score",
+    response_model=AtsScoreResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Score a resume against jobs",
+    description="ATS-style match of a resume against every job of a search result, computed locally"
+)
+async def ats_score_jobs(request: AtsScoreRequest) -> AtsScoreResponse:
+    """
+    Score a resume against up to 1000 jobs without calling Gemini.
+
+    - **resume_text**: Resume text to score (required)
+    - **jobs**: Jobs to score against, as returned by the search endpoints (1-1000)
+    - **sort**: Return the best matching jobs first (default: false)
+
+    Each job gets an `ats_score` combining keyword coverage, section completeness and
+    length balance, with the most important matched and missing keywords.
+    """
+    try:
+        jobs = await asyncio.to_thread(score_job_results, request.resume_text, request.jobs)
+        if request.sort:
+            jobs.sort(key=lambda job: -job.ats_score.score)
+        return json_response(AtsScoreResponse(
+            success=True,
+            message=f"Scored the resume against {len(jobs)} jobs",
+            jobs=jobs,
+            total_count=len(jobs)
+        ))
+    except Exception as e:
+        logger.error(f"Error scoring jobs: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to score jobs: {str(e)}"
+        )
+
+
+@router.post(
+    "/top",
+    status_code=status.HTTP_200_OK,
+    summary="Stream the best matching jobs",
+    description="Page through several searches and stream the jobs that best match a resume as NDJSON snapshots",
+    responses={200: {"content": {"application/x-ndjson": {}}}}
+)
+async def top_jobs(request: TopJobsRequest) -> StreamingResponse:
+    """
+    Rank the jobs of several result pages of every title and location against a resume.
+
+    - **job_titles**: Job titles to search for (1-5)
+    - **locations**: Locations to search in (1-5)
+    - **experience**: Experience level (optional)
+    - **pages**: Result pages to fetch per title and location (1-10, default: 3)
+    - **top_k**: Number of best matching jobs to keep (1-50, default: 10)
+    - **resume_text**: Resume text the jobs are ranked by `ats_score` against (required)
+    - **api_keys**: API keys including serpapi_key (required)
+
+    Streams one JSON snapshot per line whenever a page changes the best jobs, then a
+    last one with `final` set and the job count and time of each query. Queries that
+    fail are reported in `queries` of the final snapshot.
+    """
+    if not request.api_keys or not request.api_keys.serpapi_key:
+        logger.error("Configuration error: SerpAPI key is required")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Server configuration error. Please contact support."
+        )
+
+    logger.info(f"Top jobs request: {request.job_titles} in {request.locations}, {request.pages} pages")
+    snapshots = stream_top_jobs(
+        job_titles=request.job_titles,
+        locations=request.locations,
+        experience=request.experience.value if request.experience else None,
+        pages=request.pages,
+        top_k=request.top_k,
+        resume_text=request.resume_text,
+        serpapi_key=request.api_keys.serpapi_key
+    )
+
+    async def lines():
+        # Closing the snapshots when the client goes away cancels the searches still running
+        try:
+            async for snapshot in snapshots:
+                yield snapshot.model_dump_json() + "\n"
+        finally:
+            await snapshots.aclose()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get(
+    "/local-search",
+    response_model=JobSearchResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Search previously seen jobs",
+    description="Full-text search over job postings stored from earlier searches, without calling SerpApi"
+)
+async def local_search_jobs(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to match in title, company or description"),
+    location: Optional[str] = Query(None, max_length=100, description="Only postings whose location contains this"),
+    limit: int = Query(10, ge=1, le=50, description="Number of jobs to return (1-50)"),
+    max_age_days: Optional[float] = Query(None, gt=0, description="Only postings seen within this many days")
+) -> JobSearchResponse:
+    """
+    Search job postings stored from earlier /search calls.
+
+    Every word must match; the last one also matches as a prefix. Results are ranked
+    by relevance, with title matches weighted above company and description matches.
+    """
+    if not JOB_STORE_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="The local job store is disabled"
+        )
+
+    try:
+        start = time.perf_counter()
+        jobs = await asyncio.to_thread(search_local_jobs, q, location, limit, max_age_days)
+        logger.info(f"Local search '{q}' returned {len(jobs)} jobs in {(time.perf_counter() - start) * 1000:.1f}ms")
+        return json_response(JobSearchResponse(
+            success=True,
+            message=f"Found {len(jobs)} stored jobs for '{q}'",
+            jobs=jobs,
+            total_count=len(jobs)
+        ))
+    except Exception as e:
+        logger.error(f"Error during local job search: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search stored jobs: {str(e)}"
+        )
+
+
 @router.get(
     "/health",
     status_code=status.HTTP_200_OK,
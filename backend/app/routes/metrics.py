@@ -0,0 +1,20 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from app.services.metrics import render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get(
+    "/metrics",
+    include_in_schema=False,
+    summary="Prometheus metrics",
+    description="Expose request, upstream and pipeline metrics in the Prometheus text format"
+)
+async def metrics():
+    """
+    Prometheus scrape endpoint, aggregated across all gunicorn workers.
+    """
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status, UploadFile, File, Form, Header
 from fastapi.responses import Response
-from typing import Optional
-import PyPDF2
+from typing import Optional, Tuple
 from io import BytesIO
+import asyncio
 import logging
+import time
 
 from app.models.job_models import (
     ResumeTailorRequest,
@@ -11,14 +12,36 @@ from app.models.job_models import (
     ResumeParseRequest,
     ResumeParseResponse,
     ResumePDFGenerateRequest,
+    TailorMode,
     ErrorResponse
 )
 from app.services.resume_service import (
     generate_tailored_pdf,
     generate_pdf_from_tailored_text,
+    parse_gemini_output_to_dict,
     parse_resume_only,
+    render_sections,
+    render_tailored_pdf,
+    resume_keywords,
+    stored_resume_id,
+    tailor_resume_sections,
+    tailor_resume_structured,
     tailor_resume_with_llm
 )
+from app.services.json_response import json_response
+from app.services.metrics import PDF_EXTRACTION_PAGE_LATENCY, record_cache_lookup
+from app.services.pdf_themes import DEFAULT_THEME, THEMES, theme_names
+from app.services.render_cache import PDF_KEY_PATTERN, RenderedPDF, cached_pdf_path, pdf_response
+from app.services.resume_store import (
+    RESUME_ID_PATTERN,
+    RESUME_STORE_ENABLED,
+    find_profile_by_pdf,
+    get_profile,
+    pdf_hash,
+    save_profile
+)
+from app.services.tailor_cache import tailor_with_cache
+from app.services.tracing import start_span
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -34,13 +57,81 @@ router = APIRouter(
 )
 
 
+def check_theme(theme: str) -> None:
+    """Reject PDF requests for themes that are not registered."""
+    if theme not in THEMES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown theme '{theme}', choose one of: {', '.join(theme_names())}"
+        )
+
+
+async def resolve_resume_text(resume_text: Optional[str], resume_id: Optional[str]) -> str:
+    """The resume text of a request, sent as text or as the resume_id of a stored profile."""
+    if (resume_text is None) == (resume_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Send either the resume text or a resume_id"
+        )
+    if resume_text is not None:
+        return resume_text
+
+    profile = None
+    if RESUME_STORE_ENABLED and RESUME_ID_PATTERN.fullmatch(resume_id):
+        profile = await asyncio.to_thread(get_profile, resume_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found or no longer stored; send the resume text instead"
+        )
+    return profile.resume_text
+
+
+async def resume_text_from_pdf(file_content: bytes) -> Tuple[str, Optional[str]]:
+    """
+    Text and resume_id of an uploaded resume PDF.
+
+    A PDF stored before is answered from its profile without extracting the text
+    again. Store failures never fail the upload; the resume_id is None then.
+    """
+    if not RESUME_STORE_ENABLED:
+        return extract_text_from_pdf(file_content), None
+
+    content_hash = pdf_hash(file_content)
+    try:
+        profile = await asyncio.to_thread(find_profile_by_pdf, content_hash)
+    except Exception as e:
+        logger.error(f"Resume store lookup failed: {e}")
+        profile = None
+    record_cache_lookup("resume_pdf", profile is not None)
+    if profile is not None:
+        return profile.resume_text, profile.resume_id
+
+    resume_text = extract_text_from_pdf(file_content)
+    if not resume_text.strip():
+        return resume_text, None
+    try:
+        resume_id = await asyncio.to_thread(save_profile, resume_text, content_hash=content_hash)
+    except Exception as e:
+        logger.error(f"Failed to store resume profile: {e}")
+        resume_id = None
+    return resume_text, resume_id
+
+
 def extract_text_from_pdf(file_content: bytes) -> str:
     """Extract text from PDF file content."""
+    # Deferred so workers that never see an upload don't pay for the import
+    import PyPDF2
+
     try:
-        pdf_reader = PyPDF2.PdfReader(BytesIO(file_content))
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
+        with start_span("pypdf2.extract_text", **{"pdf.size_bytes": len(file_content)}) as span:
+            pdf_reader = PyPDF2.PdfReader(BytesIO(file_content))
+            text = ""
+            for page in pdf_reader.pages:
+                start = time.perf_counter()
+                text += page.extract_text()
+                PDF_EXTRACTION_PAGE_LATENCY.observe(time.perf_counter() - start)
+            span.set_attributes({"pdf.page_count": len(pdf_reader.pages), "pdf.text_chars": len(text)})
         return text
     except Exception as e:
         logger.error(f"Error reading PDF file: {e}")
@@ -57,15 +148,19 @@ def extract_text_from_pdf(file_content: bytes) -> str:
     summary="Tailor resume for a specific job",
     description="Use AI to tailor a resume for a specific job posting to improve selection chances"
 )
-async def tailor_resume(request: ResumeTailorRequest) -> ResumeTailorResponse:
+async def tailor_resume(request: ResumeTailorRequest, background_tasks: BackgroundTasks) -> ResumeTailorResponse:
     """
     Tailor a resume for a specific job using AI.
     
     - **resume_text**: Original resume text content
+    - **resume_id**: Instead of resume_text, the id of a stored resume, as returned by /parse or /extract-from-pdf
     - **job_description**: Job description to tailor resume for
     - **job_title**: Job title for the position
     - **company_name**: Company name for the position
     - **api_keys**: API keys including gemini_api_key (required)
+    - **mode**: "full" (default) rewrites the whole resume; "sections" rewrites only the summary, competencies, experience and projects
+    - **allow_draft**: Return a cached tailoring for a near-identical job description as a draft
+    - **refresh_draft**: Tailor for this exact job description in the background after returning a draft (default: true)
     
     Returns a tailored resume text optimized for the specific job posting.
     """
@@ -78,13 +173,33 @@ async def tailor_resume(request: ResumeTailorRequest) -> ResumeTailorResponse:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Gemini API key is required"
             )
+        resume_text = await resolve_resume_text(request.resume_text, request.resume_id)
         
         # Tailor the resume using AI
-        tailored_resume = await tailor_resume_with_llm(
-            resume_text=request.resume_text,
-            job_description=request.job_description,
-            gemini_api_key=request.api_keys.gemini_api_key
-        )
+        async def tailor():
+            if request.mode == TailorMode.SECTIONS:
+                tailored_sections = await tailor_resume_sections(
+                    resume_text=resume_text,
+                    job_description=request.job_description,
+                    gemini_api_key=request.api_keys.gemini_api_key
+                )
+                return render_sections(tailored_sections) if tailored_sections else None
+            return await tailor_resume_with_llm(
+                resume_text=resume_text,
+                job_description=request.job_description,
+                gemini_api_key=request.api_keys.gemini_api_key
+            )
+
+        with start_span("resume.tailor", **{"resume.chars": len(resume_text), "job.description_chars": len(request.job_description), "resume.tailor_mode": request.mode.value}):
+            result = await tailor_with_cache(
+                resume_text=resume_text,
+                job_description=request.job_description,
+                variant=f"text:{request.mode.value}",
+                tailor=tailor,
+                allow_draft=request.allow_draft,
+                background_tasks=background_tasks if request.refresh_draft else None
+            )
+        tailored_resume = result.content
         
         if not tailored_resume:
             raise HTTPException(
@@ -101,7 +216,9 @@ async def tailor_resume(request: ResumeTailorRequest) -> ResumeTailorResponse:
             success=True,
             message=f"Resume successfully tailored for {request.job_title} at {request.company_name}",
             tailored_resume_text=tailored_resume,
-            filename=filename
+            filename=filename,
+            draft=result.draft,
+            similarity=result.similarity
         )
         
         logger.info(f"Successfully tailored resume for {request.job_title} at {request.company_name}")
@@ -124,15 +241,23 @@ async def tailor_resume(request: ResumeTailorRequest) -> ResumeTailorResponse:
     description="Use AI to tailor a resume for a specific job and generate a professional PDF",
     response_class=Response
 )
-async def tailor_resume_pdf(request: ResumeTailorRequest):
+async def tailor_resume_pdf(
+    request: ResumeTailorRequest,
+    background_tasks: BackgroundTasks
+):
     """
     Tailor a resume for a specific job and generate a professional PDF.
     
     - **resume_text**: Original resume text content
+    - **resume_id**: Instead of resume_text, the id of a stored resume, see /tailor
     - **job_description**: Job description to tailor resume for
     - **job_title**: Job title for the position
     - **company_name**: Company name for the position
     - **api_keys**: API keys including gemini_api_key (required)
+    - **mode**: "full" (default) or "sections", see /tailor
+    - **allow_draft**, **refresh_draft**: see /tailor; drafts are marked with an X-Tailor-Draft header
+    - **fit_pages**: Pages to fit the resume into by scaling fonts and spacing (default 0, the fixed layout)
+    - **theme**: Layout theme (default "classic"), see /themes
     
     Returns a PDF file with the tailored resume.
     """
@@ -145,15 +270,45 @@ async def tailor_resume_pdf(request: ResumeTailorRequest):
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Gemini API key is required"
             )
+        check_theme(request.theme)
+        resume_text = await resolve_resume_text(request.resume_text, request.resume_id)
         
+        tailor_errors = []
+
+        async def tailor():
+            # Cached as === SECTION === text, which parses back without calling Gemini
+            sections, error = await tailor_resume_structured(
+                resume_text=resume_text,
+                job_description=request.job_description,
+                gemini_api_key=request.api_keys.gemini_api_key,
+                mode=request.mode.value
+            )
+            if not sections:
+                tailor_errors.append(error)
+                return None
+            return render_sections(sections)
+
         # Generate tailored PDF
-        pdf_data, result = await generate_tailored_pdf(
-            resume_text=request.resume_text,
-            job_description=request.job_description,
-            job_title=request.job_title,
-            company_name=request.company_name,
-            gemini_api_key=request.api_keys.gemini_api_key
-        )
+        with start_span("resume.generate_tailored_pdf", **{"resume.chars": len(resume_text), "job.description_chars": len(request.job_description)}) as span:
+            tailored = await tailor_with_cache(
+                resume_text=resume_text,
+                job_description=request.job_description,
+                variant=f"pdf:{request.mode.value}",
+                tailor=tailor,
+                allow_draft=request.allow_draft,
+                background_tasks=background_tasks if request.refresh_draft else None
+            )
+            if tailored.content:
+                pdf_data, result = render_tailored_pdf(
+                    parse_gemini_output_to_dict(tailored.content),
+                    job_title=request.job_title,
+                    company_name=request.company_name,
+                    fit_pages=request.fit_pages,
+                    theme=request.theme
+                )
+            else:
+                pdf_data, result = None, tailor_errors[0] if tailor_errors else "Failed to tailor resume"
+            span.set_attribute("pdf.size_bytes", pdf_data.size if pdf_data else 0)
         
         if not pdf_data:
             raise HTTPException(
@@ -162,13 +317,13 @@ async def tailor_resume_pdf(request: ResumeTailorRequest):
             )
         
         # Return PDF as response
-        headers = {
-            'Content-Disposition': f'attachment; filename="{result}"',
-            'Content-Type': 'application/pdf'
-        }
+        response = pdf_response(pdf_data, result)
+        if tailored.draft:
+            response.headers['X-Tailor-Draft'] = 'true'
+            response.headers['X-Tailor-Similarity'] = str(tailored.similarity)
         
         logger.info(f"Successfully generated PDF for {request.job_title} at {request.company_name}")
-        return Response(content=pdf_data, media_type="application/pdf", headers=headers)
+        return response
         
     except HTTPException:
         raise
@@ -192,9 +347,12 @@ async def generate_pdf_from_text(request: ResumePDFGenerateRequest):
     Generate a PDF from tailored resume text.
     
     - **tailored_resume_text**: Already tailored resume text content
+    - **resume_id**: Instead of tailored_resume_text, the id of a stored resume, see /tailor
     - **job_title**: Job title for the position
     - **company_name**: Company name for the position
     - **api_keys**: API keys including gemini_api_key (required)
+    - **fit_pages**: Pages to fit the resume into by scaling fonts and spacing (default 0, the fixed layout)
+    - **theme**: Layout theme (default "classic"), see /themes
     
     Returns a PDF file with the tailored resume.
     """
@@ -207,14 +365,21 @@ async def generate_pdf_from_text(request: ResumePDFGenerateRequest):
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Gemini API key is required"
             )
-        
-        # Generate PDF from tailored text
-        pdf_data, result = await generate_pdf_from_tailored_text(
-            tailored_resume_text=request.tailored_resume_text,
-            job_title=request.job_title,
-            company_name=request.company_name,
-            gemini_api_key=request.api_keys.gemini_api_key
-        )
+        check_theme(request.theme)
+        tailored_resume_text = await resolve_resume_text(request.tailored_resume_text, request.resume_id)
+        
+        # Generate PDF from tailored text; text parsed before is not sent to Gemini again
+        with start_span("resume.generate_pdf_from_text", **{"resume.chars": len(tailored_resume_text)}) as span:
+            pdf_data, result = await generate_pdf_from_tailored_text(
+                tailored_resume_text=tailored_resume_text,
+                job_title=request.job_title,
+                company_name=request.company_name,
+                gemini_api_key=request.api_keys.gemini_api_key,
+                fit_pages=request.fit_pages,
+                theme=request.theme,
+                stored=request.resume_id is not None
+            )
+            span.set_attribute("pdf.size_bytes", pdf_data.size if pdf_data else 0)
         
         if not pdf_data:
             raise HTTPException(
@@ -222,14 +387,8 @@ async def generate_pdf_from_text(request: ResumePDFGenerateRequest):
                 detail=f"Failed to generate PDF: {result}"
             )
         
-        # Return PDF as response
-        headers = {
-            'Content-Disposition': f'attachment; filename="{result}"',
-            'Content-Type': 'application/pdf'
-        }
-        
         logger.info(f"Successfully generated PDF from text for {request.job_title} at {request.company_name}")
-        return Response(content=pdf_data, media_type="application/pdf", headers=headers)
+        return pdf_response(pdf_data, result)
         
     except HTTPException:
         raise
@@ -241,6 +400,29 @@ async def generate_pdf_from_text(request: ResumePDFGenerateRequest):
         )
 
 
+@router.get(
+    "/pdf/{pdf_key}",
+    status_code=status.HTTP_200_OK,
+    summary="Download a rendered PDF",
+    description="Download a PDF from the render cache by the key returned in the ETag of a PDF response",
+    response_class=Response
+)
+async def download_rendered_pdf(pdf_key: str, if_none_match: Optional[str] = Header(None)):
+    """
+    Download a previously rendered PDF again without tailoring or rendering it.
+
+    PDF responses carry an ETag and a Content-Location pointing here. Send the ETag back
+    in If-None-Match to get a 304 when the copy you have is current.
+    """
+    path = cached_pdf_path(pdf_key) if PDF_KEY_PATTERN.fullmatch(pdf_key) else None
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="PDF not found or no longer cached"
+        )
+    return pdf_response(RenderedPDF(etag=pdf_key, path=path), "Tailored_Resume.pdf", if_none_match, immutable=True)
+
+
 @router.post(
     "/upload-and-tailor-pdf",
     status_code=status.HTTP_200_OK,
@@ -253,7 +435,10 @@ async def upload_and_tailor_pdf(
     job_description: str = Form(..., description="Job description to tailor resume for"),
     job_title: str = Form(..., description="Job title for the position"),
     company_name: str = Form(..., description="Company name for the position"),
-    api_keys: str = Form(..., description="JSON string containing API keys")
+    api_keys: str = Form(..., description="JSON string containing API keys"),
+    mode: TailorMode = Form(TailorMode.FULL, description="Rewrite the whole resume, or only its job-sensitive sections"),
+    fit_pages: int = Form(0, ge=0, le=4, description="Pages to fit the resume into by scaling fonts and spacing; 0, the default, keeps the fixed layout"),
+    theme: str = Form(DEFAULT_THEME, description="Layout theme, see /themes")
 ):
     """
     Upload a PDF resume, extract text, tailor it for a specific job, and return a professional tailored PDF.
@@ -288,10 +473,11 @@ async def upload_and_tailor_pdf(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Gemini API key is required"
             )
+        check_theme(theme)
         
-        # Read and extract text from uploaded PDF
+        # Read and extract text from uploaded PDF, unless it was stored before
         file_content = await file.read()
-        resume_text = extract_text_from_pdf(file_content)
+        resume_text, _ = await resume_text_from_pdf(file_content)
         
         if not resume_text.strip():
             raise HTTPException(
@@ -300,13 +486,18 @@ async def upload_and_tailor_pdf(
             )
         
         # Generate tailored PDF
-        pdf_data, result = await generate_tailored_pdf(
-            resume_text=resume_text,
-            job_description=job_description,
-            job_title=job_title,
-            company_name=company_name,
-            gemini_api_key=api_keys_obj.gemini_api_key
-        )
+        with start_span("resume.generate_tailored_pdf", **{"resume.chars": len(resume_text), "job.description_chars": len(job_description)}) as span:
+            pdf_data, result = await generate_tailored_pdf(
+                resume_text=resume_text,
+                job_description=job_description,
+                job_title=job_title,
+                company_name=company_name,
+                gemini_api_key=api_keys_obj.gemini_api_key,
+                mode=mode.value,
+                fit_pages=fit_pages,
+                theme=theme
+            )
+            span.set_attribute("pdf.size_bytes", pdf_data.size if pdf_data else 0)
         
         if not pdf_data:
             raise HTTPException(
@@ -314,14 +505,8 @@ async def upload_and_tailor_pdf(
                 detail=f"Failed to generate tailored PDF: {result}"
             )
         
-        # Return PDF as response
-        headers = {
-            'Content-Disposition': f'attachment; filename="{result}"',
-            'Content-Type': 'application/pdf'
-        }
-        
         logger.info(f"Successfully processed upload and generated tailored PDF for {job_title} at {company_name}")
-        return Response(content=pdf_data, media_type="application/pdf", headers=headers)
+        return pdf_response(pdf_data, result)
         
     except HTTPException:
         raise
@@ -345,9 +530,13 @@ async def parse_resume(request: ResumeParseRequest) -> ResumeParseResponse:
     Parse resume text into structured data sections.
     
     - **resume_text**: Resume text to parse
+    - **resume_id**: Instead of resume_text, the id of a stored resume
     - **api_keys**: API keys including gemini_api_key (required)
     
-    Returns structured resume data organized by sections.
+    Returns structured resume data organized by sections, the resume's keywords and the
+    resume_id to send to the tailoring endpoints instead of the text, or no resume_id
+    when its profile could not be stored. A resume parsed before is answered from its
+    stored profile without calling Gemini.
     """
     try:
         logger.info("Resume parsing request received")
@@ -358,12 +547,14 @@ async def parse_resume(request: ResumeParseRequest) -> ResumeParseResponse:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Gemini API key is required"
             )
+        resume_text = await resolve_resume_text(request.resume_text, request.resume_id)
         
         # Parse resume using AI
-        parsed_data, message = await parse_resume_only(
-            request.resume_text, 
-            request.api_keys.gemini_api_key
-        )
+        with start_span("resume.parse", **{"resume.chars": len(resume_text)}):
+            parsed_data, message = await parse_resume_only(
+                resume_text, 
+                request.api_keys.gemini_api_key
+            )
         
         if not parsed_data:
             raise HTTPException(
@@ -374,11 +565,13 @@ async def parse_resume(request: ResumeParseRequest) -> ResumeParseResponse:
         response = ResumeParseResponse(
             success=True,
             message=message,
-            parsed_data=parsed_data
+            parsed_data=parsed_data,
+            resume_id=await asyncio.to_thread(stored_resume_id, resume_text, parsed_data),
+            keywords=resume_keywords(resume_text)
         )
         
         logger.info("Successfully parsed resume")
-        return response
+        return json_response(response)
         
     except HTTPException:
         raise
@@ -400,7 +593,8 @@ async def extract_from_pdf(file: UploadFile = File(..., description="PDF resume
     """
     Extract text content from an uploaded PDF resume.
     
-    Useful for getting the text content before tailoring or parsing.
+    Useful for getting the text content before tailoring or parsing. The text is stored,
+    and the returned resume_id can be sent to /parse and the tailoring endpoints instead.
     """
     try:
         # Validate file type
@@ -412,9 +606,9 @@ async def extract_from_pdf(file: UploadFile = File(..., description="PDF resume
         
         logger.info(f"Text extraction request for file: {file.filename}")
         
-        # Read and extract text from uploaded PDF
+        # Read and extract text from uploaded PDF, unless it was stored before
         file_content = await file.read()
-        resume_text = extract_text_from_pdf(file_content)
+        resume_text, resume_id = await resume_text_from_pdf(file_content)
         
         if not resume_text.strip():
             raise HTTPException(
@@ -423,12 +617,13 @@ async def extract_from_pdf(file: UploadFile = File(..., description="PDF resume
             )
         
         logger.info(f"Successfully extracted text from {file.filename}")
-        return {
+        return json_response({
             "success": True,
             "message": "Text extracted successfully from PDF",
             "resume_text": resume_text,
+            "resume_id": resume_id,
             "filename": file.filename
-        }
+        })
         
     except HTTPException:
         raise
@@ -440,6 +635,29 @@ async def extract_from_pdf(file: UploadFile = File(..., description="PDF resume
         )
 
 
+@router.get(
+    "/themes",
+    status_code=status.HTTP_200_OK,
+    summary="List PDF themes",
+    description="List the layout themes the PDF endpoints accept"
+)
+async def list_themes():
+    """
+    List the registered PDF themes with their section headings in page order.
+    """
+    return {
+        "default": DEFAULT_THEME,
+        "themes": [
+            {
+                "name": name,
+                "description": THEMES[name].description,
+                "sections": [heading for _, heading in THEMES[name].sections],
+            }
+            for name in theme_names()
+        ],
+    }
+
+
 @router.get(
     "/health",
     status_code=status.HTTP_200_OK,
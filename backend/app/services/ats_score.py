@@ -0,0 +1,204 @@
+"""
+Local ATS-style match scores of one resume against many job descriptions.
+
+Every job description of a batch is tokenized once into a vocabulary shared by the
+batch, and all of them are scored in one pass of NumPy array operations over the
+(job, term) pairs, instead of one Gemini call per job. A score (0-100) combines:
+
+- keyword coverage: the share of a job's terms, weighted by log-scaled count and by
+  inverse document frequency within the batch, that the resume contains; terms most
+  descriptions of the batch share count for little;
+- section completeness: the share of the resume sections the job calls for that the
+  resume has; experience and skills always, education when it asks for a degree,
+  projects for a portfolio or GitHub, certifications for certifications or licenses;
+- length balance: 1 when the resume is ATS_MIN_WORDS to ATS_MAX_WORDS words long,
+  falling off in proportion outside that range.
+"""
+import os
+import re
+import logging
+from collections import Counter
+from itertools import repeat
+from typing import Dict, List
+
+import numpy as np
+
+from app.models.job_models import AtsScore, JobResult
+from app.services.tailor_cache import STOP_WORDS
+
+logger = logging.getLogger(__name__)
+
+# Resume word counts scored as well balanced
+ATS_MIN_WORDS = int(os.getenv("ATS_MIN_WORDS", 400))
+ATS_MAX_WORDS = int(os.getenv("ATS_MAX_WORDS", 900))
+# Weights of keyword coverage, section completeness and length balance in the score
+ATS_WEIGHTS = (0.6, 0.25, 0.15)
+# Matched and missing keywords returned per job, highest weighted first
+ATS_TOP_KEYWORDS = 10
+
+# Keywords: words starting with a letter, keeping "c++", "c#" or "node.js" whole
+KEYWORD_PATTERN = re.compile(r"[a-z][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+# Words job ads use whatever the job, on top of the tailoring cache's stop words
+JOB_AD_STOP_WORDS = frozenset(
+    "experience work working team teams role job candidate candidates company ability strong skills"
+    " requirements responsibilities including etc using use year years must plus preferred required"
+    " opportunity benefits new well across within help such other also".split()
+)
+
+# (section, resume heading pattern, keywords of a job description asking for it, or None for always)
+SECTIONS = (
+    ("experience", r"experience|employment|work history", None),
+    ("skills", r"skills|competencies|expertise|technologies", None),
+    ("education", r"education|academic", "degree bachelor bachelors masters phd ph.d bsc msc diploma"),
+    ("projects", r"projects|portfolio", "portfolio github"),
+    ("certifications", r"certifications?|certificates|licen[cs]es",
+     "certification certifications certified certificate license licensed licence"),
+)
+_SECTION_HEADINGS = [re.compile(heading, re.IGNORECASE) for _, heading, _ in SECTIONS]
+_ALWAYS_ASKED = np.array([asks is None for _, _, asks in SECTIONS])
+_SECTION_KEYWORDS = {word: index for index, (_, _, asks) in enumerate(SECTIONS) for word in (asks or "").split()}
+# Resume lines of at most this many words are read as possible section headings
+_HEADING_MAX_WORDS = 4
+
+
+class _Vocabulary(dict):
+    """Column of every keyword seen in a batch; words that are not keywords map to -1."""
+
+    def __init__(self):
+        super().__init__()
+        self.size = 0
+
+    def __missing__(self, word: str) -> int:
+        index = -1
+        if len(word) > 1 and word not in STOP_WORDS and word not in JOB_AD_STOP_WORDS:
+            index, self.size = self.size, self.size + 1
+        self[word] = index
+        return index
+
+
+def keywords(text: str) -> Dict[str, int]:
+    """Counts of the lowercase keywords of a text, without stop words."""
+    return {
+        word: count for word, count in Counter(KEYWORD_PATTERN.findall(text.lower())).items()
+        if len(word) > 1 and word not in STOP_WORDS and word not in JOB_AD_STOP_WORDS
+    }
+
+
+def resume_sections(resume_text: str) -> np.ndarray:
+    """Which of SECTIONS the resume has a heading for, as a boolean vector."""
+    found = np.zeros(len(SECTIONS), dtype=bool)
+    for line in resume_text.splitlines():
+        if 0 < len(line.split()) <= _HEADING_MAX_WORDS:
+            for index, heading in enumerate(_SECTION_HEADINGS):
+                if not found[index] and heading.search(line):
+                    found[index] = True
+    return found
+
+
+def length_balance(word_count: int) -> float:
+    if word_count < ATS_MIN_WORDS:
+        return word_count / ATS_MIN_WORDS
+    if word_count > ATS_MAX_WORDS:
+        return ATS_MAX_WORDS / word_count
+    return 1.0
+
+
+def score_jobs(resume_text: str, descriptions: List[str], batch_idf: bool = True) -> List[AtsScore]:
+    """
+    ATS match of the resume against each job description, in order.
+
+    Without batch_idf every term weighs the same whatever the rest of the batch is,
+    as if each description were scored alone, so scores of different batches compare.
+    """
+    if not descriptions:
+        return []
+
+    # Sparse job x term matrix as (row, column, count) triples over the batch's vocabulary;
+    # only the words new to the batch go through Python code
+    vocabulary = _Vocabulary()
+    rows: List[int] = []
+    columns: List[int] = []
+    counts: List[int] = []
+    for row, description in enumerate(descriptions):
+        words = Counter(KEYWORD_PATTERN.findall((description or "").lower()))
+        rows.extend(repeat(row, len(words)))
+        columns.extend(map(vocabulary.__getitem__, words))
+        counts.extend(words.values())
+
+    jobs = len(descriptions)
+    row_index = np.asarray(rows, dtype=np.intp)
+    column_index = np.asarray(columns, dtype=np.intp)
+    keep = column_index >= 0
+    row_index, column_index = row_index[keep], column_index[keep]
+    terms = np.empty(vocabulary.size, dtype=object)
+    for word, index in vocabulary.items():
+        if index >= 0:
+            terms[index] = word
+
+    in_resume = np.zeros(vocabulary.size, dtype=bool)
+    resume_columns = [vocabulary.get(word, -1) for word in keywords(resume_text)]
+    in_resume[np.fromiter((index for index in resume_columns if index >= 0), dtype=np.intp)] = True
+
+    # Smoothed IDF over the batch, so one description alone weighs every term the same
+    if batch_idf:
+        document_frequency = np.bincount(column_index, minlength=vocabulary.size)
+        idf = np.log((1.0 + jobs) / (1.0 + document_frequency)) + 1.0
+    else:
+        idf = np.ones(vocabulary.size)
+    weights = (1.0 + np.log(np.asarray(counts, dtype=np.float64)[keep])) * idf[column_index]
+    matched = in_resume[column_index]
+    total_weight = np.bincount(row_index, weights=weights, minlength=jobs)
+    matched_weight = np.bincount(row_index, weights=np.where(matched, weights, 0.0), minlength=jobs)
+    coverage = np.divide(matched_weight, total_weight, out=np.zeros(jobs), where=total_weight > 0)
+
+    # Sections each job asks for: the always asked ones, and those whose keywords it uses
+    term_section = np.full(vocabulary.size, -1, dtype=np.intp)
+    for word, section in _SECTION_KEYWORDS.items():
+        index = vocabulary.get(word, -1)
+        if index >= 0:
+            term_section[index] = section
+    asks = np.tile(_ALWAYS_ASKED, (jobs, 1))
+    pair_section = term_section[column_index]
+    asking = pair_section >= 0
+    asks[row_index[asking], pair_section[asking]] = True
+
+    has_sections = resume_sections(resume_text)
+    asked = asks.sum(axis=1)
+    completeness = (asks & has_sections).sum(axis=1) / asked
+
+    balance = length_balance(len(resume_text.split()))
+    keyword_weight, section_weight, length_weight = ATS_WEIGHTS
+    scores = 100.0 * (keyword_weight * coverage + section_weight * completeness + length_weight * balance)
+    logger.debug(f"Scored {jobs} jobs over {vocabulary.size} terms")
+
+    # Each job's terms, heaviest first: sort the triples by job, then by descending weight
+    order = np.lexsort((-weights, row_index))
+    sorted_rows = row_index[order]
+    sorted_terms = terms[column_index[order]]
+    sorted_matched = matched[order]
+    starts = np.searchsorted(sorted_rows, np.arange(jobs + 1))
+
+    results = []
+    for job in range(jobs):
+        start, end = starts[job], starts[job + 1]
+        job_terms, job_matched = sorted_terms[start:end], sorted_matched[start:end]
+        results.append(AtsScore(
+            score=round(float(scores[job]), 1),
+            keyword_coverage=round(float(coverage[job]), 3),
+            section_completeness=round(float(completeness[job]), 3),
+            length_balance=round(balance, 3),
+            matched_keywords=job_terms[job_matched][:ATS_TOP_KEYWORDS].tolist(),
+            missing_keywords=job_terms[~job_matched][:ATS_TOP_KEYWORDS].tolist(),
+            missing_sections=[SECTIONS[index][0] for index in np.flatnonzero(asks[job] & ~has_sections)],
+        ))
+    return results
+
+
+def job_text(job: JobResult) -> str:
+    return f"{job.title or ''}\n{job.description or ''}"
+
+
+def score_job_results(resume_text: str, jobs: List[JobResult], batch_idf: bool = True) -> List[JobResult]:
+    """Copies of the jobs with ats_score set; the jobs themselves may be shared with the search cache."""
+    scores = score_jobs(resume_text, [job_text(job) for job in jobs], batch_idf)
+    return [job.model_copy(update={"ats_score": score}) for job, score in zip(jobs, scores)]
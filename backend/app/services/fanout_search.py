@@ -0,0 +1,89 @@
+import os
+import time
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from app.models.job_models import JobResult, QueryTiming
+from app.services.search_cache import search_jobs_cached
+from app.services.tracing import start_span
+
+logger = logging.getLogger(__name__)
+
+# Concurrent SerpApi calls per fan-out request
+FANOUT_CONCURRENCY = int(os.getenv("FANOUT_CONCURRENCY", 4))
+
+
+def dedupe_key(job: JobResult) -> Tuple:
+    if job.job_id:
+        return ("id", job.job_id)
+    return ("posting", job.title, job.company_name, job.location)
+
+
+def merge_results(results: List[List[JobResult]], rank: bool) -> List[JobResult]:
+    """
+    Merge per-query results, keeping the first copy of each job.
+
+    Without ranking, jobs keep the order of the queries and their position within each.
+    With ranking, jobs returned by more queries come first, then those nearer the top
+    of any query's results.
+    """
+    merged: Dict[Tuple, JobResult] = {}
+    hits: Dict[Tuple, int] = {}
+    best_position: Dict[Tuple, int] = {}
+    for jobs in results:
+        for position, job in enumerate(jobs):
+            key = dedupe_key(job)
+            if key not in merged:
+                merged[key] = job
+                best_position[key] = position
+            hits[key] = hits.get(key, 0) + 1
+            best_position[key] = min(best_position[key], position)
+
+    keys = list(merged)
+    if rank:
+        # sorted() is stable, so ties keep their query order
+        keys.sort(key=lambda key: (-hits[key], best_position[key]))
+    return [merged[key] for key in keys]
+
+
+async def fan_out_search(
+    job_titles: List[str],
+    locations: List[str],
+    experience: Optional[str],
+    job_count: int,
+    serpapi_key: str,
+    rank: bool = False
+) -> Tuple[List[JobResult], List[QueryTiming]]:
+    """
+    Run every title and location combination concurrently, at most FANOUT_CONCURRENCY at a time.
+
+    Each query goes through the search cache like /search does. A failing query is
+    reported in its timing entry instead of failing the others.
+    """
+    semaphore = asyncio.Semaphore(FANOUT_CONCURRENCY)
+    queries = [(job_title, location) for job_title in job_titles for location in locations]
+
+    async def run(job_title: str, location: str) -> Tuple[List[JobResult], QueryTiming]:
+        async with semaphore:
+            start = time.perf_counter()
+            with start_span("jobs.fan_out.query", **{"job.title": job_title, "job.location": location}):
+                try:
+                    jobs = await search_jobs_cached(job_title, location, experience, job_count, serpapi_key)
+                    error = None
+                except Exception as e:
+                    logger.error(f"Fan-out query '{job_title}' in {location} failed: {e}")
+                    jobs, error = [], str(e)
+            return jobs, QueryTiming(
+                job_title=job_title,
+                location=location,
+                job_count=len(jobs),
+                duration_ms=round((time.perf_counter() - start) * 1000, 1),
+                error=error
+            )
+
+    with start_span("jobs.fan_out", **{"jobs.fan_out.queries": len(queries)}):
+        outcomes = await asyncio.gather(*(run(job_title, location) for job_title, location in queries))
+
+    jobs = merge_results([jobs for jobs, _ in outcomes], rank)
+    return jobs, [timing for _, timing in outcomes]
@@ -1,13 +1,38 @@
 import os
 import httpx
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from urllib.parse import urlparse
 import logging
 
 from app.models.job_models import JobResult
+from app.services.metrics import observe_upstream, SERPAPI
+from app.services.tracing import start_span
 
 logger = logging.getLogger(__name__)
 
+# Overridable so benchmarks can point at a local stand-in (see benchmarks/fake_upstream.py)
+SERPAPI_BASE_URL = os.getenv("SERPAPI_BASE_URL", "https://serpapi.com").rstrip('/')
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Shared SerpApi client, created on first use in each worker.
+
+    Building a client loads the SSL context, which blocks the event loop for tens of
+    milliseconds; sharing one also lets concurrent searches reuse pooled connections.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(timeout=30.0)
+    return _http_client
+
+
+async def close_http_client():
+    if _http_client is not None:
+        await _http_client.aclose()
+
 
 def is_valid_url(url: str) -> bool:
     """Check if a URL is valid and accessible"""
@@ -47,60 +72,91 @@ def extract_job_url(job_data: dict) -> Optional[str]:
     return None
 
 
-async def find_jobs(job_title: str, location: str, experience: Optional[str], job_count: int, serpapi_key: str) -> List[JobResult]:
-    """
-    Asynchronously searches for jobs using the SerpApi Google Jobs API.
-    """
+def _search_params(job_title: str, location: str, experience: Optional[str], serpapi_key: str) -> dict:
     if not serpapi_key:
         raise ValueError("SERPAPI_KEY is required but not provided")
-    
-    serpapi_url = "https://serpapi.com/search.json"
-    
+
     # Build search query
     query_parts = [job_title]
     if experience:
         query_parts.append(f"with {experience} experience")
     query_parts.append(f"in {location}")
-    search_query = " ".join(query_parts)
 
-    params = {
+    return {
         "engine": "google_jobs",
-        "q": search_query,
+        "q": " ".join(query_parts),
         "api_key": serpapi_key,
         "hl": "en",
     }
-    
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        try:
-            response = await client.get(serpapi_url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            jobs_list = []
-            
-            if "jobs_results" in data:
-                for job in data["jobs_results"][:job_count]:
-                    job_url = extract_job_url(job)
-                    
-                    job_result = JobResult(
-                        title=job.get("title"),
-                        company_name=job.get("company_name"),
-                        location=job.get("location", "Not specified"),
-                        description=job.get("description"),
-                        job_url=job_url,
-                        job_id=job.get("job_id"),
-                        raw_data=job
-                    )
-                    jobs_list.append(job_result)
-            
-            return jobs_list
-            
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error occurred: {e.response.status_code}")
-            raise Exception(f"API Error: Failed to fetch jobs. Status: {e.response.status_code}")
-        except httpx.RequestError as e:
-            logger.error(f"Request error occurred: {e}")
-            raise Exception("Network error: Unable to connect to job search API")
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            raise Exception(f"Unexpected error occurred: {str(e)}")
+
+
+def _job_results(data: dict) -> List[JobResult]:
+    jobs_list = []
+    for job in data.get("jobs_results", []):
+        jobs_list.append(JobResult(
+            title=job.get("title"),
+            company_name=job.get("company_name"),
+            location=job.get("location", "Not specified"),
+            description=job.get("description"),
+            job_url=extract_job_url(job),
+            job_id=job.get("job_id"),
+            raw_data=job
+        ))
+    return jobs_list
+
+
+async def _fetch_page(params: dict) -> dict:
+    """One page of SerpApi Google Jobs results."""
+    client = get_http_client()
+    try:
+        with start_span("serpapi.search", **{"serpapi.query": params["q"]}) as span, \
+                observe_upstream(SERPAPI) as call:
+            response = await client.get(f"{SERPAPI_BASE_URL}/search.json", params=params)
+            call.status = response.status_code
+            span.set_attribute("http.response.status_code", response.status_code)
+        response.raise_for_status()
+        return response.json()
+
+    except httpx.HTTPStatusError as e:
+        logger.error(f"HTTP error occurred: {e.response.status_code}")
+        raise Exception(f"API Error: Failed to fetch jobs. Status: {e.response.status_code}")
+    except httpx.RequestError as e:
+        logger.error(f"Request error occurred: {e}")
+        raise Exception("Network error: Unable to connect to job search API")
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
+        raise Exception(f"Unexpected error occurred: {str(e)}")
+
+
+async def find_jobs(job_title: str, location: str, experience: Optional[str], job_count: int, serpapi_key: str) -> List[JobResult]:
+    """
+    Asynchronously searches for jobs using the SerpApi Google Jobs API.
+    """
+    params = _search_params(job_title, location, experience, serpapi_key)
+    data = await _fetch_page(params)
+    return _job_results(data)[:job_count]
+
+
+async def find_job_pages(
+    job_title: str,
+    location: str,
+    experience: Optional[str],
+    pages: int,
+    serpapi_key: str
+) -> AsyncIterator[List[JobResult]]:
+    """
+    Yield the jobs of up to `pages` result pages of a search, one page at a time.
+
+    Follows SerpApi's next_page_token, so each page is only requested once the
+    caller has taken the previous one; stops early when there are no more results.
+    """
+    params = _search_params(job_title, location, experience, serpapi_key)
+    for _ in range(pages):
+        data = await _fetch_page(params)
+        jobs = _job_results(data)
+        if jobs:
+            yield jobs
+        next_page_token = data.get("serpapi_pagination", {}).get("next_page_token")
+        if not jobs or not next_page_token:
+            return
+        params = dict(params, next_page_token=next_page_token)
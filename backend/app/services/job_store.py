@@ -0,0 +1,282 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+import logging
+from typing import List, Optional
+
+from app.models.job_models import JobResult
+from app.services.tracing import start_span
+
+logger = logging.getLogger(__name__)
+
+HIREPILOT_DATA_DIR = os.getenv("HIREPILOT_DATA_DIR", "data")
+JOB_STORE_PATH = os.getenv("JOB_STORE_PATH", os.path.join(HIREPILOT_DATA_DIR, "jobs.db"))
+JOB_STORE_ENABLED = os.getenv("JOB_STORE_ENABLED", "1") == "1"
+# Postings not seen in a search for this long are evicted, and the store never grows past the row cap
+JOB_STORE_MAX_AGE_DAYS = float(os.getenv("JOB_STORE_MAX_AGE_DAYS", 14))
+JOB_STORE_MAX_ROWS = int(os.getenv("JOB_STORE_MAX_ROWS", 50000))
+
+# bm25 column weights for title, company_name and description
+FTS_WEIGHTS = (10.0, 5.0, 1.0)
+QUERY_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    title TEXT,
+    company_name TEXT,
+    location TEXT,
+    description TEXT,
+    job_url TEXT,
+    raw_data TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    seen_count INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS jobs_last_seen ON jobs(last_seen);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, company_name, description,
+    content='jobs', content_rowid='rowid', tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS jobs_ai AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts(rowid, title, company_name, description)
+    VALUES (new.rowid, new.title, new.company_name, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_ad AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, company_name, description)
+    VALUES ('delete', old.rowid, old.title, old.company_name, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_au AFTER UPDATE OF title, company_name, description ON jobs
+WHEN old.title IS NOT new.title OR old.company_name IS NOT new.company_name
+    OR old.description IS NOT new.description
+BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, company_name, description)
+    VALUES ('delete', old.rowid, old.title, old.company_name, old.description);
+    INSERT INTO jobs_fts(rowid, title, company_name, description)
+    VALUES (new.rowid, new.title, new.company_name, new.description);
+END;
+
+-- Live /search results by normalised query, see search_cache.py
+CREATE TABLE IF NOT EXISTS search_cache (
+    query_key TEXT PRIMARY KEY,
+    job_ids TEXT NOT NULL,
+    job_count INTEGER NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS search_popularity (
+    query_key TEXT PRIMARY KEY,
+    job_title TEXT NOT NULL,
+    location TEXT NOT NULL,
+    experience TEXT,
+    job_count INTEGER NOT NULL,
+    score REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS serpapi_usage (
+    day TEXT PRIMARY KEY,
+    calls INTEGER NOT NULL
+);
+
+-- Tailored resumes by resume and job description fingerprint, see tailor_cache.py
+CREATE TABLE IF NOT EXISTS tailor_cache (
+    id INTEGER PRIMARY KEY,
+    resume_hash TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    job_hash TEXT NOT NULL,
+    vector TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS tailor_cache_job ON tailor_cache(resume_hash, variant, job_hash);
+CREATE INDEX IF NOT EXISTS tailor_cache_created_at ON tailor_cache(created_at);
+CREATE TABLE IF NOT EXISTS tailor_cache_lsh (
+    band_key TEXT NOT NULL,
+    entry_id INTEGER NOT NULL,
+    PRIMARY KEY (band_key, entry_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tailor_cache_lsh_entry ON tailor_cache_lsh(entry_id);
+CREATE TRIGGER IF NOT EXISTS tailor_cache_ad AFTER DELETE ON tailor_cache BEGIN
+    DELETE FROM tailor_cache_lsh WHERE entry_id = old.id;
+END;
+
+-- Parsed resumes by resume text hash, see resume_store.py
+CREATE TABLE IF NOT EXISTS resume_profiles (
+    resume_id TEXT PRIMARY KEY,
+    resume_text TEXT NOT NULL,
+    parse_version INTEGER,
+    sections TEXT,
+    keywords TEXT,
+    pdf_hash TEXT,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resume_profiles_pdf_hash ON resume_profiles(pdf_hash);
+CREATE INDEX IF NOT EXISTS resume_profiles_last_used ON resume_profiles(last_used);
+"""
+
+UPSERT_SQL = """
+INSERT INTO jobs (job_id, title, company_name, location, description, job_url, raw_data, first_seen, last_seen)
+VALUES (:job_id, :title, :company_name, :location, :description, :job_url, :raw_data, :now, :now)
+ON CONFLICT(job_id) DO UPDATE SET
+    title = excluded.title,
+    company_name = excluded.company_name,
+    location = excluded.location,
+    description = excluded.description,
+    job_url = excluded.job_url,
+    raw_data = excluded.raw_data,
+    last_seen = excluded.last_seen,
+    seen_count = jobs.seen_count + 1
+"""
+
+_local = threading.local()
+
+
+def get_connection(path: Optional[str] = None) -> sqlite3.Connection:
+    """
+    Connection to the job store for the current thread and process, creating the schema on first use.
+
+    sqlite3 connections must not cross threads or a fork, so each worker thread of
+    each gunicorn worker opens its own. WAL mode lets the workers read while one writes.
+    """
+    path = path or JOB_STORE_PATH
+    connections = getattr(_local, "connections", None)
+    if connections is None or _local.pid != os.getpid():
+        connections = _local.connections = {}
+        _local.pid = os.getpid()
+
+    connection = connections.get(path)
+    if connection is None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(path, timeout=10.0)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(SCHEMA)
+        if connection.execute("SELECT 1 FROM jobs_fts_config WHERE k = 'rank'").fetchone() is None:
+            # A persistent rank function lets FTS5 order matches itself instead of sorting in SQL
+            with connection:
+                connection.execute(
+                    "INSERT INTO jobs_fts(jobs_fts, rank) VALUES ('rank', ?)",
+                    (f"bm25({', '.join(str(weight) for weight in FTS_WEIGHTS)})",)
+                )
+        connections[path] = connection
+    return connection
+
+
+def upsert_jobs(jobs: List[JobResult]) -> int:
+    """Insert new postings and refresh the last-seen time of known ones; returns the number stored."""
+    now = time.time()
+    rows = [
+        {
+            "job_id": job.job_id,
+            "title": job.title,
+            "company_name": job.company_name,
+            "location": job.location,
+            "description": job.description,
+            "job_url": job.job_url,
+            "raw_data": json.dumps(job.raw_data) if job.raw_data is not None else None,
+            "now": now,
+        }
+        for job in jobs if job.job_id
+    ]
+    if not rows:
+        return 0
+
+    with start_span("job_store.upsert", **{"job_store.rows": len(rows)}):
+        connection = get_connection()
+        with connection:
+            connection.executemany(UPSERT_SQL, rows)
+        evict_stale_jobs()
+    return len(rows)
+
+
+def evict_stale_jobs(max_age_days: float = JOB_STORE_MAX_AGE_DAYS, max_rows: int = JOB_STORE_MAX_ROWS) -> int:
+    """Delete postings not seen within max_age_days, then the least recently seen beyond max_rows."""
+    connection = get_connection()
+    with connection:
+        deleted = connection.execute(
+            "DELETE FROM jobs WHERE last_seen < ?", (time.time() - max_age_days * 86400,)
+        ).rowcount
+        deleted += connection.execute(
+            "DELETE FROM jobs WHERE rowid IN ("
+            "SELECT rowid FROM jobs ORDER BY last_seen DESC LIMIT -1 OFFSET ?)",
+            (max_rows,)
+        ).rowcount
+    if deleted:
+        logger.info(f"Evicted {deleted} stale job postings from the local store")
+    return deleted
+
+
+def build_fts_query(query: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 query matching every word, the last one as a prefix.
+
+    Words are quoted, so FTS5 operators and punctuation in user input are treated as text.
+    """
+    tokens = QUERY_TOKEN_PATTERN.findall(query)
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def search_local_jobs(
+    query: str,
+    location: Optional[str] = None,
+    limit: int = 10,
+    max_age_days: Optional[float] = None
+) -> List[JobResult]:
+    """Rank stored postings by bm25 over title, company and description."""
+    fts_query = build_fts_query(query)
+    if fts_query is None:
+        return []
+
+    sql = (
+        "SELECT jobs.* FROM jobs_fts JOIN jobs ON jobs.rowid = jobs_fts.rowid "
+        "WHERE jobs_fts MATCH ?"
+    )
+    params: list = [fts_query]
+    if location:
+        sql += " AND jobs.location LIKE ?"
+        params.append(f"%{location}%")
+    if max_age_days is not None:
+        sql += " AND jobs.last_seen >= ?"
+        params.append(time.time() - max_age_days * 86400)
+    sql += " ORDER BY jobs_fts.rank LIMIT ?"
+    params.append(limit)
+
+    with start_span("job_store.search", **{"job_store.query": fts_query}) as span:
+        rows = get_connection().execute(sql, params).fetchall()
+        span.set_attribute("job_store.results", len(rows))
+
+    return [_row_to_job(row) for row in rows]
+
+
+def get_jobs_by_ids(job_ids: List[str]) -> List[JobResult]:
+    """Stored postings for the given ids in the same order, skipping ids no longer stored."""
+    if not job_ids:
+        return []
+    placeholders = ", ".join("?" for _ in job_ids)
+    rows = get_connection().execute(f"SELECT * FROM jobs WHERE job_id IN ({placeholders})", job_ids).fetchall()
+    by_id = {row["job_id"]: row for row in rows}
+    return [_row_to_job(by_id[job_id]) for job_id in job_ids if job_id in by_id]
+
+
+def _row_to_job(row: sqlite3.Row) -> JobResult:
+    return JobResult(
+        title=row["title"],
+        company_name=row["company_name"],
+        location=row["location"],
+        description=row["description"],
+        job_url=row["job_url"],
+        job_id=row["job_id"],
+        raw_data=json.loads(row["raw_data"]) if row["raw_data"] else None
+    )
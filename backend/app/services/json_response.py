@@ -0,0 +1,31 @@
+import os
+import logging
+from typing import Any
+
+import pydantic_core
+from fastapi.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+# Opt-in while the default FastAPI path stays the reference; see benchmarks/bench_json_response.py
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "0") == "1"
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse encoding pydantic models and plain data straight to bytes with pydantic-core.
+
+    The default path validates the returned model again, dumps it to Python objects and
+    runs json.dumps over them; this skips both intermediate steps. Output is the same
+    compact UTF-8 JSON that JSONResponse produces.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return pydantic_core.to_json(content)
+
+
+def json_response(content: Any) -> Any:
+    """Wrap a route's result in FastJSONResponse when FAST_JSON_RESPONSES is enabled."""
+    if FAST_JSON_RESPONSES:
+        return FastJSONResponse(content)
+    return content
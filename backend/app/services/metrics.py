@@ -0,0 +1,164 @@
+import os
+import time
+import logging
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+logger = logging.getLogger(__name__)
+
+# Upstream calls take seconds (Gemini) rather than milliseconds, so extend the default buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 60, 120)
+PDF_SIZE_BUCKETS = (2_000, 5_000, 10_000, 20_000, 50_000, 100_000, 250_000, 500_000, 1_000_000)
+
+REQUEST_LATENCY = Histogram(
+    "hirepilot_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "hirepilot_http_requests_in_flight",
+    "HTTP requests currently being handled",
+    multiprocess_mode="livesum"
+)
+UPSTREAM_LATENCY = Histogram(
+    "hirepilot_upstream_request_duration_seconds",
+    "Latency of calls to external providers",
+    ["provider", "status"],
+    buckets=LATENCY_BUCKETS
+)
+UPSTREAM_IN_FLIGHT = Gauge(
+    "hirepilot_upstream_requests_in_flight",
+    "Calls to external providers currently awaiting a response",
+    ["provider"],
+    multiprocess_mode="livesum"
+)
+PIPELINE_STAGE_LATENCY = Histogram(
+    "hirepilot_pipeline_stage_duration_seconds",
+    "Duration of each stage of the resume pipelines",
+    ["pipeline", "stage"],
+    buckets=LATENCY_BUCKETS
+)
+PDF_BYTES = Histogram(
+    "hirepilot_pdf_bytes",
+    "Size of generated PDF documents",
+    buckets=PDF_SIZE_BUCKETS
+)
+PDF_EXTRACTION_PAGE_LATENCY = Histogram(
+    "hirepilot_pdf_extraction_page_duration_seconds",
+    "Text extraction time per uploaded PDF page",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+)
+CACHE_REQUESTS = Counter(
+    "hirepilot_cache_requests_total",
+    "Cache lookups by cache and result (hit or miss)",
+    ["cache", "result"]
+)
+PROMPT_TOKENS_SAVED = Counter(
+    "hirepilot_prompt_tokens_saved_total",
+    "Estimated prompt tokens removed by the prompt budget stage",
+    ["input"]
+)
+COMPRESSION_BYTES = Counter(
+    "hirepilot_compression_bytes_total",
+    "Response bytes before (original) and after (sent) compression",
+    ["encoding", "stage"]
+)
+
+# Upstream provider label values
+SERPAPI = "serpapi"
+GEMINI_GENERATE_CONTENT = "gemini_generate_content"
+GEMINI_SDK = "gemini_sdk"
+
+
+class UpstreamCall:
+    """Handle yielded by observe_upstream; set status once the response is known."""
+
+    def __init__(self):
+        self.status = "error"
+
+
+@contextmanager
+def observe_upstream(provider: str) -> Iterator[UpstreamCall]:
+    """Record latency, status and in-flight count of one call to an external provider."""
+    call = UpstreamCall()
+    UPSTREAM_IN_FLIGHT.labels(provider).inc()
+    start = time.perf_counter()
+    try:
+        yield call
+    finally:
+        UPSTREAM_LATENCY.labels(provider, str(call.status)).observe(time.perf_counter() - start)
+        UPSTREAM_IN_FLIGHT.labels(provider).dec()
+
+
+@contextmanager
+def track_stage(pipeline: str, stage: str) -> Iterator[None]:
+    """Record the duration of one stage of a resume pipeline."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        PIPELINE_STAGE_LATENCY.labels(pipeline, stage).observe(time.perf_counter() - start)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """Count a cache lookup so hit ratios can be derived per cache."""
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Render all metrics in the Prometheus text format.
+
+    Under gunicorn, PROMETHEUS_MULTIPROC_DIR is set (see gunicorn.conf.py) and
+    every worker writes to files there, so a scrape hitting any worker returns
+    the totals across all of them.
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency per route template and in-flight requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Label by route template rather than raw path to keep cardinality bounded
+            route = scope.get("route")
+            route_label = getattr(route, "path", None) or "unmatched"
+            REQUEST_LATENCY.labels(scope["method"], route_label, str(status_code)).observe(time.perf_counter() - start)
+            REQUESTS_IN_FLIGHT.dec()
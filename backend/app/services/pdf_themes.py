@@ -0,0 +1,206 @@
+"""
+PDF themes: section order, headings, paragraph styles and bullet rules of a resume layout.
+
+A Theme is plain data. get_render_plan compiles it once per process into a
+RenderPlan, whose stylesheets are built once per font scale and shared by every
+render that uses the theme; treat both as read-only. ReportLab is only imported
+when a stylesheet is first built.
+"""
+import logging
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Tuple
+
+from app.services.resume_normalizer import escape_markup
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THEME = "classic"
+# ParagraphStyle attributes multiplied by the font scale (see resume_service.fit_scale)
+SCALED_ATTRIBUTES = ("fontSize", "leading", "spaceBefore", "spaceAfter")
+
+
+@dataclass(frozen=True)
+class Theme:
+    """A resume layout. Colours are hex strings and alignments "left", "center" or "right"."""
+    name: str
+    description: str
+    # (parsed section key, heading) in page order; the name and contact details always come first
+    sections: Tuple[Tuple[str, str], ...]
+    # ParagraphStyle attributes per style name
+    styles: Mapping[str, Mapping[str, Any]]
+    bullet: str = "•"
+    contact_separator: str = " | "
+    # Core competencies as one wrapped line instead of one bullet each
+    inline_competencies: bool = False
+    competency_separator: str = "  •  "
+
+
+@dataclass(frozen=True)
+class RenderPlan:
+    """A theme compiled for rendering; get one with get_render_plan."""
+    theme: Theme
+    # (parsed section key, heading markup) in page order
+    sections: Tuple[Tuple[str, str], ...]
+    bullet_prefix: str
+    _stylesheets: Dict[float, Any] = field(default_factory=dict, compare=False, repr=False)
+
+    def styles(self, scale: float = 1.0):
+        """The theme's stylesheet with font sizes and vertical spacing multiplied by scale."""
+        scale = round(scale, 2)
+        stylesheet = self._stylesheets.get(scale)
+        if stylesheet is None:
+            # Two threads may build the same stylesheet; either copy is fine to keep
+            stylesheet = self._stylesheets.setdefault(scale, _build_stylesheet(self.theme, scale))
+        return stylesheet
+
+
+CLASSIC_STYLES: Dict[str, Dict[str, Any]] = {
+    'ResumeTitle': dict(fontName='Helvetica-Bold', fontSize=20, leading=24, alignment='center',
+                        spaceAfter=4, textColor='#00008B'),
+    'ContactInfo': dict(fontName='Helvetica', fontSize=9, leading=11, alignment='center', spaceAfter=16),
+    'ProfessionalSummary': dict(fontName='Helvetica', fontSize=10, leading=13, alignment='left', spaceAfter=8),
+    'SectionHeading': dict(fontName='Helvetica-Bold', fontSize=11, leading=13, alignment='left',
+                           spaceBefore=10, spaceAfter=4, textColor='#00008B',
+                           borderWidth=1, borderColor='#00008B', borderPadding=1),
+    'SubSectionHeading': dict(fontName='Helvetica-Bold', fontSize=10, leading=12, alignment='left',
+                              spaceBefore=6, spaceAfter=2, textColor='#00008B'),
+    'Content': dict(fontName='Helvetica', fontSize=9, leading=11, alignment='left', spaceAfter=3),
+    'SubHeading': dict(fontName='Helvetica-Bold', fontSize=10, leading=12, alignment='left',
+                       spaceAfter=2, spaceBefore=3),
+    'BulletPoint': dict(fontName='Helvetica', fontSize=9, leading=11, alignment='left',
+                        leftIndent=12, bulletIndent=3, spaceAfter=2),
+    'CompetencyItem': dict(fontName='Helvetica', fontSize=9, leading=11, alignment='left',
+                           leftIndent=8, spaceAfter=2),
+}
+
+CLASSIC_SECTIONS = (
+    ('PROFESSIONAL_SUMMARY', 'PROFESSIONAL SUMMARY'),
+    ('CORE_COMPETENCIES', 'CORE COMPETENCIES'),
+    ('PROFESSIONAL_EXPERIENCE', 'PROFESSIONAL EXPERIENCE'),
+    ('TECHNICAL_SKILLS', 'TECHNICAL EXPERTISE'),
+    ('EDUCATION', 'EDUCATION'),
+    ('PROJECTS', 'KEY PROJECTS'),
+    ('CERTIFICATIONS_AWARDS', 'CERTIFICATIONS & ACHIEVEMENTS'),
+)
+
+
+def derive_styles(base: Mapping[str, Mapping[str, Any]], **overrides: Mapping[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """A copy of a theme's styles with some attributes of some styles replaced."""
+    styles = {name: dict(attributes) for name, attributes in base.items()}
+    for name, attributes in overrides.items():
+        styles[name].update(attributes)
+    return styles
+
+
+THEMES: Dict[str, Theme] = {}
+
+
+def register_theme(theme: Theme) -> None:
+    """Make a theme selectable by name; replacing a theme needs a restart to reach compiled plans."""
+    unknown = {key for key, _ in theme.sections} - {key for key, _ in CLASSIC_SECTIONS}
+    if unknown:
+        raise ValueError(f"Theme {theme.name} has unknown sections: {sorted(unknown)}")
+    missing = set(CLASSIC_STYLES) - set(theme.styles)
+    if missing:
+        raise ValueError(f"Theme {theme.name} is missing styles: {sorted(missing)}")
+    THEMES[theme.name] = theme
+
+
+register_theme(Theme(
+    name='classic',
+    description='Centered header, boxed dark blue headings, summary and competencies first',
+    sections=CLASSIC_SECTIONS,
+    styles=CLASSIC_STYLES,
+))
+
+register_theme(Theme(
+    name='modern',
+    description='Left-aligned header in teal, experience first, skills before education',
+    sections=(
+        ('PROFESSIONAL_SUMMARY', 'Summary'),
+        ('PROFESSIONAL_EXPERIENCE', 'Experience'),
+        ('PROJECTS', 'Projects'),
+        ('TECHNICAL_SKILLS', 'Skills'),
+        ('CORE_COMPETENCIES', 'Strengths'),
+        ('EDUCATION', 'Education'),
+        ('CERTIFICATIONS_AWARDS', 'Certifications'),
+    ),
+    styles=derive_styles(
+        CLASSIC_STYLES,
+        ResumeTitle=dict(fontSize=22, leading=26, alignment='left', textColor='#0F766E'),
+        ContactInfo=dict(alignment='left', spaceAfter=12, textColor='#334155'),
+        SectionHeading=dict(fontSize=12, leading=14, spaceBefore=12, textColor='#0F766E',
+                            borderWidth=0, borderPadding=0),
+        SubHeading=dict(textColor='#1E293B'),
+    ),
+    bullet='–',
+    contact_separator='  ·  ',
+    inline_competencies=True,
+    competency_separator='  ·  ',
+))
+
+register_theme(Theme(
+    name='compact',
+    description='Serif, smaller type and tighter spacing for long resumes',
+    sections=(
+        ('PROFESSIONAL_SUMMARY', 'SUMMARY'),
+        ('TECHNICAL_SKILLS', 'SKILLS'),
+        ('PROFESSIONAL_EXPERIENCE', 'EXPERIENCE'),
+        ('PROJECTS', 'PROJECTS'),
+        ('EDUCATION', 'EDUCATION'),
+        ('CERTIFICATIONS_AWARDS', 'CERTIFICATIONS'),
+        ('CORE_COMPETENCIES', 'COMPETENCIES'),
+    ),
+    styles=derive_styles(
+        CLASSIC_STYLES,
+        ResumeTitle=dict(fontName='Times-Bold', fontSize=17, leading=20, textColor='#000000'),
+        ContactInfo=dict(fontName='Times-Roman', spaceAfter=8),
+        ProfessionalSummary=dict(fontName='Times-Roman', fontSize=9.5, leading=11.5, spaceAfter=4),
+        SectionHeading=dict(fontName='Times-Bold', fontSize=10.5, leading=12, spaceBefore=6, spaceAfter=2,
+                            textColor='#000000', borderWidth=0, borderPadding=0),
+        SubSectionHeading=dict(fontName='Times-Bold', textColor='#000000'),
+        Content=dict(fontName='Times-Roman', leading=10.5, spaceAfter=1.5),
+        SubHeading=dict(fontName='Times-Bold', fontSize=9.5, leading=11, spaceAfter=1, spaceBefore=2),
+        BulletPoint=dict(fontName='Times-Roman', leading=10.5, leftIndent=10, spaceAfter=1),
+        CompetencyItem=dict(fontName='Times-Roman', leading=10.5, spaceAfter=1),
+    ),
+    inline_competencies=True,
+))
+
+
+def theme_names() -> List[str]:
+    return sorted(THEMES)
+
+
+@lru_cache(maxsize=None)
+def get_render_plan(name: str = DEFAULT_THEME) -> RenderPlan:
+    """The compiled plan of a registered theme; raises ValueError for unknown names."""
+    theme = THEMES.get(name)
+    if theme is None:
+        raise ValueError(f"Unknown theme '{name}', choose one of: {', '.join(theme_names())}")
+    sections = tuple((key, escape_markup(heading)) for key, heading in theme.sections)
+    return RenderPlan(theme=theme, sections=sections, bullet_prefix=f"{escape_markup(theme.bullet)} ")
+
+
+def _build_stylesheet(theme: Theme, scale: float):
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
+    from reportlab.lib.colors import HexColor
+
+    alignments = {'left': TA_LEFT, 'center': TA_CENTER, 'right': TA_RIGHT}
+    styles = getSampleStyleSheet()
+    for style_name, attributes in theme.styles.items():
+        values = {}
+        for key, value in attributes.items():
+            if key in SCALED_ATTRIBUTES:
+                value = value * scale
+            elif key == 'alignment':
+                value = alignments[value]
+            elif key.endswith('Color'):
+                value = HexColor(value)
+            values[key] = value
+        if style_name not in styles:
+            styles.add(ParagraphStyle(name=style_name, **values))
+    logger.debug(f"Built the {theme.name} stylesheet at scale {scale}")
+    return styles
@@ -0,0 +1,137 @@
+import os
+import sys
+import hmac
+import time
+import uuid
+import threading
+import logging
+from collections import Counter
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Profiling is disabled unless an admin token is configured
+PROFILER_ADMIN_TOKEN = os.getenv("PROFILER_ADMIN_TOKEN")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILER_INTERVAL_MS = float(os.getenv("PROFILER_INTERVAL_MS", 5))
+
+PROFILE_HEADER = "x-profile"
+ADMIN_TOKEN_HEADER = "x-admin-token"
+
+# Only one request per worker is profiled at a time
+_profiling_lock = threading.Lock()
+
+
+def is_admin_token(token: Optional[str]) -> bool:
+    """Constant-time check of an admin token against PROFILER_ADMIN_TOKEN."""
+    if not PROFILER_ADMIN_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token.encode(), PROFILER_ADMIN_TOKEN.encode())
+
+
+def profile_path(profile_id: str) -> str:
+    return os.path.join(PROFILE_DIR, f"{profile_id}.collapsed")
+
+
+def list_profiles() -> List[str]:
+    """Profile ids stored on disk, newest first."""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    files = [f for f in os.listdir(PROFILE_DIR) if f.endswith(".collapsed")]
+    files.sort(key=lambda f: os.path.getmtime(os.path.join(PROFILE_DIR, f)), reverse=True)
+    return [f[:-len(".collapsed")] for f in files]
+
+
+class SamplingProfiler:
+    """
+    Low-overhead wall-clock sampler for a single thread.
+
+    A background thread periodically snapshots the target thread's Python
+    stack via sys._current_frames() and counts identical stacks. The result is
+    written in the collapsed-stack format ("outer;inner;leaf count") read by
+    flamegraph.pl, speedscope and similar tools.
+
+    Handlers run on the event loop thread, so blocking work such as ReportLab
+    rendering or PyPDF2 extraction dominates the samples. Other requests served
+    concurrently on the same loop can also appear in the profile.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":"))
+                frame = frame.f_back
+            self.samples[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles a request when an admin sends `X-Profile: 1`.
+
+    The request must also carry `X-Admin-Token` matching PROFILER_ADMIN_TOKEN.
+    The profile id is returned in the `X-Profile-Id` response header and the
+    profile can be fetched from /api/v1/admin/profiles/{profile_id}.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not PROFILER_ADMIN_TOKEN:
+            await self.app(scope, receive, send)
+            return
+
+        headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        if headers.get(PROFILE_HEADER) not in ("1", "true") or not is_admin_token(headers.get(ADMIN_TOKEN_HEADER)):
+            await self.app(scope, receive, send)
+            return
+
+        if not _profiling_lock.acquire(blocking=False):
+            logger.info(f"Skipping profile of {scope['path']}: another request is being profiled")
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        profiler = SamplingProfiler(threading.get_ident(), PROFILER_INTERVAL_MS / 1000)
+        profiler.start()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            _profiling_lock.release()
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            with open(profile_path(profile_id), "w", encoding="utf-8") as f:
+                f.write(profiler.collapsed())
+            logger.info(
+                f"Profiled {scope['method']} {scope['path']} in {time.perf_counter() - start:.3f}s: "
+                f"{sum(profiler.samples.values())} samples saved as {profile_id}"
+            )
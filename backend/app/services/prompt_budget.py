@@ -0,0 +1,279 @@
+import os
+import re
+import math
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from app.services.metrics import PROMPT_TOKENS_SAVED
+
+logger = logging.getLogger(__name__)
+
+# Rough heuristic used for Gemini-family tokenizers on English text
+CHARS_PER_TOKEN = 4
+
+# Budgets are in estimated tokens; 0 disables truncation (cleanup still runs)
+JOB_DESCRIPTION_TOKEN_BUDGET = int(os.getenv("PROMPT_JOB_DESCRIPTION_TOKEN_BUDGET", 1500))
+RESUME_TOKEN_BUDGET = int(os.getenv("PROMPT_RESUME_TOKEN_BUDGET", 4000))
+
+# Lines that are legal/boilerplate text and never useful for tailoring
+BOILERPLATE_LINE_PATTERN = re.compile(
+    r"equal (employment )?opportunity|without regard to|e-verify|reasonable accommodation"
+    r"|affirmative action|protected veteran|genetic information|sexual orientation"
+    r"|gender identity|national origin|pay transparency|privacy (notice|policy)"
+    r"|background check|drug[- ]free workplace|applicants? with disabilities",
+    re.IGNORECASE
+)
+
+# Section headings whose whole body can be dropped; matched against the whole heading,
+# so lines such as "Legal research and drafting" are never taken for one
+BOILERPLATE_HEADING_PATTERN = re.compile(
+    r"(benefits|perks|perks (and|&) benefits|benefits (and|&) perks|what we offer( you)?|our benefits"
+    r"|why join us|compensation (and|&) benefits|eeo statement|equal opportunity"
+    r"|diversity(,? equity,? (and|&) inclusion)?|how to apply|legal)",
+    re.IGNORECASE
+)
+
+# Section headings that carry the requirements and must survive truncation
+PRIORITY_HEADING_PATTERN = re.compile(
+    r"(requirement|qualification|responsibilit|what you('| wi)ll do|what you bring"
+    r"|skills|must have|nice to have|experience|the role|about the job|duties)",
+    re.IGNORECASE
+)
+
+SENTENCE_SPLIT_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+HEADING_MAX_LENGTH = 60
+HEADING_MAX_WORDS = 5
+
+
+@dataclass
+class BudgetedText:
+    """Result of running a prompt input through the budget stage."""
+    text: str
+    original_tokens: int
+    final_tokens: int
+    truncated: bool = False
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.final_tokens
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of LLM tokens in a piece of text."""
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def normalize_whitespace(text: str) -> str:
+    """Collapse repeated spaces and blank lines while keeping line structure."""
+    lines = [re.sub(r"[ \t\xa0]+", " ", line).strip() for line in text.splitlines()]
+    text = "\n".join(lines)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def _is_boilerplate_heading(heading: str) -> bool:
+    return BOILERPLATE_HEADING_PATTERN.fullmatch(heading.rstrip(':').strip()) is not None
+
+
+def _is_heading(line: str) -> bool:
+    """Heuristic heading detection for scraped job descriptions."""
+    if not line or len(line) > HEADING_MAX_LENGTH:
+        return False
+    if line.startswith(('-', '•', '*')):
+        return False
+    if line.endswith(':') or (line.isupper() and any(c.isalpha() for c in line)):
+        return True
+    # Bare keyword headings such as "Requirements" or "Benefits"
+    return len(line.split()) <= HEADING_MAX_WORDS and not line.endswith('.') and bool(
+        PRIORITY_HEADING_PATTERN.search(line) or _is_boilerplate_heading(line)
+    )
+
+
+
+def _split_sections(text: str) -> List[Tuple[str, List[str]]]:
+    """Split text into (heading, lines) sections. The first section may have an empty heading."""
+    sections = [("", [])]
+    for line in text.split('\n'):
+        if _is_heading(line):
+            sections.append((line, []))
+        else:
+            sections[-1][1].append(line)
+    return sections
+
+
+def _strip_boilerplate(line: str) -> str:
+    """Drop the boilerplate sentences of a line, so a one-paragraph description keeps the rest."""
+    if not BOILERPLATE_LINE_PATTERN.search(line):
+        return line
+    sentences = SENTENCE_SPLIT_PATTERN.split(line)
+    return " ".join(sentence for sentence in sentences if not BOILERPLATE_LINE_PATTERN.search(sentence))
+
+
+def _dedupe_paragraphs(lines: List[str], seen: set) -> List[str]:
+    """Drop paragraphs (blank-line separated) that were already seen elsewhere in the text."""
+    result = []
+    paragraph = []
+
+    def flush():
+        if not paragraph:
+            return
+        key = hashlib.sha1(re.sub(r"\W+", "", " ".join(paragraph).lower()).encode()).hexdigest()
+        if key not in seen:
+            seen.add(key)
+            result.extend(paragraph)
+            result.append("")
+        paragraph.clear()
+
+    for line in lines:
+        if line:
+            paragraph.append(line)
+        else:
+            flush()
+    flush()
+
+    while result and not result[-1]:
+        result.pop()
+    return result
+
+
+def _cut_line(line: str, max_chars: int) -> str:
+    """The start of a line within max_chars, ending at a sentence boundary if one is in the second half, else at a word."""
+    if max_chars <= 0:
+        return ""
+    head = line[:max_chars]
+    if len(head) == len(line):
+        return line
+    sentence_end = max(head.rfind(". "), head.rfind("! "), head.rfind("? "))
+    if sentence_end >= max_chars // 2:
+        return head[:sentence_end + 1]
+    space = head.rfind(" ")
+    return head[:space].rstrip() if space > 0 else head
+
+
+def _truncate_lines(lines: List[str], max_chars: int) -> List[str]:
+    """
+    Keep whole lines from the start until the character budget is used up.
+
+    The first line that does not fit is cut to the budget left rather than dropped,
+    as scraped job descriptions are often one long paragraph.
+    """
+    kept = []
+    used = 0
+    for line in lines:
+        if used + len(line) + 1 > max_chars:
+            cut = _cut_line(line, max_chars - used - 1)
+            if cut:
+                kept.append(cut)
+            break
+        kept.append(line)
+        used += len(line) + 1
+    return kept
+
+
+def _render_sections(sections: List[Tuple[str, List[str]]]) -> str:
+    blocks = []
+    for heading, lines in sections:
+        body = "\n".join(lines).strip()
+        if heading and body:
+            blocks.append(f"{heading}\n{body}")
+        elif heading or body:
+            blocks.append(heading or body)
+    return "\n\n".join(blocks)
+
+
+def budget_job_description(job_description: str, max_tokens: int = JOB_DESCRIPTION_TOKEN_BUDGET) -> BudgetedText:
+    """
+    Strip boilerplate from a job description and fit it into a token budget.
+
+    EEO/legal lines and benefits sections are removed, repeated paragraphs are
+    deduplicated, and when the text is still too long, requirement-style
+    sections are kept in preference to company blurbs.
+    """
+    original_tokens = estimate_tokens(job_description)
+    text = normalize_whitespace(job_description or "")
+
+    seen = set()
+    sections = []
+    for heading, lines in _split_sections(text):
+        if heading and _is_boilerplate_heading(heading):
+            continue
+        # Blank lines separate paragraphs; lines that were all boilerplate go
+        lines = [stripped for stripped, line in ((_strip_boilerplate(line), line) for line in lines) if stripped or not line]
+        lines = _dedupe_paragraphs(lines, seen)
+        if heading or lines:
+            sections.append((heading, lines))
+
+    result = _render_sections(sections)
+    truncated = False
+
+    if max_tokens and estimate_tokens(result) > max_tokens:
+        truncated = True
+        remaining = max_tokens * CHARS_PER_TOKEN
+        kept = {}
+
+        # Requirement sections first, then everything else, both in document order
+        priority = [i for i, (heading, _) in enumerate(sections) if heading and PRIORITY_HEADING_PATTERN.search(heading)]
+        ordered = priority + [i for i in range(len(sections)) if i not in priority]
+
+        for i in ordered:
+            heading, lines = sections[i]
+            # Headings whose lines were all deduplicated or filtered away carry nothing
+            if not any(lines):
+                continue
+            heading_cost = len(heading) + 2 if heading else 0
+            if remaining - heading_cost <= 0:
+                break
+            kept_lines = _truncate_lines(lines, remaining - heading_cost)
+            if not kept_lines:
+                break
+            kept[i] = (heading, kept_lines)
+            remaining -= heading_cost + sum(len(line) + 1 for line in kept_lines)
+            if kept_lines != lines or remaining <= 0:
+                break
+
+        result = _render_sections([kept[i] for i in sorted(kept)])
+
+    return BudgetedText(
+        text=result,
+        original_tokens=original_tokens,
+        final_tokens=estimate_tokens(result),
+        truncated=truncated
+    )
+
+
+def budget_resume(resume_text: str, max_tokens: int = RESUME_TOKEN_BUDGET) -> BudgetedText:
+    """
+    Normalise whitespace and duplicated paragraphs in resume text and cap it at a token budget.
+
+    Resumes carry no boilerplate worth removing, so only the tail is cut when
+    the text is over budget.
+    """
+    original_tokens = estimate_tokens(resume_text)
+    text = normalize_whitespace(resume_text or "")
+    lines = _dedupe_paragraphs(text.split('\n'), set())
+
+    truncated = False
+    if max_tokens and estimate_tokens("\n".join(lines)) > max_tokens:
+        truncated = True
+        lines = _truncate_lines(lines, max_tokens * CHARS_PER_TOKEN)
+
+    result = "\n".join(lines)
+    return BudgetedText(
+        text=result,
+        original_tokens=original_tokens,
+        final_tokens=estimate_tokens(result),
+        truncated=truncated
+    )
+
+
+def log_budget(label: str, budgeted: BudgetedText) -> None:
+    """Report tokens saved for a single prompt input."""
+    PROMPT_TOKENS_SAVED.labels(label).inc(max(budgeted.tokens_saved, 0))
+    logger.info(
+        f"Prompt budget [{label}]: {budgeted.original_tokens} -> {budgeted.final_tokens} tokens "
+        f"({budgeted.tokens_saved} saved{', truncated' if budgeted.truncated else ''})"
+    )
@@ -0,0 +1,267 @@
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from importlib import metadata
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+
+from app.services.job_store import HIREPILOT_DATA_DIR
+from app.services.metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+RENDER_CACHE_DIR = os.getenv("RENDER_CACHE_DIR", os.path.join(HIREPILOT_DATA_DIR, "pdf_cache"))
+# Least recently served PDFs are deleted once the cache is over this size; 0 disables the cache
+RENDER_CACHE_MAX_MB = float(os.getenv("RENDER_CACHE_MAX_MB", 256))
+RENDER_CACHE_ENABLED = RENDER_CACHE_MAX_MB > 0
+# Bump whenever build_pdf renders the same sections and options differently
+RENDER_VERSION = "1"
+# Stores between full scans of the cache directory by this worker
+RENDER_CACHE_RESCAN_EVERY = 100
+# PDFs that are not cached are rendered into a temporary file kept in memory up to this size
+PDF_SPOOL_MAX_BYTES = int(os.getenv("PDF_SPOOL_MAX_KB", 256)) * 1024
+PDF_CHUNK_SIZE = 64 * 1024
+
+PDF_KEY_PATTERN = re.compile(r"[0-9a-f]{64}")
+# Where GET downloads of cached PDFs are served, see routes/resume.py
+PDF_DOWNLOAD_PATH = "/api/v1/resume/pdf"
+
+_size_lock = threading.Lock()
+# Bytes in the cache directory as of the last scan plus this worker's writes since
+_estimated_bytes: Optional[int] = None
+_stores_since_scan = 0
+
+
+@dataclass
+class RenderedPDF:
+    """A rendered PDF, in the render cache or in a spooled temporary file when it could not be cached."""
+    etag: str
+    path: Optional[str] = None
+    file: Optional[BinaryIO] = None
+
+    @property
+    def size(self) -> int:
+        if self.path:
+            return os.path.getsize(self.path)
+        if self.file is None:
+            return 0
+        position = self.file.tell()
+        size = self.file.seek(0, os.SEEK_END)
+        self.file.seek(position)
+        return size
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+
+
+@lru_cache(maxsize=1)
+def _renderer_version() -> str:
+    try:
+        return f"{RENDER_VERSION}/reportlab-{metadata.version('reportlab')}"
+    except metadata.PackageNotFoundError:
+        return RENDER_VERSION
+
+
+def pdf_cache_key(parsed_data: Dict[str, str], **options) -> str:
+    """Hash of the canonical JSON of the sections, render options and renderer version; equal keys render equal PDFs."""
+    canonical = json.dumps(
+        {"renderer": _renderer_version(), "sections": parsed_data, "options": options},
+        sort_keys=True, ensure_ascii=False, separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _pdf_path(key: str) -> str:
+    # Two-character shards keep directories small
+    return os.path.join(RENDER_CACHE_DIR, key[:2], f"{key}.pdf")
+
+
+def cached_pdf_path(key: str) -> Optional[str]:
+    """Path of the cached PDF for a key, marking it as recently used, or None."""
+    if not RENDER_CACHE_ENABLED or not PDF_KEY_PATTERN.fullmatch(key):
+        return None
+    path = _pdf_path(key)
+    try:
+        # The modification time doubles as the last-used time for eviction
+        os.utime(path)
+    except OSError:
+        return None
+    return path
+
+
+def _write_cached(key: str, write: Callable[[BinaryIO], int]) -> Optional[str]:
+    """Write a PDF straight into a temporary file in the cache and move it into place; None on failure."""
+    path = _pdf_path(key)
+    temp_path = None
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            size = write(f)
+        if not size:
+            return None
+        os.replace(temp_path, path)
+        temp_path = None
+    except OSError as e:
+        logger.error(f"Failed to cache rendered PDF: {e}")
+        return None
+    finally:
+        # Removed on any failure, a render error included, rather than left to eviction
+        if temp_path:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    _account_store(size)
+    return path
+
+
+def _spool(key: str, write: Callable[[BinaryIO], int]) -> RenderedPDF:
+    spool = tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_BYTES)
+    write(spool)
+    spool.seek(0)
+    return RenderedPDF(etag=key, file=spool)
+
+
+def store_pdf(key: str, pdf_data: bytes) -> RenderedPDF:
+    """Cache an already rendered PDF."""
+    def write(f: BinaryIO) -> int:
+        return f.write(pdf_data)
+
+    path = _write_cached(key, write) if RENDER_CACHE_ENABLED else None
+    return RenderedPDF(etag=key, path=path) if path else _spool(key, write)
+
+
+def get_or_render_pdf(parsed_data: Dict[str, str], render: Callable[..., int], **options) -> RenderedPDF:
+    """
+    Serve the cached PDF of these sections, or render(parsed_data, file, **options) straight into the cache.
+
+    When the cache is disabled or not writable, the PDF is rendered into a spooled
+    temporary file instead, so it never has to exist as one more bytes object.
+    """
+    key = pdf_cache_key(parsed_data, **options)
+    write = partial(render, parsed_data, **options)
+    if not RENDER_CACHE_ENABLED:
+        return _spool(key, write)
+
+    path = cached_pdf_path(key)
+    record_cache_lookup("pdf_render", path is not None)
+    if path is None:
+        path = _write_cached(key, write)
+    return RenderedPDF(etag=key, path=path) if path else _spool(key, write)
+
+
+def _account_store(size: int) -> None:
+    global _estimated_bytes, _stores_since_scan
+    with _size_lock:
+        _stores_since_scan += 1
+        if _estimated_bytes is not None:
+            _estimated_bytes += size
+        rescan = (
+            _estimated_bytes is None
+            or _estimated_bytes > RENDER_CACHE_MAX_MB * 1024 * 1024
+            or _stores_since_scan >= RENDER_CACHE_RESCAN_EVERY
+        )
+        if rescan:
+            _stores_since_scan = 0
+    if rescan:
+        remaining = evict_pdfs()
+        with _size_lock:
+            _estimated_bytes = remaining
+
+
+def _cached_files() -> List[Tuple[str, os.stat_result]]:
+    entries = []
+    for shard in os.scandir(RENDER_CACHE_DIR):
+        if not shard.is_dir():
+            continue
+        for entry in os.scandir(shard.path):
+            try:
+                entries.append((entry.path, entry.stat()))
+            except FileNotFoundError:
+                continue
+    return entries
+
+
+def evict_pdfs(max_bytes: Optional[float] = None) -> int:
+    """Delete the least recently used PDFs until the cache fits in max_bytes; returns the bytes left."""
+    max_bytes = RENDER_CACHE_MAX_MB * 1024 * 1024 if max_bytes is None else max_bytes
+    entries = _cached_files()
+    total = sum(stat.st_size for _, stat in entries)
+    if total <= max_bytes:
+        return total
+
+    deleted = 0
+    stale_before = time.time() - 3600
+    for path, stat in sorted(entries, key=lambda entry: entry[1].st_mtime):
+        if total <= max_bytes:
+            break
+        # Temp files only linger when a worker died mid-write
+        if path.endswith(".tmp") and stat.st_mtime > stale_before:
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= stat.st_size
+        deleted += 1
+    logger.info(f"Evicted {deleted} cached PDFs, {total / 1024 / 1024:.1f}MB left")
+    return total
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header names the entity tag (weak comparison, as RFC 9110 asks)."""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/").strip('"') == etag:
+            return True
+    return False
+
+
+def _iter_file(file: BinaryIO) -> Iterator[bytes]:
+    while chunk := file.read(PDF_CHUNK_SIZE):
+        yield chunk
+
+
+def pdf_response(pdf: RenderedPDF, filename: str, if_none_match: Optional[str] = None, immutable: bool = False) -> Response:
+    """
+    304 when the client already has this PDF, else the cached file or the spooled one.
+
+    Only conditional GETs pass if_none_match; the POST routes that render a PDF always
+    send it, as a 304 to a POST is not a valid answer and would not save the tailoring.
+
+    Cached files go out as a FileResponse, which servers supporting the pathsend
+    extension send without copying through Python. Spooled files are streamed in
+    chunks and closed once sent.
+    """
+    headers = {
+        "ETag": f'"{pdf.etag}"',
+        # Content-addressed, so the body at a key never changes; private as it is someone's resume
+        "Cache-Control": "private, max-age=86400, immutable" if immutable else "private, no-cache",
+    }
+    if pdf.path:
+        headers["Content-Location"] = f"{PDF_DOWNLOAD_PATH}/{pdf.etag}"
+    if etag_matches(if_none_match, pdf.etag):
+        pdf.close()
+        return Response(status_code=304, headers=headers)
+
+    headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    if pdf.path:
+        return FileResponse(pdf.path, media_type="application/pdf", headers=headers)
+    headers["Content-Length"] = str(pdf.size)
+    return StreamingResponse(
+        _iter_file(pdf.file), media_type="application/pdf", headers=headers, background=BackgroundTask(pdf.close)
+    )
@@ -0,0 +1,294 @@
+"""
+One pass from parsed resume sections to the lines the PDF renderer draws.
+
+normalize_resume filters placeholder text, classifies and escapes every line of
+the parsed sections once, into a NormalizedResume of (kind, markup) lines.
+build_story in resume_service only maps those onto paragraph styles, so the
+fit-to-pages search can lay a resume out at many scales without re-reading it.
+
+Placeholders are whole-word phrases such as "N/A", bracketed template slots such
+as "[Company Name]" (see PLACEHOLDER_PHRASES and PLACEHOLDER_SLOT_WORDS), and
+any slot of the parse prompt's PARSE_TEMPLATE copied verbatim; lines, header
+parts and contact parts containing one are left out.
+
+Text from the resume is escaped before markup is added, so "R&D" or "<50ms" are
+drawn as written instead of being read as ReportLab paragraph markup.
+"""
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple
+from xml.sax.saxutils import escape
+
+# Line kinds
+HEADER = "header"      # experience or project title line
+BULLET = "bullet"      # drawn with the theme's bullet
+TEXT = "text"          # plain paragraph
+ITEM_END = "item_end"  # gap after an experience or project entry
+
+Line = Tuple[str, str]
+
+# Sections whose entries are a "Title | Company | Date" header followed by bullets
+ITEM_SECTIONS = ("PROFESSIONAL_EXPERIENCE", "PROJECTS")
+BULLET_MARKERS = ('-', '•')
+
+# Placeholder rules, comma separated: phrases matched as whole words, and words that make
+# a [bracketed slot] a template placeholder
+PLACEHOLDER_PHRASES = os.getenv(
+    "PLACEHOLDER_PHRASES", "not provided,not specified,not available,not applicable,n/a,none,nil"
+).split(',')
+PLACEHOLDER_SLOT_WORDS = os.getenv(
+    "PLACEHOLDER_SLOT_WORDS",
+    "if provided,if mentioned,if applicable,if significant,etc,list,name,full name,your,email,phone,"
+    "address,location,url,link,date,year,period,timeframe,title,degree,institution,company,"
+    "description,achievement,additional,following same format,insert,names"
+).split(',')
+
+# Section layout the parse prompt asks Gemini to fill; its [bracketed slots] are placeholders
+# wherever they are copied into a reply
+PARSE_TEMPLATE = """\
+=== PERSONAL_INFO ===
+[Full Name]
+[Email Address]
+[Phone Number]
+[Location/Address if provided]
+[LinkedIn Profile URL if provided]
+[GitHub/Portfolio URL if provided]
+[Professional Website if provided]
+[Any additional contact information]
+
+=== PROFESSIONAL_SUMMARY ===
+[Executive summary or professional profile - capture the complete summary that positions the candidate as a senior professional]
+
+=== CORE_COMPETENCIES ===
+[List of key competencies, skills, and areas of expertise - organize as bullet points or categories]
+
+=== EDUCATION ===
+[Degree Type] | [Institution Name] | [Graduation Year/Date] | [GPA if mentioned] | [Honors/Distinctions]
+[Additional degrees following same format]
+[Relevant coursework or academic projects if significant]
+
+=== TECHNICAL_SKILLS ===
+Programming Languages: [comprehensive list]
+Frameworks & Libraries: [comprehensive list]
+Databases & Data Technologies: [comprehensive list]
+Cloud Platforms & DevOps: [comprehensive list]
+Development Tools & IDEs: [comprehensive list]
+Operating Systems: [list if mentioned]
+Methodologies: [Agile, Scrum, etc. if mentioned]
+[Any other technical categories]
+
+=== PROFESSIONAL_EXPERIENCE ===
+[Job Title] | [Company Name] | [Employment Period] | [Location if provided]
+- [Detailed achievement/responsibility with quantified results]
+- [Detailed achievement/responsibility with quantified results]
+- [Continue for all significant accomplishments - maintain executive language]
+
+[Next position following same format]
+
+=== PROJECTS ===
+[Project Name] | [Technologies/Skills Used] | [Timeframe] | [Role/Context]
+- [Project description with business impact]
+- [Key technical achievements and outcomes]
+- [Quantified results and metrics]
+
+[Next project following same format]
+
+=== CERTIFICATIONS_AWARDS ===
+[Professional certifications with issuing organization and date]
+[Industry awards and recognitions]
+[Publications, patents, or thought leadership]
+[Volunteer work or community involvement if professionally relevant]
+[Professional memberships and affiliations]
+"""
+
+
+@dataclass(frozen=True)
+class NormalizedResume:
+    """A parsed resume with placeholders dropped and text escaped; treat it as read-only."""
+    name: str = ""
+    contact: List[str] = field(default_factory=list)
+    # Parsed section key -> its lines, only for sections with something left to draw
+    sections: Dict[str, List[Line]] = field(default_factory=dict)
+
+
+def escape_markup(text: str) -> str:
+    """Escape &, < and > so ReportLab draws the text instead of parsing it as markup."""
+    return escape(text)
+
+
+def _words_pattern(words: Iterable[str]) -> str:
+    """
+    Whole-word alternation of lowercase words or phrases, factored into a trie so that
+    the regex engine can skip straight to the letters they start with; any run of
+    whitespace matches the spaces inside a phrase.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in ' '.join(word.lower().split()):
+            node = node.setdefault(char, {})
+        if node is not trie:
+            node[''] = {}
+
+    def branches(node: dict, first: bool) -> str:
+        alternatives = []
+        for char, child in sorted(node.items()):
+            if char:
+                # The "not preceded by a word character" check comes after the first letter,
+                # where it does not stop the engine from searching for that letter
+                piece = r'\s+' if char == ' ' else re.escape(char)
+                alternatives.append(piece + (r'(?<!\w.)' if first else '') + branches(child, False))
+        if not alternatives:
+            return ''
+        if '' in node:
+            return f"(?:{'|'.join(alternatives)})?"
+        return alternatives[0] if len(alternatives) == 1 else f"(?:{'|'.join(alternatives)})"
+
+    return f"(?:{branches(trie, True)})(?!\\w)" if trie else r'(?!)'
+
+
+# Placeholder phrases standing on their own, and [bracketed slots] naming what belongs there;
+# both are searched in lowercased text
+_placeholder_phrase = re.compile(_words_pattern(PLACEHOLDER_PHRASES)).search
+_placeholder_slot = re.compile(rf"\[[^\]]*?{_words_pattern(PLACEHOLDER_SLOT_WORDS)}[^\]]*\]").search
+_template_slots = frozenset(slot.lower() for slot in re.findall(r"\[([^\]]*)\]", PARSE_TEMPLATE))
+_bracketed = re.compile(r"\[([^\]]*)\]").finditer
+
+
+def is_placeholder_text(text: str) -> bool:
+    """Check if text contains placeholder information that should be filtered out."""
+    if not text or text.isspace():
+        return True
+    text = text.lower()
+    if '[' in text and (
+        _placeholder_slot(text) is not None or any(match.group(1) in _template_slots for match in _bracketed(text))
+    ):
+        return True
+    return _placeholder_phrase(text) is not None
+
+
+def clean_contact_info(contact_lines: list) -> list:
+    """Clean and filter contact information, removing placeholder text."""
+    cleaned_lines = []
+
+    for line in contact_lines:
+        line = line.strip()
+        if not line or is_placeholder_text(line):
+            continue
+
+        # Handle lines with pipe separators
+        if '|' in line:
+            parts = [part.strip() for part in line.split('|')]
+            valid_parts = [part for part in parts if not is_placeholder_text(part)]
+            if valid_parts:
+                cleaned_lines.extend(valid_parts)
+        else:
+            cleaned_lines.append(line)
+
+    return cleaned_lines
+
+
+def _strip_bullet(line: str) -> str:
+    return line[1:].strip() if line.startswith(BULLET_MARKERS) else line
+
+
+def _valid_parts(line: str) -> List[str]:
+    return [part for part in (part.strip() for part in line.split('|')) if not is_placeholder_text(part)]
+
+
+def _item_header(header: str) -> str:
+    """SubHeading markup of an entry's "Title | Company | Date" line, or "" to drop the entry."""
+    if '|' not in header:
+        return "" if is_placeholder_text(header) else f"<b>{escape(header)}</b>"
+    parts = _valid_parts(header)
+    if not parts:
+        return ""
+    markup = f"<b>{escape(parts[0])}</b>"
+    if len(parts) > 1:
+        markup += f" | {escape(parts[1])}"
+    if len(parts) > 2:
+        markup += f" | <i>{escape(parts[2])}</i>"
+    return markup
+
+
+def _normalize_items(lines: List[str]) -> List[Line]:
+    """Experience and project entries: a header, then every other line as a bullet."""
+    out: List[Line] = []
+    header = None  # markup of the current entry's header, "" when the entry is dropped
+    for line in lines:
+        # The first line, and every line with | that is not a bullet, starts an entry
+        if header is None or ('|' in line and not line.startswith('-')):
+            if header:
+                out.append((ITEM_END, ""))
+            header = _item_header(line)
+            if header:
+                out.append((HEADER, header))
+        elif header and not is_placeholder_text(line):
+            out.append((BULLET, escape(_strip_bullet(line))))
+    if header:
+        out.append((ITEM_END, ""))
+    return out
+
+
+def _normalize_lines(section_key: str, lines: List[str]) -> List[Line]:
+    """Lines of any section but the experience and project entries."""
+    out: List[Line] = []
+    for line in lines:
+        if is_placeholder_text(line):
+            continue
+        if section_key == 'PROFESSIONAL_SUMMARY':
+            out.append((TEXT, escape(line)))
+        elif section_key == 'CORE_COMPETENCIES':
+            out.append((BULLET, escape(_strip_bullet(line))))
+        elif section_key == 'TECHNICAL_SKILLS':
+            if ':' in line:
+                # Category: skills
+                category, skills = line.split(':', 1)
+                if not is_placeholder_text(skills.strip()):
+                    out.append((TEXT, f"<b>{escape(category.strip())}:</b> {escape(skills.strip())}"))
+            else:
+                out.append((TEXT, escape(line)))
+        elif section_key == 'EDUCATION':
+            if '|' in line:
+                # Degree | Institution | Date, drawn as: Degree, Institution (Date)
+                parts = _valid_parts(line)
+                if len(parts) >= 2:
+                    markup = f"<b>{escape(parts[0])}</b>, {escape(parts[1])}"
+                    if len(parts) > 2:
+                        markup += f" ({escape(parts[2])})"
+                    out.append((TEXT, markup))
+                elif parts:
+                    out.append((TEXT, escape(line)))
+            else:
+                out.append((TEXT, escape(line)))
+        elif line.startswith(BULLET_MARKERS):
+            out.append((BULLET, escape(line[1:].strip())))
+        else:
+            out.append((TEXT, escape(line)))
+    return out
+
+
+def normalize_resume(parsed_data: Dict[str, str]) -> NormalizedResume:
+    """Filter, classify and escape every line of the parsed sections once."""
+    name = ""
+    contact: List[str] = []
+    personal_info = parsed_data.get('PERSONAL_INFO', '').strip()
+    if personal_info:
+        lines = [line.strip() for line in personal_info.split('\n') if line.strip()]
+        if not is_placeholder_text(lines[0]):
+            name = escape(lines[0])
+        contact = [escape(part) for part in clean_contact_info(lines[1:])]
+
+    sections: Dict[str, List[Line]] = {}
+    for section_key, content in parsed_data.items():
+        if section_key == 'PERSONAL_INFO':
+            continue
+        lines = [line for line in (line.strip() for line in (content or '').split('\n')) if line]
+        if section_key in ITEM_SECTIONS:
+            normalized = _normalize_items(lines)
+        else:
+            normalized = _normalize_lines(section_key, lines)
+        if normalized:
+            sections[section_key] = normalized
+    return NormalizedResume(name=name, contact=contact, sections=sections)
@@ -1,31 +1,80 @@
 import os
 import re
 import io
+import threading
+from collections import OrderedDict
+from textwrap import indent
 from datetime import datetime
-from typing import Dict, Optional, Tuple
+from typing import TYPE_CHECKING, BinaryIO, Dict, List, Optional, Tuple
 import httpx
-import google.generativeai as genai
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_LEFT, TA_CENTER
-from reportlab.lib.colors import darkblue
-from reportlab.lib.units import inch
-from dotenv import load_dotenv
 import logging
 
-load_dotenv()
+from app.services.ats_score import keywords
+from app.services.prompt_budget import budget_job_description, budget_resume, log_budget
+from app.services.metrics import (
+    observe_upstream,
+    record_cache_lookup,
+    track_stage,
+    PDF_BYTES,
+    GEMINI_GENERATE_CONTENT,
+    GEMINI_SDK
+)
+from app.services.pdf_themes import DEFAULT_THEME, get_render_plan
+from app.services.render_cache import RenderedPDF, get_or_render_pdf
+from app.services.resume_normalizer import BULLET, HEADER, PARSE_TEMPLATE, TEXT, NormalizedResume, normalize_resume
+from app.services.resume_store import RESUME_STORE_ENABLED, get_profile, resume_hash, save_profile
+from app.services.tracing import start_span
+
+# google.generativeai and ReportLab take most of the worker import time, so they are
+# imported inside the functions that use them (see app/services/warmup.py to preload)
+if TYPE_CHECKING:
+    import google.generativeai as genai
 
 logger = logging.getLogger(__name__)
 
+# Overridable so benchmarks can point at a local stand-in (see benchmarks/fake_upstream.py)
+GEMINI_API_BASE_URL = os.getenv("GEMINI_API_BASE_URL", "https://generativelanguage.googleapis.com").rstrip('/')
 
-def configure_gemini(api_key: str) -> Optional[genai.GenerativeModel]:
+# Tailoring modes: "full" rewrites the whole resume, "sections" only the job-sensitive sections
+TAILOR_MODE_FULL = "full"
+TAILOR_MODE_SECTIONS = "sections"
+# Sections rewritten per job in "sections" mode; the rest are copied from the parsed base resume
+JOB_SENSITIVE_SECTIONS = ("PROFESSIONAL_SUMMARY", "CORE_COMPETENCIES", "PROFESSIONAL_EXPERIENCE", "PROJECTS")
+PARSED_RESUME_CACHE_SIZE = int(os.getenv("PARSED_RESUME_CACHE_SIZE", 256))
+# Keywords kept in a resume profile, most frequent first
+RESUME_PROFILE_KEYWORDS = 30
+
+# Page margins in inches
+PDF_MARGINS = {"left": 0.65, "right": 0.65, "top": 0.6, "bottom": 0.6}
+# Range of font and spacing scales the fit-to-pages layout searches
+FIT_MIN_SCALE = float(os.getenv("PDF_FIT_MIN_SCALE", 0.8))
+FIT_MAX_SCALE = float(os.getenv("PDF_FIT_MAX_SCALE", 1.15))
+FIT_SCALE_STEP = 0.01
+
+# Section layout the parse prompt asks for, indented like the rest of the prompt
+PARSE_PROMPT_TEMPLATE = indent(PARSE_TEMPLATE, "    ").strip()
+
+# Parsed base resumes by sha256 of their text, least recently used first
+_parsed_resume_cache: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+# Parsed tailored texts, kept apart from base resumes and never stored as profiles
+_parsed_tailored_cache: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+_parsed_resume_lock = threading.Lock()
+
+
+def configure_gemini(api_key: str) -> Optional["genai.GenerativeModel"]:
     """Configure Gemini API and return the model."""
     if not api_key:
         raise ValueError("Gemini API key is required")
     
     try:
-        genai.configure(api_key=api_key)
+        import google.generativeai as genai
+
+
+        if os.getenv("GEMINI_API_BASE_URL"):
+            # The SDK's REST transport accepts a full URL, including http:// for local stand-ins
+            genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": GEMINI_API_BASE_URL})
+        else:
+            genai.configure(api_key=api_key)
         model = genai.GenerativeModel('gemini-2.5-flash')
         return model
     except Exception as e:
@@ -33,112 +82,36 @@ def configure_gemini(api_key: str) -> Optional[genai.GenerativeModel]:
         return None
 
 
-def get_resume_styles():
-    """Initialize and return a reportlab stylesheet with enhanced professional styles for 2-page layout."""
-    styles = getSampleStyleSheet()
-
-    custom_styles = {
-        'ResumeTitle': ParagraphStyle(
-            name='ResumeTitle',
-            fontName='Helvetica-Bold',
-            fontSize=20,
-            leading=24,
-            alignment=TA_CENTER,
-            spaceAfter=4,
-            textColor=darkblue
-        ),
-        'ContactInfo': ParagraphStyle(
-            name='ContactInfo',
-            fontName='Helvetica',
-            fontSize=9,
-            leading=11,
-            alignment=TA_CENTER,
-            spaceAfter=16
-        ),
-        'ProfessionalSummary': ParagraphStyle(
-            name='ProfessionalSummary',
-            fontName='Helvetica',
-            fontSize=10,
-            leading=13,
-            alignment=TA_LEFT,
-            spaceAfter=8,
-            leftIndent=0,
-            firstLineIndent=0
-        ),
-        'SectionHeading': ParagraphStyle(
-            name='SectionHeading',
-            fontName='Helvetica-Bold',
-            fontSize=11,
-            leading=13,
-            alignment=TA_LEFT,
-            spaceBefore=10,
-            spaceAfter=4,
-            textColor=darkblue,
-            borderWidth=1,
-            borderColor=darkblue,
-            borderPadding=1
-        ),
-        'SubSectionHeading': ParagraphStyle(
-            name='SubSectionHeading',
-            fontName='Helvetica-Bold',
-            fontSize=10,
-            leading=12,
-            alignment=TA_LEFT,
-            spaceBefore=6,
-            spaceAfter=2,
-            textColor=darkblue
-        ),
-        'Content': ParagraphStyle(
-            name='Content',
-            fontName='Helvetica',
-            fontSize=9,
-            leading=11,
-            alignment=TA_LEFT,
-            spaceAfter=3,
-            leftIndent=0
-        ),
-        'SubHeading': ParagraphStyle(
-            name='SubHeading',
-            fontName='Helvetica-Bold',
-            fontSize=10,
-            leading=12,
-            alignment=TA_LEFT,
-            spaceAfter=2,
-            spaceBefore=3
-        ),
-        'BulletPoint': ParagraphStyle(
-            name='BulletPoint',
-            fontName='Helvetica',
-            fontSize=9,
-            leading=11,
-            alignment=TA_LEFT,
-            leftIndent=12,
-            bulletIndent=3,
-            spaceAfter=2
-        ),
-        'CompetencyItem': ParagraphStyle(
-            name='CompetencyItem',
-            fontName='Helvetica',
-            fontSize=9,
-            leading=11,
-            alignment=TA_LEFT,
-            leftIndent=8,
-            spaceAfter=2
-        )
-    }
+def get_resume_styles(scale: float = 1.0, theme: str = DEFAULT_THEME):
+    """
+    The reportlab stylesheet of a theme (see app/services/pdf_themes.py), with font sizes
+    and vertical spacing multiplied by scale, rounded to two decimals.
 
-    for style_name, style_obj in custom_styles.items():
-        if style_name not in styles:
-            styles.add(style_obj)
-    return styles
+    Each stylesheet is built once per process and shared by every render; treat it as read-only.
+    """
+    return get_render_plan(theme).styles(scale)
 
 
 async def tailor_resume_with_llm(resume_text: str, job_description: str, gemini_api_key: str) -> Optional[str]:
     """Use the Google Gemini API to tailor a resume for professional 2-page format with optimal section division."""
     if not gemini_api_key:
         raise ValueError("Gemini API key is required")
-        
-    prompt = f"""
+
+    # Trim oversized inputs before they are interpolated into the prompt
+    budgeted_resume = budget_resume(resume_text)
+    budgeted_job = budget_job_description(job_description)
+    log_budget("tailor/resume", budgeted_resume)
+    log_budget("tailor/job_description", budgeted_job)
+    prompt = build_tailor_prompt(budgeted_resume.text, budgeted_job.text)
+    tailored_resume = await generate_content(prompt, gemini_api_key)
+    if tailored_resume is None:
+        logger.error("Failed to tailor resume")
+    return tailored_resume
+
+
+def build_tailor_prompt(resume_text: str, job_description: str) -> str:
+    """Prompt asking Gemini to rewrite the whole resume for the job description."""
+    return f"""
     You are an expert ATS-optimized resume writer and senior career strategist specializing in creating high-impact, professional resumes. Your task is to craft an exceptional, executive-level resume that maximizes interview opportunities while maintaining a clean, professional 2-page format with strategically divided sections.
 
     **PREMIUM PROFESSIONAL REQUIREMENTS:**
@@ -197,14 +170,21 @@ async def tailor_resume_with_llm(resume_text: str, job_description: str, gemini_
 
     **Professional Tailored Resume:**
     """
-    
+
+
+async def generate_content(prompt: str, gemini_api_key: str) -> Optional[str]:
+    """Send one prompt to the Gemini generateContent REST API and return the response text, or None."""
     payload = {"contents": [{"parts": [{"text": prompt}]}]}
     headers = {'Content-Type': 'application/json'}
-    gemini_api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest:generateContent?key={gemini_api_key}"
+    gemini_api_url = f"{GEMINI_API_BASE_URL}/v1beta/models/gemini-1.5-flash-latest:generateContent?key={gemini_api_key}"
 
     async with httpx.AsyncClient(timeout=120.0) as client:
         try:
-            response = await client.post(gemini_api_url, json=payload, headers=headers)
+            with start_span("gemini.generate_content", **{"gemini.prompt_chars": len(prompt)}) as span, \
+                    observe_upstream(GEMINI_GENERATE_CONTENT) as call:
+                response = await client.post(gemini_api_url, json=payload, headers=headers)
+                call.status = response.status_code
+                span.set_attribute("http.response.status_code", response.status_code)
             response.raise_for_status()
             result = response.json()
             if result.get("candidates") and result["candidates"][0].get("content"):
@@ -213,15 +193,19 @@ async def tailor_resume_with_llm(resume_text: str, job_description: str, gemini_
                 logger.error("The API response was successful but did not contain the expected content.")
                 return None
         except httpx.HTTPStatusError as e:
-            logger.error(f"API Error: Failed to tailor resume. Status: {e.response.status_code}")
+            logger.error(f"API Error: Gemini generateContent failed. Status: {e.response.status_code}")
             return None
         except Exception as e:
-            logger.error(f"An unexpected error occurred during resume tailoring: {e}")
+            logger.error(f"An unexpected error occurred calling Gemini: {e}")
             return None
 
 
-def parse_resume_with_gemini(model: genai.GenerativeModel, resume_text: str) -> Optional[str]:
-    """Enhanced parsing for professional resume structure with comprehensive section extraction."""
+def parse_resume_with_gemini(model: "genai.GenerativeModel", resume_text: str) -> Optional[str]:
+    """
+    Enhanced parsing for professional resume structure with comprehensive section extraction.
+
+    The resume is sent whole, not through the prompt budget: whatever is cut here would be missing from the PDF.
+    """
     prompt = f"""
     You are an expert resume parser specializing in extracting structured information from professional resumes. Parse the following resume text and organize it into clearly defined sections for optimal presentation in a professional 2-page format.
 
@@ -244,59 +228,7 @@ def parse_resume_with_gemini(model: genai.GenerativeModel, resume_text: str) ->
 
     Format your response EXACTLY as follows:
 
-    === PERSONAL_INFO ===
-    [Full Name]
-    [Email Address]
-    [Phone Number]
-    [Location/Address if provided]
-    [LinkedIn Profile URL if provided]
-    [GitHub/Portfolio URL if provided]
-    [Professional Website if provided]
-    [Any additional contact information]
-
-    === PROFESSIONAL_SUMMARY ===
-    [Executive summary or professional profile - capture the complete summary that positions the candidate as a senior professional]
-
-    === CORE_COMPETENCIES ===
-    [List of key competencies, skills, and areas of expertise - organize as bullet points or categories]
-
-    === EDUCATION ===
-    [Degree Type] | [Institution Name] | [Graduation Year/Date] | [GPA if mentioned] | [Honors/Distinctions]
-    [Additional degrees following same format]
-    [Relevant coursework or academic projects if significant]
-
-    === TECHNICAL_SKILLS ===
-    Programming Languages: [comprehensive list]
-    Frameworks & Libraries: [comprehensive list]
-    Databases & Data Technologies: [comprehensive list]
-    Cloud Platforms & DevOps: [comprehensive list]
-    Development Tools & IDEs: [comprehensive list]
-    Operating Systems: [list if mentioned]
-    Methodologies: [Agile, Scrum, etc. if mentioned]
-    [Any other technical categories]
-
-    === PROFESSIONAL_EXPERIENCE ===
-    [Job Title] | [Company Name] | [Employment Period] | [Location if provided]
-    - [Detailed achievement/responsibility with quantified results]
-    - [Detailed achievement/responsibility with quantified results]
-    - [Continue for all significant accomplishments - maintain executive language]
-
-    [Next position following same format]
-
-    === PROJECTS ===
-    [Project Name] | [Technologies/Skills Used] | [Timeframe] | [Role/Context]
-    - [Project description with business impact]
-    - [Key technical achievements and outcomes]
-    - [Quantified results and metrics]
-
-    [Next project following same format]
-
-    === CERTIFICATIONS_AWARDS ===
-    [Professional certifications with issuing organization and date]
-    [Industry awards and recognitions]
-    [Publications, patents, or thought leadership]
-    [Volunteer work or community involvement if professionally relevant]
-    [Professional memberships and affiliations]
+    {PARSE_PROMPT_TEMPLATE}
 
     **IMPORTANT NOTES:**
     - Preserve ALL quantified achievements (percentages, dollar amounts, timelines)
@@ -311,8 +243,14 @@ def parse_resume_with_gemini(model: genai.GenerativeModel, resume_text: str) ->
     """
 
     try:
-        response = model.generate_content(prompt)
-        return response.text
+        with start_span("gemini.sdk.generate_content", **{"gemini.prompt_chars": len(prompt)}) as span, \
+                observe_upstream(GEMINI_SDK) as call:
+            response = model.generate_content(prompt)
+            # Reading the text raises when the reply was blocked, so the call is only ok after it
+            text = response.text
+            call.status = "ok"
+            span.set_attribute("gemini.output_chars", len(text))
+        return text
     except Exception as e:
         logger.error(f"Error processing with Gemini: {str(e)}")
         return None
@@ -366,255 +304,424 @@ def parse_gemini_output_to_dict(gemini_output: str) -> Dict[str, str]:
     return parsed_data
 
 
-def is_placeholder_text(text: str) -> bool:
-    """Check if text contains placeholder information that should be filtered out."""
-    if not text or not text.strip():
-        return True
-    
-    placeholder_indicators = [
-        'not provided',
-        'not specified',
-        'not available',
-        'n/a',
-        '[', ']', 
-        'none',
-        'nil'
-    ]
-    
-    text_lower = text.lower().strip()
-    return any(indicator in text_lower for indicator in placeholder_indicators)
+def has_sections(parsed_data: Dict[str, str]) -> bool:
+    """Whether a parse found anything; refusals and unrelated replies parse into only empty sections."""
+    return any(content.strip() for content in parsed_data.values())
 
 
-def clean_contact_info(contact_lines: list) -> list:
-    """Clean and filter contact information, removing placeholder text."""
-    cleaned_lines = []
-    
-    for line in contact_lines:
-        line = line.strip()
-        if not line or is_placeholder_text(line):
-            continue
-        
-        # Handle lines with pipe separators
-        if '|' in line:
-            parts = [part.strip() for part in line.split('|')]
-            valid_parts = [part for part in parts if not is_placeholder_text(part)]
-            if valid_parts:
-                cleaned_lines.extend(valid_parts)
-        else:
-            cleaned_lines.append(line)
-    
-    return cleaned_lines
+def resume_keywords(resume_text: str) -> List[str]:
+    """The resume's most frequent keywords, as ATS scoring extracts them."""
+    counts = keywords(resume_text)
+    return sorted(counts, key=lambda word: (-counts[word], word))[:RESUME_PROFILE_KEYWORDS]
 
 
-def _process_structured_item_filtered(item_lines: list, story: list, styles):
-    """Enhanced helper function to process structured items with professional formatting."""
-    if not item_lines:
-        return
-    
-    # Process header with enhanced formatting
-    header = item_lines[0]
-    
-    # Handle pipe-separated headers for professional presentation
-    if '|' in header:
-        header_parts = [part.strip() for part in header.split('|')]
-        valid_parts = [part for part in header_parts if not is_placeholder_text(part)]
-        if valid_parts:
-            # Format as: Title | Company | Date
-            if len(valid_parts) >= 2:
-                # Bold title, regular company and date
-                formatted_header = f"<b>{valid_parts[0]}</b>"
-                if len(valid_parts) > 1:
-                    formatted_header += f" | {valid_parts[1]}"
-                if len(valid_parts) > 2:
-                    formatted_header += f" | <i>{valid_parts[2]}</i>"
-                story.append(Paragraph(formatted_header, styles['SubHeading']))
+def get_parsed_base_resume(resume_text: str, gemini_api_key: str, store: bool = True) -> Optional[Dict[str, str]]:
+    """
+    Parse a resume into sections once.
+
+    Repeats are served from an in-process LRU cache, then from the resume store shared
+    by all workers and restarts. Only a resume missing from both is sent to Gemini, and
+    its profile is stored. Store failures never fail the parse. With store=False, for
+    tailored text, only a separate in-process cache is used and nothing is stored.
+    """
+    key = resume_hash(resume_text)
+    cache = _parsed_resume_cache if store else _parsed_tailored_cache
+    with _parsed_resume_lock:
+        cached = cache.get(key)
+        if cached is not None:
+            cache.move_to_end(key)
+    record_cache_lookup("parsed_resume" if store else "parsed_tailored", cached is not None)
+    if cached is not None:
+        return dict(cached)
+
+    parsed = None
+    if store and RESUME_STORE_ENABLED:
+        try:
+            profile = get_profile(key)
+            # Sections that are all empty are a failed parse, so the resume is parsed again
+            parsed = profile.sections if profile and has_sections(profile.sections or {}) else None
+        except Exception as e:
+            logger.error(f"Resume store lookup failed: {e}")
+        record_cache_lookup("resume_profile", parsed is not None)
+
+    if parsed is None:
+        model = configure_gemini(gemini_api_key)
+        if not model:
+            return None
+        gemini_parsed_text = parse_resume_with_gemini(model, resume_text)
+        if not gemini_parsed_text:
+            return None
+        parsed = parse_gemini_output_to_dict(gemini_parsed_text)
+        if not has_sections(parsed):
+            # Neither cached nor stored, so the next request asks Gemini again
+            logger.error("Gemini returned no resume sections")
+            return None
+        if store and RESUME_STORE_ENABLED:
+            try:
+                save_profile(resume_text, sections=parsed, keywords=resume_keywords(resume_text))
+            except Exception as e:
+                logger.error(f"Failed to store resume profile: {e}")
+
+    with _parsed_resume_lock:
+        cache[key] = parsed
+        while len(cache) > PARSED_RESUME_CACHE_SIZE:
+            cache.popitem(last=False)
+    return dict(parsed)
+
+
+def stored_resume_id(resume_text: str, sections: Dict[str, str]) -> Optional[str]:
+    """
+    resume_id of a parsed resume once its profile is confirmed stored, or None.
+
+    A parse served from the in-process cache may belong to a profile evicted since,
+    so a missing profile is stored again from the sections.
+    """
+    if not RESUME_STORE_ENABLED or not has_sections(sections):
+        return None
+    try:
+        profile = get_profile(resume_hash(resume_text))
+        if profile is not None and profile.sections is not None:
+            return profile.resume_id
+        return save_profile(resume_text, sections=sections, keywords=resume_keywords(resume_text))
+    except Exception as e:
+        logger.error(f"Failed to store resume profile: {e}")
+        return None
+
+
+def render_sections(sections: Dict[str, str]) -> str:
+    """Format sections in the same === SECTION === layout the parse prompt produces."""
+    return "\n\n".join(f"=== {name} ===\n{content}" for name, content in sections.items() if content)
+
+
+def build_section_tailor_prompt(sections_text: str, job_description: str) -> str:
+    """Prompt asking Gemini to rewrite only the given resume sections for the job description."""
+    return f"""
+    You are an expert ATS-optimized resume writer. Rewrite the resume sections below for the target job.
+
+    **RULES:**
+    - Professional Summary: a powerful 3-4 line summary aligned with the role
+    - Core Competencies: 8-12 high-impact skills and keywords from the job description that the candidate has
+    - Professional Experience: keep every role's title, company and dates; rewrite the bullets in CAR format, quantified, most relevant first
+    - Projects: keep names and technologies; emphasise outcomes relevant to the role
+    - Never invent employers, degrees, dates or metrics that are not in the original
+    - Return ONLY the sections below, each under its unchanged === SECTION === header, with no other commentary
+
+    **Resume Sections:**
+    {sections_text}
+
+    **Target Job Description:**
+    {job_description}
+    """
+
+
+async def tailor_resume_sections(resume_text: str, job_description: str, gemini_api_key: str) -> Optional[Dict[str, str]]:
+    """
+    Tailor only the job-sensitive sections and reassemble them with the invariant ones.
+
+    PERSONAL_INFO, EDUCATION, TECHNICAL_SKILLS and CERTIFICATIONS_AWARDS come from the
+    cached parse of the base resume and are never sent for tailoring, and the result is
+    already structured, so no second parse call is needed before rendering.
+    """
+    if not gemini_api_key:
+        raise ValueError("Gemini API key is required")
+
+    base = get_parsed_base_resume(resume_text, gemini_api_key)
+    if base is None:
+        logger.error("Failed to parse the base resume")
+        return None
+
+    sections = {name: base[name] for name in JOB_SENSITIVE_SECTIONS if base.get(name)}
+    if not sections:
+        return base
+
+    budgeted_job = budget_job_description(job_description)
+    log_budget("tailor_sections/job_description", budgeted_job)
+    output = await generate_content(build_section_tailor_prompt(render_sections(sections), budgeted_job.text), gemini_api_key)
+    if output is None:
+        logger.error("Failed to tailor resume sections")
+        return None
+
+    tailored = parse_gemini_output_to_dict(output)
+    merged = dict(base)
+    for name in sections:
+        # Keep the base section if Gemini dropped it
+        if tailored.get(name):
+            merged[name] = tailored[name]
+    return merged
+
+
+def create_pdf_from_data(parsed_data: Dict[str, str], fit_pages: int = 0, theme: str = DEFAULT_THEME) -> bytes:
+    """Render the resume PDF in memory; routes render into files with build_pdf instead."""
+    buffer = io.BytesIO()
+    build_pdf(parsed_data, buffer, fit_pages, theme)
+    return buffer.getvalue()
+
+
+def _content_area() -> Tuple[float, float]:
+    """Width and height available to flowables on a page, inside the margins and frame padding."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+
+    width, height = letter
+    # SimpleDocTemplate's frame pads its content by 6pt on every side
+    return (
+        width - PDF_MARGINS["left"] * inch - PDF_MARGINS["right"] * inch - 12,
+        height - PDF_MARGINS["top"] * inch - PDF_MARGINS["bottom"] * inch - 12
+    )
+
+
+def count_pages(story: list, width: float, height: float, max_pages: Optional[int] = None) -> int:
+    """Pages a story fills without drawing it; see _layout_pages."""
+    return _layout_pages(story, width, height, max_pages)[0]
+
+
+def _layout_pages(story: list, width: float, height: float, max_pages: Optional[int] = None) -> Tuple[int, float]:
+    """
+    Lay a story out the way platypus frames do it (wrap, split, and space before
+    overlapping the previous space after) without drawing anything.
+
+    Returns the pages it fills and the height used on the last one. Stops at
+    max_pages + 1 once the story is known to need more than max_pages.
+    """
+    pages, y, at_top, space_after = 1, height, True, 0.0
+    pending = story[::-1]
+    while pending:
+        flowable = pending.pop()
+        space = 0.0 if at_top else max(flowable.getSpaceBefore() - space_after, 0)
+        available = y - space
+        placed = None
+        if available > 0:
+            _, flowable_height = flowable.wrap(width, available)
+            if available - flowable_height >= -1e-6:
+                placed = flowable
             else:
-                story.append(Paragraph(f"<b>{valid_parts[0]}</b>", styles['SubHeading']))
-        else:
-            return  # Skip if no valid parts
+                parts = flowable.split(width, available)
+                if parts:
+                    placed = parts[0]
+                    _, flowable_height = placed.wrap(width, available)
+                    pending.extend(reversed(parts[1:]))
+                elif at_top:
+                    # Taller than a page; platypus would raise, count it as filling this one
+                    placed = flowable
+        if placed is None:
+            pending.append(flowable)
+            pages += 1
+            if max_pages and pages > max_pages:
+                break
+            y, at_top, space_after = height, True, 0.0
+            continue
+        space_after = placed.getSpaceAfter()
+        new_y = available - flowable_height - space_after
+        at_top = at_top and new_y == y
+        y = new_y
+    return pages, min(height - y, height)
+
+
+def fit_scale(resume: NormalizedResume, fit_pages: int, theme: str = DEFAULT_THEME) -> Tuple[float, int]:
+    """
+    Largest font and spacing scale at which the resume fits in fit_pages pages; returns (scale, probes).
+
+    Searches FIT_SCALE_STEP steps between FIT_MIN_SCALE and FIT_MAX_SCALE, laying each
+    candidate out with _layout_pages. The first probe, at FIT_MAX_SCALE, also gives a
+    guess to start from, which a galloping then binary search refines. Resumes too
+    long even at FIT_MIN_SCALE get FIT_MIN_SCALE.
+    """
+    width, height = _content_area()
+    steps = round((FIT_MAX_SCALE - FIT_MIN_SCALE) / FIT_SCALE_STEP)
+    probes = 0
+
+    def layout(step: int, max_pages: Optional[int]) -> Tuple[int, float]:
+        nonlocal probes
+        probes += 1
+        story = build_story(resume, FIT_MIN_SCALE + step * FIT_SCALE_STEP, theme)
+        return _layout_pages(story, width, height, max_pages)
+
+    def fits(step: int) -> bool:
+        return layout(step, fit_pages)[0] <= fit_pages
+
+    pages, used = layout(steps, None)
+    if pages <= fit_pages:
+        return FIT_MAX_SCALE, probes
+
+    # Most resume lines are too short to wrap, so the height grows about linearly with the scale
+    filled = pages - 1 + used / height
+    guess_scale = FIT_MAX_SCALE * fit_pages / filled
+    guess = min(max(int((guess_scale - FIT_MIN_SCALE) / FIT_SCALE_STEP), 0), steps - 1)
+
+    # Bracket the answer with fits(low) and not fits(high), galloping away from the guess;
+    # low == -1 stands for "below FIT_MIN_SCALE"
+    stride = 1
+    if fits(guess):
+        low, high = guess, steps
+        while low + stride < high:
+            if not fits(low + stride):
+                high = low + stride
+                break
+            low += stride
+            stride *= 2
     else:
-        if not is_placeholder_text(header):
-            story.append(Paragraph(f"<b>{header}</b>", styles['SubHeading']))
+        low, high = -1, guess
+        while high - stride > low:
+            if fits(high - stride):
+                low = high - stride
+                break
+            high -= stride
+            stride *= 2
+
+    while high - low > 1:
+        middle = (low + high) // 2
+        if fits(middle):
+            low = middle
         else:
-            return  # Skip if header is placeholder
-    
-    # Process content lines with enhanced bullet formatting
-    for line in item_lines[1:]:
-        line = line.strip()
-        if line and not is_placeholder_text(line):
-            if line.startswith('-') or line.startswith('•'):
-                # Remove existing bullet and add professional bullet
-                clean_line = line[1:].strip()
-                story.append(Paragraph(f"• {clean_line}", styles['BulletPoint']))
-            else:
-                # Add bullet to non-bulleted content lines
-                story.append(Paragraph(f"• {line}", styles['BulletPoint']))
-    
-    # Add small spacer after each item for better separation
-    story.append(Spacer(1, 4))
+            high = middle
 
+    if low < 0:
+        logger.info(f"Resume does not fit in {fit_pages} pages even at scale {FIT_MIN_SCALE}")
+        return FIT_MIN_SCALE, probes
+    return round(FIT_MIN_SCALE + low * FIT_SCALE_STEP, 2), probes
+
+
+def build_pdf(parsed_data: Dict[str, str], output: BinaryIO, fit_pages: int = 0, theme: str = DEFAULT_THEME) -> int:
+    """
+    Enhanced PDF generation with professional 2-page layout and premium formatting; returns bytes written.
+
+    The layout and styles come from the theme. With fit_pages, fonts and spacing are
+    scaled so the resume fills at most that many pages.
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate
+    from reportlab.lib.units import inch
+
+    start = output.tell()
+    # Normalized once; every fit probe and the final render reuse it
+    resume = normalize_resume(parsed_data)
+    scale = 1.0
+    if fit_pages:
+        with start_span("resume.fit", **{"pdf.fit_pages": fit_pages}) as span:
+            scale, probes = fit_scale(resume, fit_pages, theme)
+            span.set_attribute("pdf.scale", scale)
+            span.set_attribute("pdf.fit_probes", probes)
 
-def create_pdf_from_data(parsed_data: Dict[str, str]) -> bytes:
-    """Enhanced PDF generation with professional 2-page layout and premium formatting."""
-    buffer = io.BytesIO()
     doc = SimpleDocTemplate(
-        buffer, 
+        output, 
         pagesize=letter,
-        rightMargin=0.65*inch, 
-        leftMargin=0.65*inch,
-        topMargin=0.6*inch, 
-        bottomMargin=0.6*inch
+        rightMargin=PDF_MARGINS["right"]*inch, 
+        leftMargin=PDF_MARGINS["left"]*inch,
+        topMargin=PDF_MARGINS["top"]*inch, 
+        bottomMargin=PDF_MARGINS["bottom"]*inch
     )
+    story = build_story(resume, scale, theme)
 
-    styles = get_resume_styles()
+    with start_span("reportlab.build", **{"pdf.flowables": len(story), "pdf.theme": theme}) as span:
+        doc.build(story)
+        size = output.tell() - start
+        span.set_attribute("pdf.size_bytes", size)
+        span.set_attribute("pdf.pages", doc.page)
+    PDF_BYTES.observe(size)
+    return size
+
+
+def build_story(resume: NormalizedResume, scale: float = 1.0, theme: str = DEFAULT_THEME) -> list:
+    """The normalized resume's flowables in the theme's layout, styled at the given font and spacing scale."""
+    from reportlab.platypus import Paragraph, Spacer
+
+    plan = get_render_plan(theme)
+    styles = plan.styles(scale)
+    bullet = plan.bullet_prefix
     story = []
 
-    # Personal Information
-    personal_info = parsed_data.get('PERSONAL_INFO', '').strip()
-    if personal_info:
-        lines = [line.strip() for line in personal_info.split('\n') if line.strip()]
-        if lines:
-            # Name (first line)
-            name = lines[0]
-            if not is_placeholder_text(name):
-                story.append(Paragraph(name, styles['ResumeTitle']))
-            
-            # Contact information (remaining lines)
-            contact_lines = lines[1:] if len(lines) > 1 else []
-            cleaned_contact = clean_contact_info(contact_lines)
-            
-            if cleaned_contact:
-                contact_info = " | ".join(cleaned_contact)
-                story.append(Paragraph(contact_info, styles['ContactInfo']))
-
-    # Professional Summary
-    prof_summary = parsed_data.get('PROFESSIONAL_SUMMARY', '').strip()
-    if prof_summary and not is_placeholder_text(prof_summary):
-        story.append(Paragraph('PROFESSIONAL SUMMARY', styles['SectionHeading']))
-        story.append(Spacer(1, 3))
-        
-        # Handle multi-line professional summary
-        summary_lines = prof_summary.split('\n')
-        for line in summary_lines:
-            line = line.strip()
-            if line and not is_placeholder_text(line):
-                story.append(Paragraph(line, styles['ProfessionalSummary']))
-        story.append(Spacer(1, 8))
-
-    # Core Competencies
-    competencies = parsed_data.get('CORE_COMPETENCIES', '').strip()
-    if competencies and not is_placeholder_text(competencies):
-        story.append(Paragraph('CORE COMPETENCIES', styles['SectionHeading']))
-        story.append(Spacer(1, 3))
-        
-        lines = competencies.split('\n')
-        for line in lines:
-            line = line.strip()
-            if line and not is_placeholder_text(line):
-                if line.startswith('-') or line.startswith('•'):
-                    story.append(Paragraph(f"• {line[1:].strip()}", styles['CompetencyItem']))
+    if resume.name:
+        story.append(Paragraph(resume.name, styles['ResumeTitle']))
+    if resume.contact:
+        story.append(Paragraph(plan.theme.contact_separator.join(resume.contact), styles['ContactInfo']))
+
+    for section_key, section_title in plan.sections:
+        lines = resume.sections.get(section_key)
+        if not lines:
+            continue
+        story.append(Paragraph(section_title, styles['SectionHeading']))
+        story.append(Spacer(1, 3 * scale))
+
+        if section_key == 'CORE_COMPETENCIES' and plan.theme.inline_competencies:
+            story.append(Paragraph(plan.theme.competency_separator.join(markup for _, markup in lines), styles['Content']))
+        else:
+            text_style = styles['ProfessionalSummary' if section_key == 'PROFESSIONAL_SUMMARY' else 'Content']
+            bullet_style = styles['CompetencyItem' if section_key == 'CORE_COMPETENCIES' else 'BulletPoint']
+            for kind, markup in lines:
+                if kind == TEXT:
+                    story.append(Paragraph(markup, text_style))
+                elif kind == BULLET:
+                    story.append(Paragraph(f"{bullet}{markup}", bullet_style))
+                elif kind == HEADER:
+                    story.append(Paragraph(markup, styles['SubHeading']))
                 else:
-                    story.append(Paragraph(f"• {line}", styles['CompetencyItem']))
-        story.append(Spacer(1, 8))
-
-    # Section configuration for professional layout
-    sections_config = [
-        ('PROFESSIONAL_EXPERIENCE', 'PROFESSIONAL EXPERIENCE'),
-        ('TECHNICAL_SKILLS', 'TECHNICAL EXPERTISE'),
-        ('EDUCATION', 'EDUCATION'),
-        ('PROJECTS', 'KEY PROJECTS'),
-        ('CERTIFICATIONS_AWARDS', 'CERTIFICATIONS & ACHIEVEMENTS')
-    ]
-
-    for section_key, section_title in sections_config:
-        content = parsed_data.get(section_key, '').strip()
-        if content and not is_placeholder_text(content):
-            # Section header
-            story.append(Paragraph(section_title, styles['SectionHeading']))
-            story.append(Spacer(1, 3))
-
-            # Section content with enhanced formatting
-            if section_key == 'TECHNICAL_SKILLS':
-                # Handle technical skills with professional categorization
-                lines = content.split('\n')
-                valid_lines = []
-                
-                for line in lines:
-                    line = line.strip()
-                    if line and not is_placeholder_text(line):
-                        if ':' in line:
-                            # Category: skills format
-                            category, skills = line.split(':', 1)
-                            if not is_placeholder_text(skills.strip()):
-                                valid_lines.append(f"<b>{category.strip()}:</b> {skills.strip()}")
-                        else:
-                            valid_lines.append(line)
-                
-                for valid_line in valid_lines:
-                    story.append(Paragraph(valid_line, styles['Content']))
-
-            elif section_key in ['PROFESSIONAL_EXPERIENCE', 'PROJECTS']:
-                # Handle structured sections with enhanced professional formatting
-                lines = content.split('\n')
-                current_item = []
-                
-                for line in lines:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    # Check if this is a new item header (contains | and doesn't start with -)
-                    if '|' in line and not line.startswith('-'):
-                        # Process previous item if exists
-                        if current_item:
-                            _process_structured_item_filtered(current_item, story, styles)
-                            current_item = []
-                        current_item.append(line)
-                    else:
-                        current_item.append(line)
-                
-                # Process last item
-                if current_item:
-                    _process_structured_item_filtered(current_item, story, styles)
-
-            elif section_key == 'EDUCATION':
-                # Enhanced education formatting
-                lines = content.split('\n')
-                for line in lines:
-                    line = line.strip()
-                    if line and not is_placeholder_text(line):
-                        if '|' in line:
-                            # Format: Degree | Institution | Date | Additional Info
-                            parts = [part.strip() for part in line.split('|')]
-                            valid_parts = [part for part in parts if not is_placeholder_text(part)]
-                            if valid_parts:
-                                if len(valid_parts) >= 2:
-                                    # Format as: Degree, Institution (Date)
-                                    formatted_line = f"<b>{valid_parts[0]}</b>, {valid_parts[1]}"
-                                    if len(valid_parts) > 2:
-                                        formatted_line += f" ({valid_parts[2]})"
-                                    story.append(Paragraph(formatted_line, styles['Content']))
-                                else:
-                                    story.append(Paragraph(line, styles['Content']))
-                        else:
-                            story.append(Paragraph(line, styles['Content']))
+                    # Small gap after each experience or project entry
+                    story.append(Spacer(1, 4 * scale))
+
+        story.append(Spacer(1, 8 * scale))
+
+    return story
+
+
+async def tailor_resume_structured(
+    resume_text: str,
+    job_description: str,
+    gemini_api_key: str,
+    mode: str = TAILOR_MODE_FULL
+) -> Tuple[Optional[Dict[str, str]], str]:
+    """Tailor a resume into its sections, ready to render; returns (sections, error message)."""
+    if mode == TAILOR_MODE_SECTIONS:
+        # Steps 1-4 in one call: tailor the job-sensitive sections of the cached parse
+        with start_span("resume.tailor_sections"), track_stage("tailored_pdf", "tailor_sections"):
+            parsed_data_dict = await tailor_resume_sections(resume_text, job_description, gemini_api_key)
+        if not parsed_data_dict:
+            return None, "Failed to tailor resume"
+        return parsed_data_dict, ""
 
-            else:
-                # Handle other sections with professional formatting
-                lines = content.split('\n')
-                for line in lines:
-                    line = line.strip()
-                    if line and not is_placeholder_text(line):
-                        if line.startswith('-') or line.startswith('•'):
-                            story.append(Paragraph(f"• {line[1:].strip()}", styles['BulletPoint']))
-                        else:
-                            story.append(Paragraph(line, styles['Content']))
-
-            story.append(Spacer(1, 8))
-
-    doc.build(story)
-    buffer.seek(0)
-    return buffer.getvalue()
+    # Step 1: Tailor resume
+    with start_span("resume.tailor"), track_stage("tailored_pdf", "tailor"):
+        tailored_resume = await tailor_resume_with_llm(resume_text, job_description, gemini_api_key)
+    if not tailored_resume:
+        return None, "Failed to tailor resume"
+
+    # Step 2: Configure Gemini
+    model = configure_gemini(gemini_api_key)
+    if not model:
+        return None, "Failed to configure Gemini"
+
+    # Step 3: Parse tailored resume
+    with start_span("resume.parse"), track_stage("tailored_pdf", "parse"):
+        gemini_parsed_text = parse_resume_with_gemini(model, tailored_resume)
+    if not gemini_parsed_text:
+        return None, "Failed to parse resume with Gemini"
+
+    # Step 4: Convert to structured data
+    parsed_data_dict = parse_gemini_output_to_dict(gemini_parsed_text)
+    if not has_sections(parsed_data_dict):
+        return None, "Failed to parse resume with Gemini"
+    return parsed_data_dict, ""
+
+
+def render_tailored_pdf(
+    parsed_data_dict: Dict[str, str],
+    job_title: str,
+    company_name: str,
+    fit_pages: int = 0,
+    theme: str = DEFAULT_THEME
+) -> Tuple[Optional[RenderedPDF], str]:
+    """Render tailored sections to a PDF, or reuse the cached render; returns (PDF, filename) or (None, error message)."""
+    # Step 5: Generate PDF
+    with start_span("resume.render"), track_stage("tailored_pdf", "render"):
+        pdf_data = get_or_render_pdf(parsed_data_dict, build_pdf, fit_pages=fit_pages, theme=theme)
+    if not pdf_data.size:
+        return None, "Failed to generate PDF"
+
+    # Step 6: Generate filename
+    company_clean = company_name.replace(' ', '_').replace('/', '-')
+    job_title_clean = job_title.replace(' ', '_').replace('/', '-')
+    filename = f"Tailored_Resume_{company_clean}_{job_title_clean}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+
+    return pdf_data, filename
 
 
 async def generate_tailored_pdf(
@@ -622,39 +729,17 @@ async def generate_tailored_pdf(
     job_description: str, 
     job_title: str, 
     company_name: str,
-    gemini_api_key: str
-) -> Tuple[Optional[bytes], str]:
+    gemini_api_key: str,
+    mode: str = TAILOR_MODE_FULL,
+    fit_pages: int = 0,
+    theme: str = DEFAULT_THEME
+) -> Tuple[Optional[RenderedPDF], str]:
     """Complete pipeline: Tailor resume -> Parse with Gemini -> Generate PDF."""
     try:
-        # Step 1: Tailor resume
-        tailored_resume = await tailor_resume_with_llm(resume_text, job_description, gemini_api_key)
-        if not tailored_resume:
-            return None, "Failed to tailor resume"
-        
-        # Step 2: Configure Gemini
-        model = configure_gemini(gemini_api_key)
-        if not model:
-            return None, "Failed to configure Gemini"
-        
-        # Step 3: Parse tailored resume
-        gemini_parsed_text = parse_resume_with_gemini(model, tailored_resume)
-        if not gemini_parsed_text:
-            return None, "Failed to parse resume with Gemini"
-        
-        # Step 4: Convert to structured data
-        parsed_data_dict = parse_gemini_output_to_dict(gemini_parsed_text)
-        
-        # Step 5: Generate PDF
-        pdf_data = create_pdf_from_data(parsed_data_dict)
-        if not pdf_data:
-            return None, "Failed to generate PDF"
-        
-        # Step 6: Generate filename
-        company_clean = company_name.replace(' ', '_').replace('/', '-')
-        job_title_clean = job_title.replace(' ', '_').replace('/', '-')
-        filename = f"Tailored_Resume_{company_clean}_{job_title_clean}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        
-        return pdf_data, filename
+        parsed_data_dict, error = await tailor_resume_structured(resume_text, job_description, gemini_api_key, mode)
+        if not parsed_data_dict:
+            return None, error
+        return render_tailored_pdf(parsed_data_dict, job_title, company_name, fit_pages, theme)
         
     except Exception as e:
         logger.error(f"Error in PDF generation pipeline: {str(e)}")
@@ -665,26 +750,23 @@ async def generate_pdf_from_tailored_text(
     tailored_resume_text: str,
     job_title: str,
     company_name: str,
-    gemini_api_key: str
-) -> Tuple[Optional[bytes], str]:
-    """Generate PDF from already tailored resume text."""
+    gemini_api_key: str,
+    fit_pages: int = 0,
+    theme: str = DEFAULT_THEME,
+    stored: bool = False
+) -> Tuple[Optional[RenderedPDF], str]:
+    """Generate PDF from already tailored resume text; stored is set when it is a stored resume profile."""
     try:
-        # Configure Gemini
-        model = configure_gemini(gemini_api_key)
-        if not model:
-            return None, "Failed to configure Gemini"
-        
-        # Parse tailored resume
-        gemini_parsed_text = parse_resume_with_gemini(model, tailored_resume_text)
-        if not gemini_parsed_text:
+        # Parse tailored resume, or reuse its parse; only stored profiles are read from and written to the store
+        with start_span("resume.parse"), track_stage("pdf_from_text", "parse"):
+            parsed_data_dict = get_parsed_base_resume(tailored_resume_text, gemini_api_key, store=stored)
+        if not parsed_data_dict:
             return None, "Failed to parse resume with Gemini"
         
-        # Convert to structured data
-        parsed_data_dict = parse_gemini_output_to_dict(gemini_parsed_text)
-        
         # Generate PDF
-        pdf_data = create_pdf_from_data(parsed_data_dict)
-        if not pdf_data:
+        with start_span("resume.render"), track_stage("pdf_from_text", "render"):
+            pdf_data = get_or_render_pdf(parsed_data_dict, build_pdf, fit_pages=fit_pages, theme=theme)
+        if not pdf_data.size:
             return None, "Failed to generate PDF"
         
         # Generate filename
@@ -700,21 +782,12 @@ async def generate_pdf_from_tailored_text(
 
 
 async def parse_resume_only(resume_text: str, gemini_api_key: str) -> Tuple[Optional[Dict[str, str]], str]:
-    """Parse resume text into structured data without tailoring."""
+    """Parse resume text into structured data without tailoring; a resume already parsed is not sent to Gemini again."""
     try:
-        # Configure Gemini
-        model = configure_gemini(gemini_api_key)
-        if not model:
-            return None, "Failed to configure Gemini"
-        
-        # Parse resume
-        gemini_parsed_text = parse_resume_with_gemini(model, resume_text)
-        if not gemini_parsed_text:
+        parsed_data_dict = get_parsed_base_resume(resume_text, gemini_api_key)
+        if not parsed_data_dict:
             return None, "Failed to parse resume with Gemini"
         
-        # Convert to structured data
-        parsed_data_dict = parse_gemini_output_to_dict(gemini_parsed_text)
-        
         return parsed_data_dict, "Resume parsed successfully"
         
     except Exception as e:
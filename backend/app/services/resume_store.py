@@ -0,0 +1,135 @@
+"""
+Resume profiles, so a resume is extracted and parsed by Gemini once rather than per request.
+
+A profile is keyed by resume_id, the sha256 of the resume text, and holds the text,
+its parsed sections and keywords, and the sha256 of the PDF it was extracted from.
+Clients can send the resume_id instead of the text. Sections are tagged with the
+RESUME_PARSE_VERSION they were parsed with; bump it when the parse prompt or
+parse_gemini_output_to_dict changes, and older profiles are parsed again from their
+stored text the next time they are used. Profiles live in the job store database.
+"""
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from app.services.job_store import JOB_STORE_ENABLED, get_connection
+
+logger = logging.getLogger(__name__)
+
+RESUME_STORE_ENABLED = JOB_STORE_ENABLED and os.getenv("RESUME_STORE_ENABLED", "1") == "1"
+# Profiles not used for this long are evicted, and the store never grows past the profile cap
+RESUME_STORE_MAX_AGE_DAYS = float(os.getenv("RESUME_STORE_MAX_AGE_DAYS", 90))
+RESUME_STORE_MAX_PROFILES = int(os.getenv("RESUME_STORE_MAX_PROFILES", 10000))
+# Version of the parse behind stored sections; profiles parsed by another version are parsed again
+RESUME_PARSE_VERSION = 1
+
+RESUME_ID_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+UPSERT_SQL = """
+INSERT INTO resume_profiles (resume_id, resume_text, parse_version, sections, keywords, pdf_hash, created_at, last_used)
+VALUES (:resume_id, :resume_text, :parse_version, :sections, :keywords, :pdf_hash, :now, :now)
+ON CONFLICT(resume_id) DO UPDATE SET
+    parse_version = COALESCE(excluded.parse_version, resume_profiles.parse_version),
+    sections = COALESCE(excluded.sections, resume_profiles.sections),
+    keywords = COALESCE(excluded.keywords, resume_profiles.keywords),
+    pdf_hash = COALESCE(excluded.pdf_hash, resume_profiles.pdf_hash),
+    last_used = excluded.last_used
+"""
+
+
+@dataclass
+class ResumeProfile:
+    resume_id: str
+    resume_text: str
+    # None until parsed with the current RESUME_PARSE_VERSION
+    sections: Optional[Dict[str, str]]
+    keywords: List[str]
+    pdf_hash: Optional[str]
+
+
+def resume_hash(resume_text: str) -> str:
+    return hashlib.sha256(resume_text.strip().encode("utf-8")).hexdigest()
+
+
+def pdf_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def _get_profile(column: str, value: str) -> Optional[ResumeProfile]:
+    connection = get_connection()
+    row = connection.execute(
+        f"SELECT * FROM resume_profiles WHERE {column} = ? ORDER BY last_used DESC LIMIT 1", (value,)
+    ).fetchone()
+    if row is None:
+        return None
+    with connection:
+        connection.execute("UPDATE resume_profiles SET last_used = ? WHERE resume_id = ?", (time.time(), row["resume_id"]))
+
+    parsed = row["parse_version"] == RESUME_PARSE_VERSION
+    return ResumeProfile(
+        resume_id=row["resume_id"],
+        resume_text=row["resume_text"],
+        sections=json.loads(row["sections"]) if parsed and row["sections"] else None,
+        keywords=json.loads(row["keywords"]) if parsed and row["keywords"] else [],
+        pdf_hash=row["pdf_hash"]
+    )
+
+
+def get_profile(resume_id: str) -> Optional[ResumeProfile]:
+    """The stored profile of a resume, or None if it is unknown or was evicted."""
+    return _get_profile("resume_id", resume_id)
+
+
+def find_profile_by_pdf(content_hash: str) -> Optional[ResumeProfile]:
+    """The most recently used profile extracted from a PDF with this sha256."""
+    return _get_profile("pdf_hash", content_hash)
+
+
+def save_profile(
+    resume_text: str,
+    sections: Optional[Dict[str, str]] = None,
+    keywords: Optional[List[str]] = None,
+    content_hash: Optional[str] = None
+) -> str:
+    """
+    Store a resume, or refresh its profile; returns its resume_id.
+
+    Sections and keywords are stored as parsed by the current RESUME_PARSE_VERSION.
+    Fields left out keep their stored values.
+    """
+    resume_id = resume_hash(resume_text)
+    connection = get_connection()
+    with connection:
+        connection.execute(UPSERT_SQL, {
+            "resume_id": resume_id,
+            "resume_text": resume_text,
+            "parse_version": RESUME_PARSE_VERSION if sections is not None else None,
+            "sections": json.dumps(sections) if sections is not None else None,
+            "keywords": json.dumps(keywords) if keywords is not None else None,
+            "pdf_hash": content_hash,
+            "now": time.time(),
+        })
+    evict_profiles()
+    return resume_id
+
+
+def evict_profiles(max_age_days: float = RESUME_STORE_MAX_AGE_DAYS, max_profiles: int = RESUME_STORE_MAX_PROFILES) -> int:
+    """Delete profiles not used within max_age_days, then the least recently used beyond max_profiles."""
+    connection = get_connection()
+    with connection:
+        deleted = connection.execute(
+            "DELETE FROM resume_profiles WHERE last_used < ?", (time.time() - max_age_days * 86400,)
+        ).rowcount
+        deleted += connection.execute(
+            "DELETE FROM resume_profiles WHERE resume_id IN ("
+            "SELECT resume_id FROM resume_profiles ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (max_profiles,)
+        ).rowcount
+    if deleted:
+        logger.info(f"Evicted {deleted} resume profiles from the local store")
+    return deleted
@@ -0,0 +1,159 @@
+import os
+import json
+import time
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from app.models.job_models import JobResult
+from app.services.job_service import find_jobs
+from app.services.job_store import JOB_STORE_ENABLED, get_connection, get_jobs_by_ids, upsert_jobs
+from app.services.metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+# Results older than this are never served, which bounds the staleness of cached searches; 0 disables the cache
+SEARCH_CACHE_TTL_SECONDS = float(os.getenv("SEARCH_CACHE_TTL_SECONDS", 3600))
+SEARCH_CACHE_ENABLED = JOB_STORE_ENABLED and SEARCH_CACHE_TTL_SECONDS > 0
+# Popularity decays so yesterday's hot queries give way to today's
+SEARCH_POPULARITY_HALF_LIFE_HOURS = float(os.getenv("SEARCH_POPULARITY_HALF_LIFE_HOURS", 24))
+
+
+def search_key(job_title: str, location: str, experience: Optional[str]) -> str:
+    """Normalise a search so differently typed spellings of the same query share a cache entry."""
+    return "|".join(" ".join(part.lower().split()) for part in (job_title, location, experience or ""))
+
+
+def get_cached_search(query_key: str, job_count: int, max_age: float = SEARCH_CACHE_TTL_SECONDS) -> Optional[List[JobResult]]:
+    """Cached results of a search, or None when missing, older than max_age or smaller than job_count."""
+    row = get_connection().execute(
+        "SELECT job_ids, job_count, fetched_at FROM search_cache WHERE query_key = ?", (query_key,)
+    ).fetchone()
+    if row is None or time.time() - row["fetched_at"] > max_age or job_count > row["job_count"]:
+        return None
+
+    job_ids = json.loads(row["job_ids"])[:job_count]
+    jobs = get_jobs_by_ids(job_ids)
+    # Some postings were evicted from the job store since; refetch rather than return a partial list
+    if len(jobs) < len(job_ids):
+        return None
+    return jobs
+
+
+def store_search(query_key: str, job_count: int, jobs: List[JobResult]) -> None:
+    """Cache the job ids of a live search; the postings themselves live in the job store."""
+    connection = get_connection()
+    with connection:
+        connection.execute(
+            "INSERT OR REPLACE INTO search_cache (query_key, job_ids, job_count, fetched_at) VALUES (?, ?, ?, ?)",
+            (query_key, json.dumps([job.job_id for job in jobs if job.job_id]), job_count, time.time())
+        )
+
+
+def cache_age(query_key: str) -> Optional[float]:
+    """Seconds since the search was last fetched, or None if it is not cached."""
+    row = get_connection().execute(
+        "SELECT fetched_at FROM search_cache WHERE query_key = ?", (query_key,)
+    ).fetchone()
+    return time.time() - row["fetched_at"] if row else None
+
+
+def _decayed(score: float, updated_at: float, now: float) -> float:
+    return score * 0.5 ** ((now - updated_at) / (SEARCH_POPULARITY_HALF_LIFE_HOURS * 3600))
+
+
+def record_search(query_key: str, job_title: str, location: str, experience: Optional[str], job_count: int) -> None:
+    """Add one request to the exponentially decayed popularity score of a search."""
+    now = time.time()
+    connection = get_connection()
+    # IMMEDIATE takes the write lock up front so concurrent workers don't lose increments
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        row = connection.execute(
+            "SELECT score, updated_at, job_count FROM search_popularity WHERE query_key = ?", (query_key,)
+        ).fetchone()
+        score = _decayed(row["score"], row["updated_at"], now) + 1 if row else 1.0
+        connection.execute(
+            "INSERT OR REPLACE INTO search_popularity "
+            "(query_key, job_title, location, experience, job_count, score, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (query_key, job_title, location, experience, max(job_count, row["job_count"] if row else 0), score, now)
+        )
+        connection.execute("COMMIT")
+    except Exception:
+        connection.execute("ROLLBACK")
+        raise
+
+
+def popular_searches(limit: int) -> List[dict]:
+    """The most popular searches by decayed score, with the parameters needed to rerun them."""
+    now = time.time()
+    rows = get_connection().execute("SELECT * FROM search_popularity").fetchall()
+    searches = [dict(row, score=_decayed(row["score"], row["updated_at"], now)) for row in rows]
+    searches.sort(key=lambda search: search["score"], reverse=True)
+    return searches[:limit]
+
+
+def consume_serpapi_budget(daily_budget: int) -> bool:
+    """Count one SerpApi call against today's (UTC) budget, shared by all workers; False once it is spent."""
+    day = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    connection = get_connection()
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        row = connection.execute("SELECT calls FROM serpapi_usage WHERE day = ?", (day,)).fetchone()
+        calls = row["calls"] if row else 0
+        if calls >= daily_budget:
+            connection.execute("ROLLBACK")
+            return False
+        connection.execute("INSERT OR REPLACE INTO serpapi_usage (day, calls) VALUES (?, ?)", (day, calls + 1))
+        connection.execute("COMMIT")
+        return True
+    except Exception:
+        connection.execute("ROLLBACK")
+        raise
+
+
+async def search_jobs_cached(
+    job_title: str,
+    location: str,
+    experience: Optional[str],
+    job_count: int,
+    serpapi_key: str
+) -> List[JobResult]:
+    """
+    find_jobs behind the search cache.
+
+    Every search counts towards the popularity used by the background refresher.
+    Fresh cached results are served without calling SerpApi; live results are
+    stored in the job store and cached. Store failures never fail the search.
+    """
+    query_key = search_key(job_title, location, experience)
+
+    if SEARCH_CACHE_ENABLED:
+        try:
+            await asyncio.to_thread(record_search, query_key, job_title, location, experience, job_count)
+            cached = await asyncio.to_thread(get_cached_search, query_key, job_count)
+            record_cache_lookup("job_search", cached is not None)
+            if cached is not None:
+                logger.info(f"Serving '{query_key}' from the search cache")
+                return cached
+        except Exception as e:
+            logger.error(f"Search cache lookup failed: {e}")
+
+    jobs = await find_jobs(
+        job_title=job_title,
+        location=location,
+        experience=experience,
+        job_count=job_count,
+        serpapi_key=serpapi_key
+    )
+
+    if JOB_STORE_ENABLED:
+        # Keep every posting for /local-search and the cache
+        try:
+            await asyncio.to_thread(upsert_jobs, jobs)
+            if SEARCH_CACHE_ENABLED:
+                await asyncio.to_thread(store_search, query_key, job_count, jobs)
+        except Exception as e:
+            logger.error(f"Failed to store job postings: {e}")
+    return jobs
@@ -0,0 +1,117 @@
+import os
+import asyncio
+import logging
+from typing import Optional
+
+from app.services.job_service import find_jobs
+from app.services.job_store import HIREPILOT_DATA_DIR, upsert_jobs
+from app.services.search_cache import (
+    SEARCH_CACHE_ENABLED,
+    SEARCH_CACHE_TTL_SECONDS,
+    cache_age,
+    consume_serpapi_budget,
+    popular_searches,
+    store_search,
+)
+from app.services.tracing import start_span
+
+logger = logging.getLogger(__name__)
+
+SEARCH_REFRESH_ENABLED = os.getenv("SEARCH_REFRESH_ENABLED", "0") == "1"
+SEARCH_REFRESH_INTERVAL_SECONDS = float(os.getenv("SEARCH_REFRESH_INTERVAL_SECONDS", 600))
+SEARCH_REFRESH_TOP_N = int(os.getenv("SEARCH_REFRESH_TOP_N", 20))
+# Upper bound on SerpApi calls the refresher makes per UTC day, across all workers
+SEARCH_REFRESH_DAILY_BUDGET = int(os.getenv("SEARCH_REFRESH_DAILY_BUDGET", 200))
+# Refreshes use the server's own key; user keys sent with /search are never stored
+SERPAPI_KEY = os.getenv("SERPAPI_KEY")
+REFRESH_LOCK_PATH = os.path.join(HIREPILOT_DATA_DIR, "search_refresh.lock")
+
+
+async def refresh_popular_searches(serpapi_key: str) -> int:
+    """
+    Refetch the most popular searches whose cached results would go stale before the next run.
+
+    Returns the number of searches refreshed. Stops early once the daily budget is spent.
+    """
+    refreshed = 0
+    searches = await asyncio.to_thread(popular_searches, SEARCH_REFRESH_TOP_N)
+    with start_span("search_refresh.run", **{"search_refresh.candidates": len(searches)}) as span:
+        for search in searches:
+            age = await asyncio.to_thread(cache_age, search["query_key"])
+            if age is not None and age < SEARCH_CACHE_TTL_SECONDS - SEARCH_REFRESH_INTERVAL_SECONDS:
+                continue
+            if not await asyncio.to_thread(consume_serpapi_budget, SEARCH_REFRESH_DAILY_BUDGET):
+                logger.warning(f"SerpApi refresh budget of {SEARCH_REFRESH_DAILY_BUDGET} calls/day is spent")
+                break
+            try:
+                jobs = await find_jobs(
+                    job_title=search["job_title"],
+                    location=search["location"],
+                    experience=search["experience"],
+                    job_count=search["job_count"],
+                    serpapi_key=serpapi_key
+                )
+                await asyncio.to_thread(upsert_jobs, jobs)
+                await asyncio.to_thread(store_search, search["query_key"], search["job_count"], jobs)
+                refreshed += 1
+            except Exception as e:
+                logger.error(f"Failed to refresh search '{search['query_key']}': {e}")
+        span.set_attribute("search_refresh.refreshed", refreshed)
+
+    if refreshed:
+        logger.info(f"Refreshed {refreshed} popular searches")
+    return refreshed
+
+
+def _acquire_leader_lock():
+    """
+    Try to become the one worker that runs the refresher; returns the open lock file or None.
+
+    The lock is held until the process exits, so when the leader dies another worker
+    takes over on its next attempt.
+    """
+    import fcntl
+
+    os.makedirs(os.path.dirname(REFRESH_LOCK_PATH) or ".", exist_ok=True)
+    lock_file = open(REFRESH_LOCK_PATH, "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    lock_file.write(str(os.getpid()))
+    lock_file.flush()
+    return lock_file
+
+
+async def run_search_refresher():
+    """Refresh popular searches every interval while this worker holds the leader lock."""
+    lock_file = None
+    while True:
+        try:
+            if lock_file is None:
+                lock_file = _acquire_leader_lock()
+                if lock_file is not None:
+                    logger.info(f"Worker {os.getpid()} is running the search refresher")
+            if lock_file is not None:
+                await refresh_popular_searches(SERPAPI_KEY)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Search refresh failed: {e}")
+        await asyncio.sleep(SEARCH_REFRESH_INTERVAL_SECONDS)
+
+
+def start_search_refresher() -> Optional[asyncio.Task]:
+    """Start the refresher on the running event loop when it is enabled and configured."""
+    if not SEARCH_REFRESH_ENABLED:
+        return None
+    if not SEARCH_CACHE_ENABLED or not SERPAPI_KEY:
+        logger.warning("Search refresher needs the search cache and SERPAPI_KEY; not starting it")
+        return None
+    if SEARCH_REFRESH_INTERVAL_SECONDS >= SEARCH_CACHE_TTL_SECONDS:
+        logger.warning(
+            f"SEARCH_REFRESH_INTERVAL_SECONDS ({SEARCH_REFRESH_INTERVAL_SECONDS:.0f}) should be below "
+            f"SEARCH_CACHE_TTL_SECONDS ({SEARCH_CACHE_TTL_SECONDS:.0f}) to keep popular searches warm"
+        )
+    return asyncio.create_task(run_search_refresher())
@@ -0,0 +1,300 @@
+import os
+import re
+import json
+import math
+import time
+import asyncio
+import hashlib
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.services.job_store import JOB_STORE_ENABLED, get_connection
+from app.services.metrics import record_cache_lookup
+from app.services.prompt_budget import budget_job_description
+from app.services.resume_store import resume_hash
+from app.services.tracing import start_span
+
+if TYPE_CHECKING:
+    from fastapi import BackgroundTasks
+
+logger = logging.getLogger(__name__)
+
+# Tailorings older than this are never offered; 0 disables the cache
+TAILOR_CACHE_TTL_DAYS = float(os.getenv("TAILOR_CACHE_TTL_DAYS", 7))
+TAILOR_CACHE_ENABLED = JOB_STORE_ENABLED and TAILOR_CACHE_TTL_DAYS > 0
+# Cosine similarity of job descriptions above which a cached tailoring is offered as a draft
+TAILOR_CACHE_SIMILARITY = float(os.getenv("TAILOR_CACHE_SIMILARITY", 0.92))
+TAILOR_CACHE_MAX_ENTRIES = int(os.getenv("TAILOR_CACHE_MAX_ENTRIES", 20000))
+# LSH candidates scored exactly per lookup, those sharing the most bands first
+TAILOR_CACHE_MAX_CANDIDATES = 50
+
+# Hashed unigram and bigram features, see job_vector()
+FEATURE_BUCKETS = 1 << 18
+# Dots only inside a token, as in "node.js" or "3.11", so "kafka." at the end of a sentence is "kafka"
+FEATURE_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our the their this to we will with you your"
+    " who what which about into us all any can more".split()
+)
+# Random-hyperplane LSH: LSH_BANDS bands of LSH_BAND_BITS signature bits each.
+# Each band of two descriptions with a cosine of 0.92 matches with probability
+# ~0.58 and of unrelated ones (cosine 0.3) ~0.13, so entries sharing the most
+# bands with the lookup are the likeliest near duplicates.
+LSH_BANDS = 32
+LSH_BAND_BITS = 4
+LSH_BITS = LSH_BANDS * LSH_BAND_BITS
+
+# Keys of background refreshes running in this worker, so a burst of drafts triggers one refresh
+_refreshing: Set[Tuple[str, str, str]] = set()
+
+
+@dataclass
+class JobFingerprint:
+    """Exact hash, sparse unit vector and LSH bands of a cleaned job description."""
+    job_hash: str
+    vector: Dict[int, float]
+    bands: List[int]
+
+
+@dataclass
+class CachedTailoring:
+    content: str
+    similarity: float
+
+    @property
+    def exact(self) -> bool:
+        return self.similarity >= 1.0
+
+
+@dataclass
+class TailorResult:
+    """Tailored content and, when it came from the cache, how closely the cached job matched."""
+    content: Optional[str]
+    draft: bool = False
+    similarity: Optional[float] = None
+
+
+@lru_cache(maxsize=65536)
+def _hyperplane_signs(bucket: int) -> int:
+    """LSH_BITS pseudo-random sign bits of one feature bucket, one per hyperplane."""
+    digest = hashlib.blake2b(bucket.to_bytes(4, "little"), digest_size=LSH_BITS // 8, person=b"hirepilot").digest()
+    return int.from_bytes(digest, "little")
+
+
+def job_vector(text: str) -> Dict[int, float]:
+    """
+    Sparse L2-normalised vector of word unigrams and bigrams hashed into FEATURE_BUCKETS.
+
+    Counts are log-scaled and stop words dropped, so the requirements, not the
+    filler, decide how close two descriptions are. Bigrams stay within a line,
+    so reordered bullet points don't change the vector.
+    """
+    counts = Counter()
+    for line in text.lower().split("\n"):
+        tokens = [token for token in FEATURE_TOKEN_PATTERN.findall(line) if token not in STOP_WORDS]
+        counts.update(tokens)
+        counts.update(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+
+    vector: Dict[int, float] = {}
+    for feature, count in counts.items():
+        bucket = hashlib.blake2b(feature.encode("utf-8"), digest_size=4).digest()
+        bucket = int.from_bytes(bucket, "little") & (FEATURE_BUCKETS - 1)
+        vector[bucket] = vector.get(bucket, 0.0) + 1.0 + math.log(count)
+
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    return {bucket: weight / norm for bucket, weight in vector.items()} if norm else {}
+
+
+def lsh_bands(vector: Dict[int, float]) -> List[int]:
+    """Band keys of the random-hyperplane signature; band i is encoded as i << LSH_BAND_BITS | bits."""
+    projections = [0.0] * LSH_BITS
+    for bucket, weight in vector.items():
+        signs = _hyperplane_signs(bucket)
+        for plane in range(LSH_BITS):
+            projections[plane] += weight if signs >> plane & 1 else -weight
+
+    bands = []
+    for band in range(LSH_BANDS):
+        bits = 0
+        for plane in range(band * LSH_BAND_BITS, (band + 1) * LSH_BAND_BITS):
+            bits = bits << 1 | (projections[plane] >= 0)
+        bands.append(band << LSH_BAND_BITS | bits)
+    return bands
+
+
+def cosine(first: Dict[int, float], second: Dict[int, float]) -> float:
+    """Cosine similarity of two unit vectors."""
+    if len(first) > len(second):
+        first, second = second, first
+    return sum(weight * second.get(bucket, 0.0) for bucket, weight in first.items())
+
+
+def job_fingerprint(job_description: str) -> JobFingerprint:
+    """Fingerprint the job description after the same boilerplate cleanup the prompt gets."""
+    text = budget_job_description(job_description, max_tokens=0).text
+    vector = job_vector(text)
+    return JobFingerprint(
+        job_hash=hashlib.sha256(" ".join(text.lower().split()).encode("utf-8")).hexdigest(),
+        vector=vector,
+        bands=lsh_bands(vector)
+    )
+
+
+def _band_keys(resume_key: str, variant: str, bands: List[int]) -> List[str]:
+    return [f"{resume_key}:{variant}:{band}" for band in bands]
+
+
+def find_tailoring(
+    resume_key: str,
+    variant: str,
+    fingerprint: JobFingerprint,
+    threshold: float = TAILOR_CACHE_SIMILARITY
+) -> Optional[CachedTailoring]:
+    """
+    The cached tailoring of this resume for the most similar job description, if it clears threshold.
+
+    An identical job description is returned with a similarity of exactly 1.0.
+    Otherwise only the entries sharing the most LSH bands are scored.
+    """
+    connection = get_connection()
+    min_created = time.time() - TAILOR_CACHE_TTL_DAYS * 86400
+    row = connection.execute(
+        "SELECT content FROM tailor_cache "
+        "WHERE resume_hash = ? AND variant = ? AND job_hash = ? AND created_at >= ?",
+        (resume_key, variant, fingerprint.job_hash, min_created)
+    ).fetchone()
+    if row is not None:
+        return CachedTailoring(content=row["content"], similarity=1.0)
+
+    band_keys = _band_keys(resume_key, variant, fingerprint.bands)
+    placeholders = ", ".join("?" for _ in band_keys)
+    rows = connection.execute(
+        f"SELECT tailor_cache.vector, tailor_cache.content FROM ("
+        f"SELECT entry_id, COUNT(*) AS shared FROM tailor_cache_lsh WHERE band_key IN ({placeholders}) "
+        f"GROUP BY entry_id ORDER BY shared DESC LIMIT ?) AS candidates "
+        f"JOIN tailor_cache ON tailor_cache.id = candidates.entry_id WHERE tailor_cache.created_at >= ?",
+        (*band_keys, TAILOR_CACHE_MAX_CANDIDATES, min_created)
+    ).fetchall()
+
+    best = None
+    for row in rows:
+        vector = {bucket: weight for bucket, weight in json.loads(row["vector"])}
+        # Never report a near-duplicate as exact
+        similarity = min(cosine(fingerprint.vector, vector), 0.9999)
+        if similarity >= threshold and (best is None or similarity > best.similarity):
+            best = CachedTailoring(content=row["content"], similarity=similarity)
+    return best
+
+
+def store_tailoring(resume_key: str, variant: str, fingerprint: JobFingerprint, content: str) -> None:
+    """Cache a live tailoring, replacing any earlier one for the same job description."""
+    vector = json.dumps([[bucket, round(weight, 5)] for bucket, weight in fingerprint.vector.items()])
+    connection = get_connection()
+    with connection:
+        connection.execute(
+            "DELETE FROM tailor_cache WHERE resume_hash = ? AND variant = ? AND job_hash = ?",
+            (resume_key, variant, fingerprint.job_hash)
+        )
+        entry_id = connection.execute(
+            "INSERT INTO tailor_cache (resume_hash, variant, job_hash, vector, content, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (resume_key, variant, fingerprint.job_hash, vector, content, time.time())
+        ).lastrowid
+        connection.executemany(
+            "INSERT INTO tailor_cache_lsh (band_key, entry_id) VALUES (?, ?)",
+            [(band_key, entry_id) for band_key in _band_keys(resume_key, variant, fingerprint.bands)]
+        )
+    evict_tailorings()
+
+
+def evict_tailorings(max_age_days: float = TAILOR_CACHE_TTL_DAYS, max_entries: int = TAILOR_CACHE_MAX_ENTRIES) -> int:
+    """Delete expired tailorings, then the oldest beyond max_entries."""
+    connection = get_connection()
+    with connection:
+        deleted = connection.execute(
+            "DELETE FROM tailor_cache WHERE created_at < ?", (time.time() - max_age_days * 86400,)
+        ).rowcount
+        deleted += connection.execute(
+            "DELETE FROM tailor_cache WHERE id IN ("
+            "SELECT id FROM tailor_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (max_entries,)
+        ).rowcount
+    return deleted
+
+
+async def _tailor_and_store(
+    resume_key: str,
+    variant: str,
+    fingerprint: JobFingerprint,
+    tailor: Callable[[], Awaitable[Optional[str]]]
+) -> Optional[str]:
+    content = await tailor()
+    if content:
+        try:
+            await asyncio.to_thread(store_tailoring, resume_key, variant, fingerprint, content)
+        except Exception as e:
+            logger.error(f"Failed to cache tailoring: {e}")
+    return content
+
+
+async def refresh_tailoring(
+    resume_key: str,
+    variant: str,
+    fingerprint: JobFingerprint,
+    tailor: Callable[[], Awaitable[Optional[str]]]
+) -> None:
+    """Tailor for the exact job description behind a draft, so the next request gets an exact hit."""
+    key = (resume_key, variant, fingerprint.job_hash)
+    if key in _refreshing:
+        return
+    _refreshing.add(key)
+    try:
+        with start_span("tailor_cache.refresh", **{"tailor_cache.variant": variant}):
+            await _tailor_and_store(resume_key, variant, fingerprint, tailor)
+    except Exception as e:
+        logger.error(f"Background tailoring refresh failed: {e}")
+    finally:
+        _refreshing.discard(key)
+
+
+async def tailor_with_cache(
+    resume_text: str,
+    job_description: str,
+    variant: str,
+    tailor: Callable[[], Awaitable[Optional[str]]],
+    allow_draft: bool = False,
+    background_tasks: Optional["BackgroundTasks"] = None
+) -> TailorResult:
+    """
+    Run tailor() behind the near-duplicate tailoring cache.
+
+    Live tailorings are always cached. With allow_draft, a cached tailoring of the
+    same resume for an identical or similar job description is returned instead;
+    similar ones are marked as drafts and, when background_tasks is given, the
+    exact job description is tailored after the response is sent.
+    """
+    if not TAILOR_CACHE_ENABLED:
+        return TailorResult(content=await tailor())
+
+    resume_key = resume_hash(resume_text)
+    fingerprint = await asyncio.to_thread(job_fingerprint, job_description)
+
+    if allow_draft:
+        try:
+            with start_span("tailor_cache.lookup", **{"tailor_cache.variant": variant}) as span:
+                cached = await asyncio.to_thread(find_tailoring, resume_key, variant, fingerprint)
+                span.set_attribute("tailor_cache.similarity", cached.similarity if cached else 0.0)
+        except Exception as e:
+            logger.error(f"Tailoring cache lookup failed: {e}")
+            cached = None
+        record_cache_lookup("tailoring", cached is not None)
+        if cached is not None:
+            logger.info(f"Serving cached tailoring ({variant}, similarity {cached.similarity:.3f})")
+            if not cached.exact and background_tasks is not None:
+                background_tasks.add_task(refresh_tailoring, resume_key, variant, fingerprint, tailor)
+            return TailorResult(content=cached.content, draft=not cached.exact, similarity=round(cached.similarity, 4))
+
+    return TailorResult(content=await _tailor_and_store(resume_key, variant, fingerprint, tailor))
@@ -0,0 +1,145 @@
+"""
+Streaming selection of the jobs that best match a resume across many result pages.
+
+stream_top_jobs pages through every title and location combination concurrently and
+scores each page against the resume as it arrives. Only the top_k jobs are kept, in
+a bounded min-heap, so the scored jobs are never all held or sorted at once. Every
+page that changes the top jobs yields a provisional snapshot, and a final snapshot
+with the per-query timings follows once every page is in.
+
+Pages are scored without batch IDF (see ats_score.score_jobs), so a job's score does
+not depend on which page it arrived with and scores of different pages compare.
+"""
+import time
+import heapq
+import asyncio
+import logging
+from itertools import count
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from app.models.job_models import JobResult, QueryTiming, TopJobsSnapshot
+from app.services.ats_score import score_job_results
+from app.services.fanout_search import FANOUT_CONCURRENCY, dedupe_key
+from app.services.job_service import find_job_pages
+from app.services.job_store import JOB_STORE_ENABLED, upsert_jobs
+from app.services.tracing import start_span
+
+logger = logging.getLogger(__name__)
+
+
+class TopJobs:
+    """The k highest scoring jobs offered so far; on equal scores the earlier job stays."""
+
+    def __init__(self, k: int):
+        self.k = k
+        # Min-heap of (score, -arrival, job); arrivals are unique, so jobs are never compared
+        self._heap: List[Tuple[float, int, JobResult]] = []
+        self._arrivals = count()
+
+    def offer(self, score: float, job: JobResult) -> bool:
+        """Keep the job if it is among the k best so far; returns whether it was kept."""
+        entry = (score, -next(self._arrivals), job)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True
+        if entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+            return True
+        return False
+
+    def best(self) -> List[JobResult]:
+        """The kept jobs, best first."""
+        return [job for _, _, job in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
+
+
+async def stream_top_jobs(
+    job_titles: List[str],
+    locations: List[str],
+    experience: Optional[str],
+    pages: int,
+    top_k: int,
+    resume_text: str,
+    serpapi_key: str
+) -> AsyncIterator[TopJobsSnapshot]:
+    """
+    Yield snapshots of the top_k jobs matching the resume while the searches run.
+
+    At most FANOUT_CONCURRENCY queries page through results at once, and they wait
+    for scoring to catch up rather than queue up pages. A failing query is reported
+    in its timing entry instead of failing the others. Closing the iterator early
+    cancels the searches still running.
+    """
+    queries = [(job_title, location) for job_title in job_titles for location in locations]
+    semaphore = asyncio.Semaphore(FANOUT_CONCURRENCY)
+    # Pages of jobs, then each query's (index, timing) once it is done
+    queue: asyncio.Queue = asyncio.Queue(maxsize=FANOUT_CONCURRENCY)
+
+    async def run(index: int, job_title: str, location: str):
+        job_count, error = 0, None
+        async with semaphore:
+            start = time.perf_counter()
+            with start_span("jobs.top.query", **{"job.title": job_title, "job.location": location}):
+                try:
+                    async for jobs in find_job_pages(job_title, location, experience, pages, serpapi_key):
+                        job_count += len(jobs)
+                        if JOB_STORE_ENABLED:
+                            # Keep every posting for /local-search; store failures never fail the search
+                            try:
+                                await asyncio.to_thread(upsert_jobs, jobs)
+                            except Exception as e:
+                                logger.error(f"Failed to store job postings: {e}")
+                        await queue.put(jobs)
+                except Exception as e:
+                    logger.error(f"Top jobs query '{job_title}' in {location} failed: {e}")
+                    error = str(e)
+        await queue.put((index, QueryTiming(
+            job_title=job_title,
+            location=location,
+            job_count=job_count,
+            duration_ms=round((time.perf_counter() - start) * 1000, 1),
+            error=error
+        )))
+
+    top = TopJobs(top_k)
+    seen: Set[Tuple] = set()
+    timings: Dict[int, QueryTiming] = {}
+    jobs_scored = pages_fetched = 0
+    tasks = [asyncio.create_task(run(index, job_title, location)) for index, (job_title, location) in enumerate(queries)]
+    try:
+        while len(timings) < len(queries):
+            item = await queue.get()
+            if isinstance(item, tuple):
+                index, timing = item
+                timings[index] = timing
+                continue
+
+            pages_fetched += 1
+            # The same posting often comes back for several titles or locations
+            new_jobs = []
+            for job in item:
+                key = dedupe_key(job)
+                if key not in seen:
+                    seen.add(key)
+                    new_jobs.append(job)
+            if not new_jobs:
+                continue
+
+            scored = await asyncio.to_thread(score_job_results, resume_text, new_jobs, False)
+            jobs_scored += len(scored)
+            changed = False
+            for job in scored:
+                changed = top.offer(job.ats_score.score, job) or changed
+            if changed:
+                yield TopJobsSnapshot(final=False, jobs=top.best(), jobs_scored=jobs_scored, pages_fetched=pages_fetched)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    logger.info(f"Top jobs kept {len(top.best())} of {jobs_scored} jobs from {pages_fetched} pages of {len(queries)} queries")
+    yield TopJobsSnapshot(
+        final=True,
+        jobs=top.best(),
+        jobs_scored=jobs_scored,
+        pages_fetched=pages_fetched,
+        queries=[timings[index] for index in range(len(queries))]
+    )
@@ -0,0 +1,110 @@
+import os
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Iterator, Sequence
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.trace import Span, SpanKind, Status, StatusCode
+
+logger = logging.getLogger(__name__)
+
+# file (default), console or none; works without any collector running
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "file").lower()
+TRACE_FILE = os.getenv("TRACE_FILE", "traces.jsonl")
+
+tracer = trace.get_tracer("hirepilot")
+
+_configured = False
+
+
+class JsonLinesFileExporter(SpanExporter):
+    """Append finished spans to a file, one OpenTelemetry JSON span per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+        try:
+            # One write per batch in append mode, so several gunicorn workers can share the file
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError as e:
+            logger.error(f"Failed to write spans to {self.path}: {e}")
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+
+def configure_tracing() -> None:
+    """Install the tracer provider and exporter selected by TRACE_EXPORTER (idempotent)."""
+    global _configured
+    if _configured or TRACE_EXPORTER == "none":
+        return
+
+    provider = TracerProvider(resource=Resource.create({"service.name": "hirepilot-api"}))
+    if TRACE_EXPORTER == "console":
+        exporter = ConsoleSpanExporter()
+    else:
+        exporter = JsonLinesFileExporter(TRACE_FILE)
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    _configured = True
+    logger.info(f"Tracing enabled with {TRACE_EXPORTER} exporter")
+
+
+@contextmanager
+def start_span(name: str, **attributes) -> Iterator[Span]:
+    """Start a child span of the current one; exceptions are recorded and re-raised."""
+    with tracer.start_as_current_span(name, attributes=attributes) as span:
+        yield span
+
+
+class TracingMiddleware:
+    """ASGI middleware opening a server span per HTTP request, parent of all service spans."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        # Newer FastAPI releases open their own server span; don't nest a second one
+        if scope["type"] != "http" or trace.get_current_span().get_span_context().is_valid:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        with tracer.start_as_current_span(
+            f"{scope['method']} {scope['path']}",
+            kind=SpanKind.SERVER,
+            attributes={"http.request.method": scope["method"], "url.path": scope["path"]}
+        ) as span:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    # Name the span by route template once routing has happened
+                    span.update_name(f"{scope['method']} {route}")
+                    span.set_attribute("http.route", route)
+                span.set_attribute("http.response.status_code", status_code)
+                if status_code >= 500:
+                    span.set_status(Status(StatusCode.ERROR))
@@ -0,0 +1,61 @@
+import time
+import logging
+import importlib
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Third-party modules the routes import lazily on first use, heaviest first
+HEAVY_MODULES = [
+    "google.generativeai",
+    "reportlab.platypus",
+    "reportlab.lib.styles",
+    "reportlab.lib.pagesizes",
+    "PyPDF2",
+]
+
+
+def preload_heavy_modules() -> Dict[str, float]:
+    """
+    Import the lazily loaded SDKs up front and return the import time of each in ms.
+
+    Called from the gunicorn master (WARMUP_PRELOAD=1 in gunicorn.conf.py) so forked
+    workers inherit the modules instead of paying for them on their first request.
+    """
+    timings = {}
+    for module in HEAVY_MODULES:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            logger.error(f"Warm-up could not import {module}: {e}")
+            continue
+        timings[module] = round((time.perf_counter() - start) * 1000, 1)
+
+    logger.info(f"Preloaded {len(timings)} modules in {sum(timings.values()):.0f}ms: {timings}")
+    return timings
+
+
+def preload_shared_state() -> List[str]:
+    """
+    Build the app's immutable, process-wide state and return the names of what was built.
+
+    Everything built here is cached at module level and only read afterwards, so when
+    it is created in the gunicorn master (GUNICORN_PRELOAD=1) the workers share it
+    copy-on-write instead of each building a private copy.
+    """
+    from app.services.pdf_themes import THEMES, get_render_plan
+    from app.services.resume_service import FIT_MAX_SCALE, FIT_MIN_SCALE, FIT_SCALE_STEP, get_resume_styles
+
+    fit_steps = round((FIT_MAX_SCALE - FIT_MIN_SCALE) / FIT_SCALE_STEP)
+    builders = {
+        "resume_styles": get_resume_styles,
+        # Every theme at every scale the fit-to-pages search can try
+        "resume_styles_fit": lambda: [
+            get_render_plan(theme).styles(FIT_MIN_SCALE + step * FIT_SCALE_STEP)
+            for theme in THEMES for step in range(fit_steps + 1)
+        ],
+    }
+    for name, build in builders.items():
+        build()
+    return list(builders)
@@ -0,0 +1,86 @@
+"""
+Throughput of the batched ATS scorer:
+
+    uv run python -m benchmarks.bench_ats_score --jobs 50,1000
+
+Builds job descriptions by recombining the lines of the recorded SerpApi postings,
+then scores the typical resume against batches of each size with score_jobs, and
+with a per-job pure Python scorer computing the same keyword coverage from dicts.
+Reports jobs scored per second and fails if the two disagree on any job.
+"""
+import os
+import sys
+import math
+import random
+import argparse
+from typing import Dict, List
+
+from app.services.ats_score import keywords, score_jobs
+from benchmarks.bench_hot_paths import _load_json, measure
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def build_descriptions(count: int, seed: int = 7) -> List[str]:
+    """count descriptions of 6-25 lines drawn from the recorded postings' titles and description lines."""
+    postings = _load_json("serpapi_jobs.json")["jobs_results"]
+    titles = [posting["title"] for posting in postings]
+    lines = sorted({line for posting in postings for line in posting["description"].split("\n") if line.strip()})
+    rng = random.Random(seed)
+    return [
+        "\n".join([rng.choice(titles)] + rng.sample(lines, rng.randint(6, min(25, len(lines)))))
+        for _ in range(count)
+    ]
+
+
+def python_coverage(resume_text: str, descriptions: List[str]) -> List[float]:
+    """Keyword coverage one job at a time, with dicts instead of arrays."""
+    resume_terms = set(keywords(resume_text))
+    job_terms = [keywords(description) for description in descriptions]
+    document_frequency: Dict[str, int] = {}
+    for terms in job_terms:
+        for term in terms:
+            document_frequency[term] = document_frequency.get(term, 0) + 1
+
+    coverage = []
+    for terms in job_terms:
+        total = matched = 0.0
+        for term, count in terms.items():
+            weight = (1.0 + math.log(count)) * (math.log((1.0 + len(descriptions)) / (1.0 + document_frequency[term])) + 1.0)
+            total += weight
+            if term in resume_terms:
+                matched += weight
+        coverage.append(matched / total if total else 0.0)
+    return coverage
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched ATS scoring")
+    parser.add_argument("--jobs", default="1,50,1000", help="Comma separated batch sizes")
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with open(os.path.join(FIXTURES_DIR, "resume_typical.txt"), encoding="utf-8") as f:
+        resume_text = f.read()
+
+    print(f"{'jobs':>6} {'score_jobs':>12} {'jobs/s':>9} {'python':>12} {'jobs/s':>9} {'mean score':>10}")
+    mismatches = 0
+    for count in (int(n) for n in args.jobs.split(",")):
+        descriptions = build_descriptions(count)
+        scores = score_jobs(resume_text, descriptions)
+        reference = python_coverage(resume_text, descriptions)
+        mismatches += sum(abs(score.keyword_coverage - round(value, 3)) > 1e-9 for score, value in zip(scores, reference))
+
+        batched = measure(lambda: score_jobs(resume_text, descriptions), args.min_time, args.repeat)
+        python = measure(lambda: python_coverage(resume_text, descriptions), args.min_time, args.repeat)
+        mean = sum(score.score for score in scores) / len(scores)
+        print(f"{count:6d} {batched['median_us'] / 1000:10.2f}ms {count / batched['median_us'] * 1e6:9.0f} "
+              f"{python['median_us'] / 1000:10.2f}ms {count / python['median_us'] * 1e6:9.0f} {mean:10.1f}")
+
+    print(f"\nscore_jobs and the per-job scorer disagreed on {mismatches} keyword coverages")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
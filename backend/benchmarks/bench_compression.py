@@ -0,0 +1,94 @@
+"""
+Bytes on the wire and CPU cost of response compression at typical payload sizes:
+
+    uv run python -m benchmarks.bench_compression
+    uv run python -m benchmarks.bench_compression --gzip-levels 1,6,9 --brotli-qualities 1,4,6
+
+Payloads are the JSON bodies of a 10 and 50 job search, a tailored resume from
+/resume/tailor and a parse result, built from the recorded fixtures. Each is
+compressed with the same code path as CompressionMiddleware.
+"""
+import os
+import sys
+import json
+import argparse
+from typing import Dict, List, Tuple
+
+from fastapi.responses import JSONResponse
+
+from app.models.job_models import ResumeParseResponse, ResumeTailorResponse
+from app.services.compression import BROTLI_QUALITY, COMPRESSION_MIN_SIZE, GZIP_LEVEL, compress_body
+from app.services.resume_service import parse_gemini_output_to_dict
+from benchmarks.bench_hot_paths import measure
+from benchmarks.bench_json_response import search_response
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def _load_json(name: str) -> dict:
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _gemini_text(name: str) -> str:
+    return _load_json(name)["candidates"][0]["content"]["parts"][0]["text"]
+
+
+def build_payloads() -> List[Tuple[str, bytes]]:
+    jobs = _load_json("serpapi_jobs.json")["jobs_results"]
+    tailor = ResumeTailorResponse(
+        success=True,
+        message="Resume tailored successfully",
+        tailored_resume_text=_gemini_text("gemini_tailor.json"),
+        filename="Jordan_Rivera_Acme_Corp_Backend_Engineer.pdf"
+    )
+    parse = ResumeParseResponse(
+        success=True,
+        message="Resume parsed successfully",
+        parsed_data=parse_gemini_output_to_dict(_gemini_text("gemini_parse.json"))
+    )
+    return [
+        ("jobs_search[10_jobs]", JSONResponse(search_response(jobs, 10).model_dump(mode="json")).body),
+        ("jobs_search[50_jobs]", JSONResponse(search_response(jobs, 50).model_dump(mode="json")).body),
+        ("resume_tailor", JSONResponse(tailor.model_dump(mode="json")).body),
+        ("resume_parse", JSONResponse(parse.model_dump(mode="json")).body),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure response compression ratio and CPU cost")
+    parser.add_argument("--gzip-levels", default=str(GZIP_LEVEL), help="Comma separated gzip levels")
+    parser.add_argument("--brotli-qualities", default=str(BROTLI_QUALITY),
+                        help="Comma separated brotli qualities")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per timing run")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=None, help="Write the results as JSON to this path")
+    args = parser.parse_args()
+
+    settings = [("gzip", int(level)) for level in args.gzip_levels.split(",")]
+    settings += [("br", int(quality)) for quality in args.brotli_qualities.split(",")]
+
+    results: Dict[str, dict] = {}
+    print(f"{'payload':24} {'encoding':9} {'bytes':>9} {'ratio':>7} {'cpu':>10} {'MB/s':>8}")
+    for name, body in build_payloads():
+        results[name] = {"identity_bytes": len(body)}
+        skipped = " (below min size, sent as is)" if len(body) < COMPRESSION_MIN_SIZE else ""
+        print(f"{name:24} {'identity':9} {len(body):9d}{skipped}")
+        for encoding, level in settings:
+            compressed = compress_body(body, encoding, level)
+            timing = measure(lambda: compress_body(body, encoding, level), args.min_time, args.repeat)
+            label = f"{encoding}-{level}"
+            results[name][label] = {"bytes": len(compressed), "median_us": timing["median_us"]}
+            print(
+                f"{'':24} {label:9} {len(compressed):9d} {len(body) / len(compressed):6.1f}x "
+                f"{timing['median_us']:8.1f}us {len(body) / timing['median_us']:8.1f}"
+            )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+Cost of the fit-to-pages layout search against a fixed-layout render:
+
+    uv run python -m benchmarks.bench_fit_pages --fit-pages 2
+
+Generates resumes from one to many experience entries, then for each one times a
+fixed-layout render, the scale search on its own (fit_scale, which measures pages
+with count_pages instead of rendering) and a fitted render. Also checks that the
+fitted PDF has the page count count_pages predicted.
+"""
+import io
+import sys
+import logging
+import argparse
+
+from PyPDF2 import PdfReader
+
+from app.services import resume_service
+from app.services.resume_normalizer import normalize_resume
+from app.services.resume_service import build_pdf, fit_scale, parse_gemini_output_to_dict
+from benchmarks.bench_hot_paths import _gemini_text, measure
+
+
+def pdf_pages(parsed_data, fit_pages: int) -> int:
+    buffer = io.BytesIO()
+    build_pdf(parsed_data, buffer, fit_pages)
+    buffer.seek(0)
+    return len(PdfReader(buffer).pages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the fit-to-pages layout search")
+    parser.add_argument("--fit-pages", type=int, default=2)
+    parser.add_argument("--entries", default="1,3,6,9,12,15,20", help="Comma separated experience entry counts")
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    # fit_scale logs every resume that does not fit even at the smallest scale
+    logging.getLogger(resume_service.__name__).setLevel(logging.WARNING)
+
+    typical = parse_gemini_output_to_dict(_gemini_text("gemini_parse.json"))
+    items = typical["PROFESSIONAL_EXPERIENCE"].split("\n\n")
+    width, height = resume_service._content_area()
+
+    print(f"Fitting into {args.fit_pages} pages, scales {resume_service.FIT_MIN_SCALE}-{resume_service.FIT_MAX_SCALE}\n")
+    print(f"{'entries':>7} {'fixed pp':>8} {'scale':>6} {'probes':>6} {'fit pp':>6} "
+          f"{'fixed render':>13} {'search':>10} {'fit render':>11} {'overhead':>9}")
+    mismatches = 0
+    for count in (int(n) for n in args.entries.split(",")):
+        data = dict(typical, PROFESSIONAL_EXPERIENCE="\n\n".join((items * count)[:count]))
+        resume = normalize_resume(data)
+        scale, probes = fit_scale(resume, args.fit_pages)
+        predicted = resume_service.count_pages(resume_service.build_story(resume, scale), width, height)
+        fitted_pages = pdf_pages(data, args.fit_pages)
+        mismatches += predicted != fitted_pages
+
+        fixed = measure(lambda: build_pdf(data, io.BytesIO()), args.min_time, args.repeat)
+        search = measure(lambda: fit_scale(resume, args.fit_pages), args.min_time, args.repeat)
+        fitted = measure(lambda: build_pdf(data, io.BytesIO(), args.fit_pages), args.min_time, args.repeat)
+        print(f"{count:7d} {pdf_pages(data, 0):8d} {scale:6.2f} {probes:6d} {fitted_pages:6d} "
+              f"{fixed['median_us'] / 1000:11.1f}ms {search['median_us'] / 1000:8.1f}ms "
+              f"{fitted['median_us'] / 1000:9.1f}ms {fitted['median_us'] / fixed['median_us']:8.2f}x")
+
+    print(f"\ncount_pages disagreed with the rendered page count for {mismatches} resumes")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
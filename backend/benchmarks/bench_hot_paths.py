@@ -0,0 +1,205 @@
+"""
+Microbenchmarks for the CPU hot paths of the resume pipeline.
+
+Each case is timed with timeit (best and median per call) and traced once with
+tracemalloc (peak bytes and allocated blocks). Results are compared against a
+stored baseline so a change to any of these functions shows its CPU and
+allocation impact:
+
+    uv run python -m benchmarks.bench_hot_paths                   # compare with baseline
+    uv run python -m benchmarks.bench_hot_paths --save-baseline   # record a new baseline
+    uv run python -m benchmarks.bench_hot_paths -k create_pdf     # only matching cases
+
+Baselines are machine specific; record one on the machine you compare on.
+"""
+import os
+import sys
+import json
+import time
+import timeit
+import argparse
+import platform
+import statistics
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from app.services.resume_normalizer import clean_contact_info, is_placeholder_text, normalize_resume
+from app.services.resume_service import build_story, create_pdf_from_data, parse_gemini_output_to_dict
+from app.services.job_service import extract_job_url
+from app.routes.resume import extract_text_from_pdf
+
+BENCH_DIR = os.path.dirname(__file__)
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baselines", "hot_paths.json")
+
+# A case is (name, function taking no arguments)
+Case = Tuple[str, Callable[[], object]]
+
+
+def _load_json(name: str) -> dict:
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _gemini_text(name: str) -> str:
+    return _load_json(name)["candidates"][0]["content"]["parts"][0]["text"]
+
+
+def build_resume_sizes(typical: Dict[str, str]) -> Dict[str, Dict[str, str]]:
+    """Derive small and huge resumes from the committed typical one."""
+    experience_items = typical["PROFESSIONAL_EXPERIENCE"].split("\n\n")
+    small = {
+        "PERSONAL_INFO": typical["PERSONAL_INFO"],
+        "PROFESSIONAL_SUMMARY": typical["PROFESSIONAL_SUMMARY"],
+        "PROFESSIONAL_EXPERIENCE": experience_items[0],
+        "EDUCATION": typical["EDUCATION"],
+    }
+    huge = dict(typical)
+    huge["PROFESSIONAL_EXPERIENCE"] = "\n\n".join(experience_items * 12)
+    huge["PROJECTS"] = "\n\n".join([typical["PROJECTS"]] * 10)
+    huge["CORE_COMPETENCIES"] = "\n".join([typical["CORE_COMPETENCIES"]] * 4)
+    return {"small": small, "typical": typical, "huge": huge}
+
+
+def build_cases() -> List[Case]:
+    gemini_output = _gemini_text("gemini_parse.json")
+    typical = parse_gemini_output_to_dict(gemini_output)
+    resumes = build_resume_sizes(typical)
+
+    contact_lines = typical["PERSONAL_INFO"].split("\n")[1:] + [
+        "Portfolio: Not provided | GitHub: github.com/jrivera",
+        "[LinkedIn Profile URL if provided]",
+    ]
+    all_lines = [line for section in typical.values() for line in section.split("\n")]
+    normalized = {size: normalize_resume(data) for size, data in resumes.items()}
+    jobs = _load_json("serpapi_jobs.json")["jobs_results"]
+    with open(os.path.join(FIXTURES_DIR, "resume_typical.pdf"), "rb") as f:
+        resume_pdf = f.read()
+
+    cases: List[Case] = [
+        (f"create_pdf_from_data[{size}]", lambda data=data: create_pdf_from_data(data))
+        for size, data in resumes.items()
+    ]
+    cases += [
+        (f"create_pdf_from_data[{size},fit_pages=2]", lambda data=data: create_pdf_from_data(data, fit_pages=2))
+        for size, data in resumes.items()
+    ]
+    cases += [(f"normalize_resume[{size}]", lambda data=data: normalize_resume(data)) for size, data in resumes.items()]
+    cases += [(f"build_story[{size}]", lambda resume=resume: build_story(resume)) for size, resume in normalized.items()]
+    cases += [
+        ("parse_gemini_output_to_dict", lambda: parse_gemini_output_to_dict(gemini_output)),
+        ("clean_contact_info", lambda: clean_contact_info(contact_lines)),
+        ("is_placeholder_text[all_lines]", lambda: [is_placeholder_text(line) for line in all_lines]),
+        ("extract_job_url[60_jobs]", lambda: [extract_job_url(job) for job in jobs]),
+        ("extract_text_from_pdf", lambda: extract_text_from_pdf(resume_pdf)),
+    ]
+    return cases
+
+
+def measure(func: Callable[[], object], min_time: float, repeat: int) -> dict:
+    """Time a case and trace its allocations."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    # autorange targets 0.2s per run; scale to the requested minimum time
+    number = max(1, int(number * min_time / 0.2))
+    runs = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+
+    tracemalloc.start()
+    func()
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+
+    return {
+        "best_us": round(min(runs) * 1e6, 2),
+        "median_us": round(statistics.median(runs) * 1e6, 2),
+        "peak_alloc_bytes": peak,
+        "retained_blocks": blocks,
+        "loops": number,
+    }
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Print a comparison table and return the names of cases that regressed beyond the threshold."""
+    regressions = []
+    print(f"\n{'case':40} {'median':>12} {'baseline':>12} {'cpu':>8} {'peak alloc':>12} {'alloc':>8}")
+    for name, result in results.items():
+        old = baseline.get(name)
+        if not old:
+            print(f"{name:40} {result['median_us']:10.1f}us {'-':>12} {'new':>8}")
+            continue
+        cpu_change = (result["median_us"] - old["median_us"]) / old["median_us"] * 100
+        alloc_change = (
+            (result["peak_alloc_bytes"] - old["peak_alloc_bytes"]) / old["peak_alloc_bytes"] * 100
+            if old["peak_alloc_bytes"] else 0.0
+        )
+        flag = ""
+        if cpu_change > threshold or alloc_change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(
+            f"{name:40} {result['median_us']:10.1f}us {old['median_us']:10.1f}us {cpu_change:+7.1f}% "
+            f"{result['peak_alloc_bytes']:12d} {alloc_change:+7.1f}%{flag}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks for resume_service hot paths")
+    parser.add_argument("-k", dest="keyword", default=None, help="Only run cases whose name contains this string")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per timing run")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regression threshold in percent")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit non-zero when a case regresses")
+    args = parser.parse_args()
+
+    results = {}
+    cases = build_cases()
+    for name, func in cases:
+        if args.keyword and args.keyword not in name:
+            continue
+        results[name] = measure(func, args.min_time, args.repeat)
+        print(f"{name:40} best {results[name]['best_us']:10.1f}us  median {results[name]['median_us']:10.1f}us  "
+              f"peak alloc {results[name]['peak_alloc_bytes']:10d}B")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        existing = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                existing = json.load(f).get("cases", {})
+        # Cases that no longer exist would otherwise stay in the baseline forever
+        names = {name for name, _ in cases}
+        existing = {name: case for name, case in existing.items() if name in names}
+        existing.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "meta": {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                },
+                "cases": existing,
+            }, f, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("\nNo baseline found; run with --save-baseline to record one.")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline.get("cases", {}), args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} case(s) regressed by more than {args.threshold:.0f}%: {', '.join(regressions)}")
+        if args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Upsert throughput and query latency of the local job store at a realistic size:
+
+    uv run python -m benchmarks.bench_job_store --rows 20000
+
+Fills a temporary database with copies of the recorded SerpApi postings (each
+with its own job_id), then times /local-search style queries against it.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+
+from app.models.job_models import JobResult
+from app.services import job_store
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+QUERIES = [
+    ("engineer", None),
+    ("python developer", None),
+    ("senior software eng", "Austin"),
+    ("kubernetes platform", None),
+    ("data", "Seattle"),
+]
+
+
+def load_postings(rows: int):
+    with open(os.path.join(FIXTURES_DIR, "serpapi_jobs.json"), encoding="utf-8") as f:
+        jobs = json.load(f)["jobs_results"]
+    for i in range(rows):
+        job = jobs[i % len(jobs)]
+        yield JobResult(
+            title=job.get("title"),
+            company_name=job.get("company_name"),
+            location=job.get("location"),
+            description=job.get("description"),
+            job_url=job.get("share_link"),
+            job_id=f"{job.get('job_id')}-{i}",
+            raw_data=job
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the SQLite FTS5 job store")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=10, help="Postings per upsert, as stored per search")
+    parser.add_argument("--repeat", type=int, default=200, help="Runs of each query")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        job_store.JOB_STORE_PATH = os.path.join(directory, "jobs.db")
+
+        postings = list(load_postings(args.rows))
+        start = time.perf_counter()
+        for i in range(0, len(postings), args.batch):
+            job_store.upsert_jobs(postings[i:i + args.batch])
+        elapsed = time.perf_counter() - start
+        print(f"Upserted {len(postings)} postings in batches of {args.batch}: "
+              f"{elapsed:.2f}s ({len(postings) / elapsed:.0f} postings/s)")
+        print(f"Database size: {os.path.getsize(job_store.JOB_STORE_PATH) / 1024 / 1024:.1f}MB\n")
+
+        print(f"{'query':32} {'results':>8} {'p50':>9} {'p95':>9}")
+        for query, location in QUERIES:
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                results = job_store.search_local_jobs(query, location=location, limit=10)
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            label = f"{query} @ {location}" if location else query
+            print(f"{label:32} {len(results):8d} {statistics.median(timings):7.2f}ms "
+                  f"{timings[int(len(timings) * 0.95) - 1]:7.2f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
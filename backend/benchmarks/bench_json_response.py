@@ -0,0 +1,133 @@
+"""
+Encode time and size of the JSON responses of /jobs/search, /resume/parse and
+/resume/extract-from-pdf, default path against FastJSONResponse:
+
+    uv run python -m benchmarks.bench_json_response
+
+The default path mirrors what FastAPI 0.116 (the locked version) does for a route
+with a response_model: dump the returned model, validate the dict back into the
+model, dump it to JSON-compatible Python objects and json.dumps them. Routes
+without a response_model go through jsonable_encoder instead. Every case also
+checks that both paths produce byte-identical bodies.
+"""
+import os
+import sys
+import json
+import argparse
+from typing import Any, Callable, Dict, List, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.models.job_models import JobResult, JobSearchResponse, ResumeParseResponse
+from app.services.job_service import extract_job_url
+from app.services.json_response import FastJSONResponse
+from app.services.resume_service import parse_gemini_output_to_dict
+from benchmarks.bench_hot_paths import measure
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+# A case is (name, route result)
+Case = Tuple[str, Any]
+
+
+def _load_json(name: str) -> dict:
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def search_response(jobs: List[dict], count: int) -> JobSearchResponse:
+    """Build the response exactly as find_jobs and the /search route do."""
+    results = [
+        JobResult(
+            title=job.get("title"),
+            company_name=job.get("company_name"),
+            location=job.get("location", "Not specified"),
+            description=job.get("description"),
+            job_url=extract_job_url(job),
+            job_id=job.get("job_id"),
+            raw_data=job
+        )
+        for job in jobs[:count]
+    ]
+    return JobSearchResponse(
+        success=True,
+        message=f"Found {len(results)} jobs for 'Backend Engineer' in Austin, TX",
+        jobs=results,
+        total_count=len(results)
+    )
+
+
+def build_cases() -> List[Case]:
+    jobs = _load_json("serpapi_jobs.json")["jobs_results"]
+    gemini_output = _load_json("gemini_parse.json")["candidates"][0]["content"]["parts"][0]["text"]
+    with open(os.path.join(FIXTURES_DIR, "resume_typical.txt"), encoding="utf-8") as f:
+        resume_text = f.read()
+
+    return [
+        ("jobs_search[10_jobs]", search_response(jobs, 10)),
+        ("jobs_search[50_jobs]", search_response(jobs, 50)),
+        ("resume_parse", ResumeParseResponse(
+            success=True,
+            message="Resume parsed successfully",
+            parsed_data=parse_gemini_output_to_dict(gemini_output)
+        )),
+        ("resume_extract_from_pdf", {
+            "success": True,
+            "message": "Text extracted successfully from PDF",
+            "resume_text": resume_text,
+            "filename": "resume_typical.pdf"
+        }),
+    ]
+
+
+def default_encoder(content: Any) -> Callable[[], bytes]:
+    if isinstance(content, BaseModel):
+        model = type(content)
+        return lambda: JSONResponse(
+            model.model_validate(content.model_dump(by_alias=True)).model_dump(mode="json", by_alias=True)
+        ).body
+    return lambda: JSONResponse(jsonable_encoder(content)).body
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare JSON response encoding paths")
+    parser.add_argument("-k", dest="keyword", default=None, help="Only run cases whose name contains this string")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per timing run")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=None, help="Write the results as JSON to this path")
+    args = parser.parse_args()
+
+    results: Dict[str, dict] = {}
+    mismatches = []
+    print(f"{'case':28} {'bytes':>9} {'default':>12} {'fast':>12} {'speedup':>8}")
+    for name, content in build_cases():
+        if args.keyword and args.keyword not in name:
+            continue
+        default = default_encoder(content)
+        fast = lambda content=content: FastJSONResponse(content).body
+        if default() != fast():
+            mismatches.append(name)
+
+        default_result = measure(default, args.min_time, args.repeat)
+        fast_result = measure(fast, args.min_time, args.repeat)
+        results[name] = {"bytes": len(fast()), "default": default_result, "fast": fast_result}
+        print(
+            f"{name:28} {len(fast()):9d} {default_result['median_us']:10.1f}us {fast_result['median_us']:10.1f}us "
+            f"{default_result['median_us'] / fast_result['median_us']:7.1f}x"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if mismatches:
+        print(f"\nOutput differs between the two paths for: {', '.join(mismatches)}")
+        return 1
+    print("\nBoth paths produce identical bodies for every case")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
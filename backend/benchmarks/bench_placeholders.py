@@ -0,0 +1,163 @@
+"""
+Correctness and cost of placeholder detection:
+
+    uv run python -m benchmarks.bench_placeholders
+
+Checks is_placeholder_text against a table of lines it must drop (every line of
+the parse prompt's template, "N/A" style values), a table of lines it must keep
+(words that only contain a placeholder phrase, bracketed values after a bullet or
+"Category:" that are not template slots), and every non-empty line, header part
+and contact part of the recorded resumes, which must all be kept. Then times it
+against the substring matcher it replaced over the small, typical and huge
+resumes. Exits non-zero when a line is misclassified; --check skips the timing:
+
+    uv run python -m benchmarks.bench_placeholders --check
+"""
+import sys
+import argparse
+from typing import List
+
+from app.services.resume_normalizer import is_placeholder_text
+from app.services.resume_service import parse_gemini_output_to_dict
+from benchmarks.bench_hot_paths import _gemini_text, build_resume_sizes, measure
+
+# Lines that must be dropped
+PLACEHOLDERS = [
+    "",
+    "   ",
+    "Not provided",
+    "not  specified",
+    "Not Available",
+    "N/A",
+    "GitHub: n/a",
+    "None",
+    "Portfolio: none",
+    "nil",
+    "Not applicable",
+    "[Tool names]",
+    "Tools: [Tool names]",
+    "• [Tool names]",
+    # Every template line of the parse prompt
+    "[Full Name]",
+    "[Email Address]",
+    "[Phone Number]",
+    "[Location/Address if provided]",
+    "[LinkedIn Profile URL if provided]",
+    "[GitHub/Portfolio URL if provided]",
+    "[Professional Website if provided]",
+    "[Any additional contact information]",
+    "[Executive summary or professional profile - capture the complete summary that positions the candidate as a senior professional]",
+    "[List of key competencies, skills, and areas of expertise - organize as bullet points or categories]",
+    "[Degree Type] | [Institution Name] | [Graduation Year/Date] | [GPA if mentioned] | [Honors/Distinctions]",
+    "[Additional degrees following same format]",
+    "[Relevant coursework or academic projects if significant]",
+    "Programming Languages: [comprehensive list]",
+    "Frameworks & Libraries: [comprehensive list]",
+    "Databases & Data Technologies: [comprehensive list]",
+    "Cloud Platforms & DevOps: [comprehensive list]",
+    "Development Tools & IDEs: [comprehensive list]",
+    "Operating Systems: [list if mentioned]",
+    "Methodologies: [Agile, Scrum, etc. if mentioned]",
+    "[Any other technical categories]",
+    "[Job Title] | [Company Name] | [Employment Period] | [Location if provided]",
+    "- [Detailed achievement/responsibility with quantified results]",
+    "- [Continue for all significant accomplishments - maintain executive language]",
+    "[Next position following same format]",
+    "[Project Name] | [Technologies/Skills Used] | [Timeframe] | [Role/Context]",
+    "- [Project description with business impact]",
+    "- [Key technical achievements and outcomes]",
+    "- [Quantified results and metrics]",
+    "[Next project following same format]",
+    "[Professional certifications with issuing organization and date]",
+    "[Industry awards and recognitions]",
+    "[Publications, patents, or thought leadership]",
+    "[Volunteer work or community involvement if professionally relevant]",
+    "[Professional memberships and affiliations]",
+]
+
+# Lines that must be kept; the substring matcher dropped every one of them
+REAL_TEXT = [
+    "Skills [Python]",
+    "Languages: Python [advanced], Go [intermediate]",
+    "- Reduced p95 latency [from 800ms to 120ms] across 40 services",
+    "Erik Nilsson",
+    "Based in Manila, Philippines",
+    "- Annihilated a 3-year backlog of flaky tests",
+    "- Built vanilla JavaScript widgets",
+    "Cloud: AWS (Lambda, Nitro Enclaves), GCP",
+    "- Nonetheless shipped on time",
+    "Noneya Labs | Staff Engineer | 2019 - 2023",
+    "Certified Kubernetes Administrator [CKA]",
+    "Array indexing a[i] in C",
+    "Skills: [Python]",
+    "- [Python, Go, Rust]",
+    "• [Kubernetes]",
+    "Awards: [Best Paper, ICML 2020]",
+    "[Open source maintainer]",
+]
+
+
+def substring_is_placeholder_text(text: str) -> bool:
+    """The matcher is_placeholder_text replaced, kept here for comparison."""
+    if not text or not text.strip():
+        return True
+    placeholder_indicators = ['not provided', 'not specified', 'not available', 'n/a', '[', ']', 'none', 'nil']
+    text_lower = text.lower().strip()
+    return any(indicator in text_lower for indicator in placeholder_indicators)
+
+
+def checked_texts(parsed_data) -> List[str]:
+    """Every string a render passes to is_placeholder_text: lines, header parts and contact parts."""
+    texts = []
+    for section in parsed_data.values():
+        for line in section.split("\n"):
+            texts.append(line.strip())
+            if "|" in line:
+                texts.extend(part.strip() for part in line.split("|"))
+    return texts
+
+
+def misclassified(resume_texts: List[str]) -> List[str]:
+    """Every table line and recorded resume line is_placeholder_text gets wrong."""
+    failures = [f"kept placeholder {text!r}" for text in PLACEHOLDERS if not is_placeholder_text(text)]
+    failures += [f"dropped {text!r}" for text in REAL_TEXT if is_placeholder_text(text)]
+    failures += [f"dropped resume line {text!r}" for text in resume_texts if text and is_placeholder_text(text)]
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and benchmark placeholder detection")
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--check", action="store_true", help="Only check the classification, without timing")
+    args = parser.parse_args()
+
+    resumes = build_resume_sizes(parse_gemini_output_to_dict(_gemini_text("gemini_parse.json")))
+    resume_texts = sorted({text for data in resumes.values() for text in checked_texts(data)})
+    failures = misclassified(resume_texts)
+    substring_misses = sum(not substring_is_placeholder_text(text) for text in PLACEHOLDERS)
+    substring_drops = sum(substring_is_placeholder_text(text) for text in REAL_TEXT)
+    checked = len(PLACEHOLDERS) + len(REAL_TEXT) + sum(1 for text in resume_texts if text)
+    print(f"compiled matcher: {len(failures)} of {checked} lines misclassified")
+    print(f"substring matcher: {substring_misses} placeholders kept, {substring_drops} real lines dropped\n")
+    if args.check:
+        for failure in failures:
+            print(f"FAIL {failure}")
+        return 1 if failures else 0
+
+    print(f"{'resume':8} {'texts':>6} {'substring':>11} {'compiled':>10} {'speedup':>8} {'disagree':>9}")
+    for size, data in resumes.items():
+        texts = checked_texts(data)
+        old = measure(lambda: [substring_is_placeholder_text(text) for text in texts], args.min_time, args.repeat)
+        new = measure(lambda: [is_placeholder_text(text) for text in texts], args.min_time, args.repeat)
+        disagree = sum(is_placeholder_text(text) != substring_is_placeholder_text(text) for text in texts)
+        print(f"{size:8} {len(texts):6d} {old['median_us']:9.1f}us {new['median_us']:8.1f}us "
+              f"{old['median_us'] / new['median_us']:7.2f}x {disagree:9d}")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Cost of a PDF render against serving it from the content-addressed render cache:
+
+    uv run python -m benchmarks.bench_render_cache
+
+For each resume size, times rendering with create_pdf_from_data, a cache hit
+(hashing the sections and touching the cached file) and a full GET /pdf/{key}
+download and 304 revalidation through the ASGI app. Also times the directory
+scan eviction runs with a full cache.
+"""
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+
+import httpx
+
+from app.services import render_cache
+from app.services.resume_service import build_pdf, create_pdf_from_data, parse_gemini_output_to_dict
+from benchmarks.bench_hot_paths import _gemini_text, build_resume_sizes, measure
+
+
+async def time_requests(app, path: str, headers: dict, count: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get(path, headers=headers)
+        start = time.perf_counter()
+        for _ in range(count):
+            response = await client.get(path, headers=headers)
+        assert response.status_code in (200, 304), response.status_code
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the PDF render cache")
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=200, help="HTTP requests per download case")
+    parser.add_argument("--files", type=int, default=5000, help="Cached PDFs for the eviction scan")
+    args = parser.parse_args()
+
+    resumes = build_resume_sizes(parse_gemini_output_to_dict(_gemini_text("gemini_parse.json")))
+
+    with tempfile.TemporaryDirectory() as directory:
+        render_cache.RENDER_CACHE_DIR = directory
+        from main import app
+
+        print(f"{'resume':10} {'bytes':>8} {'render':>12} {'cache hit':>12} {'GET 200':>12} {'GET 304':>12}")
+        for size, data in resumes.items():
+            render = measure(lambda data=data: create_pdf_from_data(data), args.min_time, args.repeat)
+            pdf = render_cache.get_or_render_pdf(data, build_pdf)
+            hit = measure(lambda data=data: render_cache.get_or_render_pdf(data, build_pdf), args.min_time, args.repeat)
+            path = f"{render_cache.PDF_DOWNLOAD_PATH}/{pdf.etag}"
+            download = asyncio.run(time_requests(app, path, {}, args.requests))
+            revalidate = asyncio.run(time_requests(app, path, {"If-None-Match": f'"{pdf.etag}"'}, args.requests))
+            print(f"{size:10} {pdf.size:8d} {render['median_us']:10.0f}us {hit['median_us']:10.0f}us "
+                  f"{download:10.0f}us {revalidate:10.0f}us")
+
+        sample = render_cache.get_or_render_pdf(resumes["typical"], build_pdf)
+        with open(sample.path, "rb") as f:
+            pdf_data = f.read()
+        for i in range(args.files):
+            render_cache.store_pdf(f"{i:064x}", pdf_data)
+        start = time.perf_counter()
+        render_cache.evict_pdfs(max_bytes=float("inf"))
+        print(f"\nEviction scan over {args.files} cached PDFs: {(time.perf_counter() - start) * 1000:.1f}ms "
+              f"(runs every {render_cache.RENDER_CACHE_RESCAN_EVERY} stores per worker, or when over the size limit)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
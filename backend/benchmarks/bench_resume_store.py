@@ -0,0 +1,78 @@
+"""
+What a stored resume profile costs compared with parsing the resume again:
+
+    uv run python -m benchmarks.bench_resume_store --profiles 10000
+
+Fills a temporary store with profiles of the typical resume, each with its own
+first line, then times saving a profile, looking one up by resume_id and by PDF
+hash, and extracting the text of the sample PDF that a PDF hash hit skips. The
+Gemini parse call a profile hit also skips takes seconds and is not timed here.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import statistics
+
+from app.routes.resume import extract_text_from_pdf
+from app.services import job_store, resume_store
+from app.services.resume_service import parse_gemini_output_to_dict, resume_keywords
+from benchmarks.bench_hot_paths import _gemini_text
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def timed(func, repeat: int) -> str:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return f"{statistics.median(samples):7.3f}ms {samples[int(len(samples) * 0.95)]:7.3f}ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the resume profile store")
+    parser.add_argument("--profiles", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with open(os.path.join(FIXTURES_DIR, "resume_typical.txt"), encoding="utf-8") as f:
+        resume_text = f.read()
+    with open(os.path.join(FIXTURES_DIR, "resume_typical.pdf"), "rb") as f:
+        pdf = f.read()
+    sections = parse_gemini_output_to_dict(_gemini_text("gemini_parse.json"))
+    keywords = resume_keywords(resume_text)
+    texts = [f"Candidate {i}\n{resume_text}" for i in range(args.profiles)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        job_store.JOB_STORE_PATH = os.path.join(directory, "jobs.db")
+
+        start = time.perf_counter()
+        resume_ids = [
+            resume_store.save_profile(text, sections, keywords, content_hash=f"{i:064x}")
+            for i, text in enumerate(texts)
+        ]
+        elapsed = time.perf_counter() - start
+        print(f"Stored {args.profiles} profiles: {elapsed / args.profiles * 1000:.3f}ms each\n")
+
+        rng = random.Random(args.seed)
+        print(f"{'operation':28} {'p50':>9} {'p95':>9}")
+        operations = [
+            ("save_profile (refresh)", lambda: resume_store.save_profile(rng.choice(texts), sections, keywords)),
+            ("get_profile", lambda: resume_store.get_profile(rng.choice(resume_ids))),
+            ("find_profile_by_pdf", lambda: resume_store.find_profile_by_pdf(f"{rng.randrange(args.profiles):064x}")),
+            ("resume_keywords", lambda: resume_keywords(resume_text)),
+            ("extract_text_from_pdf", lambda: extract_text_from_pdf(pdf)),
+        ]
+        for label, operation in operations:
+            print(f"{label:28} {timed(operation, args.repeat)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Lookup latency and match quality of the near-duplicate tailoring cache:
+
+    uv run python -m benchmarks.bench_tailor_cache --entries 2000
+
+Fills a temporary store with tailorings of one resume for postings generated from
+the recorded job descriptions, each with its own stack and experience level, then
+looks up:
+
+- near duplicates: a stored posting reposted by another company with reordered
+  responsibilities and different benefits, which should find its original;
+- punctuation reposts: a stored posting with only its punctuation changed (full
+  stops added to bullets, "!" for the others), which must find its original, or
+  the benchmark fails;
+- other postings: generated the same way but never stored, which should not match.
+
+The recorded descriptions share one template, so the other postings are much
+closer to the stored ones than real job descriptions would be. Lookups through
+the LSH index are compared with scoring every entry of the resume.
+"""
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import statistics
+
+from app.services import job_store, tailor_cache
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+TECHNOLOGIES = [
+    "AWS", "Airflow", "Django", "Docker", "FastAPI", "GCP", "Go", "Kafka", "Kubernetes", "Linux",
+    "PostgreSQL", "PyTorch", "Python", "React", "Redis", "Spark", "Terraform", "TypeScript",
+    "Rust", "Scala", "Elixir", "Snowflake", "GraphQL", "gRPC", "Flink", "Cassandra", "Elasticsearch",
+    "dbt", "Vue", "Svelte", "Ansible", "Pulumi", "Azure", "Java", "Kotlin", "MongoDB", "Ray", "Jax",
+]
+TECHNOLOGY_PATTERN = re.compile(r"\b(" + "|".join(re.escape(name) for name in TECHNOLOGIES[:18]) + r")\b")
+
+
+def load_descriptions():
+    with open(os.path.join(FIXTURES_DIR, "serpapi_jobs.json"), encoding="utf-8") as f:
+        jobs = json.load(f)["jobs_results"]
+    return [(job["company_name"], job["description"]) for job in jobs if job.get("description")]
+
+
+def generate_posting(description: str, rng: random.Random) -> str:
+    """A new posting from a recorded one: every technology and the years of experience redrawn."""
+    description = TECHNOLOGY_PATTERN.sub(lambda _: rng.choice(TECHNOLOGIES), description)
+    return re.sub(r"\d+\+ years", f"{rng.randint(2, 12)}+ years", description)
+
+
+def repost(company: str, description: str, rng: random.Random) -> str:
+    """The same role reposted: another company name, shuffled responsibilities, other perks."""
+    description = description.replace(company, "Initrode Staffing")
+    head, _, rest = description.partition("Responsibilities:\n")
+    bullets, _, tail = rest.partition("\n\n")
+    bullets = bullets.split("\n")
+    rng.shuffle(bullets)
+    tail = tail.replace("Competitive salary and equity", "Top-of-market pay and annual bonus")
+    return f"{head}Responsibilities:\n" + "\n".join(bullets) + f"\n\n{tail}\nApply today!"
+
+
+def repunctuate(description: str) -> str:
+    """The same posting with full stops added to its bullets and every other sentence ending in "!"."""
+    description = re.sub(r"\.(?=\s|$)", "!", description)
+    return re.sub(r"(?m)(?<=\w)$", ".", description)
+
+
+def timed_lookups(resume_key, fingerprints, lookup):
+    timings, results = [], []
+    for fingerprint in fingerprints:
+        start = time.perf_counter()
+        results.append(lookup(resume_key, fingerprint))
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return results, statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+def lsh_lookup(resume_key, fingerprint):
+    return tailor_cache.find_tailoring(resume_key, "text:full", fingerprint)
+
+
+def brute_force_lookup(resume_key, fingerprint):
+    best = None
+    rows = job_store.get_connection().execute(
+        "SELECT vector, content FROM tailor_cache WHERE resume_hash = ? AND variant = 'text:full'", (resume_key,)
+    ).fetchall()
+    for row in rows:
+        similarity = tailor_cache.cosine(fingerprint.vector, dict(json.loads(row["vector"])))
+        if similarity >= tailor_cache.TAILOR_CACHE_SIMILARITY and (best is None or similarity > best.similarity):
+            best = tailor_cache.CachedTailoring(content=row["content"], similarity=similarity)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the near-duplicate tailoring cache")
+    parser.add_argument("--entries", type=int, default=2000, help="Cached tailorings of the resume")
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    descriptions = load_descriptions()
+    resume_key = tailor_cache.resume_hash("benchmark resume")
+
+    with tempfile.TemporaryDirectory() as directory:
+        job_store.JOB_STORE_PATH = os.path.join(directory, "jobs.db")
+
+        stored = []
+        start = time.perf_counter()
+        for i in range(args.entries):
+            company, description = descriptions[i % len(descriptions)]
+            text = generate_posting(description, rng)
+            tailor_cache.store_tailoring(resume_key, "text:full", tailor_cache.job_fingerprint(text), f"tailored for {i}")
+            stored.append((company, text, i))
+        elapsed = time.perf_counter() - start
+        print(f"Stored {args.entries} tailorings: {elapsed / args.entries * 1000:.2f}ms each (fingerprint and insert)")
+
+        start = time.perf_counter()
+        for _, text, _ in stored[:200]:
+            tailor_cache.job_fingerprint(text)
+        print(f"Fingerprint: {(time.perf_counter() - start) / min(200, len(stored)) * 1000:.2f}ms per description\n")
+
+        picks = [stored[rng.randrange(len(stored))] for _ in range(args.lookups)]
+        near = [tailor_cache.job_fingerprint(repost(company, text, rng)) for company, text, _ in picks]
+        punctuated = [tailor_cache.job_fingerprint(repunctuate(text)) for _, text, _ in picks]
+        unrelated = [
+            tailor_cache.job_fingerprint(generate_posting(description, rng))
+            for _, description in (rng.choice(descriptions) for _ in range(args.lookups))
+        ]
+
+        def found(results):
+            return sum(1 for result, (_, _, i) in zip(results, picks) if result and result.content == f"tailored for {i}")
+
+        missed = 0
+        print(f"{'lookup':12} {'near dups found':>16} {'punct found':>12} {'others matched':>15} {'p50':>9} {'p95':>9}")
+        for label, lookup in (("lsh", lsh_lookup), ("brute force", brute_force_lookup)):
+            results, p50, p95 = timed_lookups(resume_key, near, lookup)
+            punctuation_found = found(timed_lookups(resume_key, punctuated, lookup)[0])
+            missed += len(picks) - punctuation_found
+            others = sum(1 for result in timed_lookups(resume_key, unrelated, lookup)[0] if result)
+            print(f"{label:12} {found(results):>10}/{len(picks):<5} {punctuation_found:>6}/{len(picks):<5} "
+                  f"{others:>9}/{len(unrelated):<5} {p50:7.2f}ms {p95:7.2f}ms")
+    if missed:
+        print(f"\nFAIL {missed} punctuation-only reposts missed their original")
+    return 1 if missed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
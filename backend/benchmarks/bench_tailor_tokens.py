@@ -0,0 +1,160 @@
+"""
+Gemini tokens spent per tailored PDF, full-resume tailoring against section-level tailoring:
+
+    uv run python -m benchmarks.bench_tailor_tokens --jobs 10
+
+Runs the real prompt builders of both modes for one resume against every recorded
+job description, answering each Gemini call with the recorded fixtures, and counts
+prompt and output tokens with the same estimate the prompt budget uses. Full mode
+tailors the whole resume and then parses it; sections mode parses the base resume
+once (cached across jobs) and tailors only the job-sensitive sections.
+
+Also checks budget_job_description against job descriptions whose lines must
+survive (requirements that start like a boilerplate heading) or must be dropped
+(the bodies of benefits and EEO sections), and exits non-zero if one does not.
+"""
+import os
+import sys
+import json
+import asyncio
+import argparse
+from types import SimpleNamespace
+from typing import Dict, List
+
+from app.services import resume_service
+from app.services.prompt_budget import budget_job_description, estimate_tokens
+from benchmarks.fake_upstream import section_response
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+# (job description, lines the budgeted text must keep, lines it must drop)
+BUDGET_CASES = [
+    (
+        "Requirements:\nJD from an accredited law school\nLegal research and drafting\n"
+        "5+ years of contract negotiation\nBar admission in New York",
+        ["JD from an accredited law school", "Legal research and drafting",
+         "5+ years of contract negotiation", "Bar admission in New York"],
+        [],
+    ),
+    (
+        "About the role\nYou will run talent programs.\nDiversity hiring programs\n"
+        "Partner with hiring managers on sourcing",
+        ["Diversity hiring programs", "Partner with hiring managers on sourcing"],
+        [],
+    ),
+    (
+        "Responsibilities:\nCompensation & benefits administration\nPayroll processing for 2,000 employees",
+        ["Compensation & benefits administration", "Payroll processing for 2,000 employees"],
+        [],
+    ),
+    (
+        "Requirements:\n5+ years of Python\n\nPerks & Benefits:\nUnlimited PTO\n\n"
+        "DIVERSITY\nWe celebrate every background.\n\nBenefits\nFree lunch",
+        ["5+ years of Python"],
+        ["Unlimited PTO", "We celebrate every background.", "Free lunch"],
+    ),
+]
+
+
+def load_fixture(name: str) -> dict:
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def response_text(response: dict) -> str:
+    return response["candidates"][0]["content"]["parts"][0]["text"]
+
+
+class RecordingGemini:
+    """Stands in for both the SDK model and the REST call, recording every prompt and answer."""
+
+    def __init__(self, tailor_response: dict, parse_response: dict):
+        self.tailor_response = tailor_response
+        self.parse_response = parse_response
+        self.calls: List[Dict[str, int]] = []
+
+    def answer(self, prompt: str) -> str:
+        if "=== PERSONAL_INFO ===" in prompt:
+            text = response_text(self.parse_response)
+        elif "=== PROFESSIONAL_EXPERIENCE ===" in prompt:
+            text = response_text(section_response(self.parse_response, prompt))
+        else:
+            text = response_text(self.tailor_response)
+        self.calls.append({"prompt": estimate_tokens(prompt), "output": estimate_tokens(text)})
+        return text
+
+    def generate_content(self, prompt: str):
+        return SimpleNamespace(text=self.answer(prompt))
+
+    async def generate_content_rest(self, prompt: str, gemini_api_key: str):
+        return self.answer(prompt)
+
+
+async def run_full(gemini: RecordingGemini, resume_text: str, job_description: str) -> None:
+    tailored = await resume_service.tailor_resume_with_llm(resume_text, job_description, "key")
+    resume_service.parse_resume_with_gemini(gemini, tailored)
+
+
+async def run_sections(gemini: RecordingGemini, resume_text: str, job_description: str) -> None:
+    await resume_service.tailor_resume_sections(resume_text, job_description, "key")
+
+
+def totals(calls: List[Dict[str, int]]) -> Dict[str, int]:
+    return {
+        "calls": len(calls),
+        "prompt": sum(call["prompt"] for call in calls),
+        "output": sum(call["output"] for call in calls),
+    }
+
+
+def check_budget_cases() -> List[str]:
+    failures = []
+    for description, keep, drop in BUDGET_CASES:
+        lines = budget_job_description(description).text.split("\n")
+        failures += [f"dropped {line!r}" for line in keep if line not in lines]
+        failures += [f"kept {line!r}" for line in drop if line in lines]
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Gemini token use of the tailoring modes")
+    parser.add_argument("--jobs", type=int, default=10, help="Job descriptions to tailor the resume for")
+    args = parser.parse_args()
+
+    with open(os.path.join(FIXTURES_DIR, "resume_typical.txt"), encoding="utf-8") as f:
+        resume_text = f.read()
+    descriptions = [job["description"] for job in load_fixture("serpapi_jobs.json")["jobs_results"] if job.get("description")]
+    descriptions = [descriptions[i % len(descriptions)] for i in range(args.jobs)]
+
+    gemini = RecordingGemini(load_fixture("gemini_tailor.json"), load_fixture("gemini_parse.json"))
+    resume_service.generate_content = gemini.generate_content_rest
+    resume_service.configure_gemini = lambda api_key: gemini
+
+    results = {}
+    for mode, run in (("full", run_full), ("sections", run_sections)):
+        gemini.calls = []
+        for description in descriptions:
+            asyncio.run(run(gemini, resume_text, description))
+        results[mode] = totals(gemini.calls)
+
+    print(f"{args.jobs} tailored resumes for one base resume\n")
+    print(f"{'mode':10} {'calls':>6} {'prompt tok':>11} {'output tok':>11} {'total tok':>10} {'per job':>8}")
+    for mode, result in results.items():
+        total = result["prompt"] + result["output"]
+        print(f"{mode:10} {result['calls']:6d} {result['prompt']:11d} {result['output']:11d} "
+              f"{total:10d} {total / args.jobs:8.0f}")
+
+    full = results["full"]["prompt"] + results["full"]["output"]
+    sections = results["sections"]["prompt"] + results["sections"]["output"]
+    print(f"\nsections mode uses {100 * (1 - sections / full):.0f}% fewer tokens "
+          f"and {results['full']['calls'] - results['sections']['calls']} fewer Gemini calls")
+
+    failures = check_budget_cases()
+    print(f"\nbudget_job_description: {len(failures)} lines misplaced in {len(BUDGET_CASES)} descriptions")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+Render cost of every registered PDF theme, to catch slow themes:
+
+    uv run python -m benchmarks.bench_themes --budget-ms 60
+
+For each theme and resume size, times compiling a stylesheet (paid once per theme
+and scale per process), building the story from the normalized resume, a fixed-layout render and a render
+fitted to --fit-pages, and reports the page counts. Also checks that count_pages
+predicts the rendered page count for every theme. Exits non-zero when a theme's
+median typical-resume render is over the budget or a prediction is wrong.
+"""
+import io
+import sys
+import logging
+import argparse
+
+from PyPDF2 import PdfReader
+
+from app.services import pdf_themes, resume_service
+from app.services.resume_normalizer import normalize_resume
+from app.services.resume_service import build_pdf, build_story, fit_scale, parse_gemini_output_to_dict
+from benchmarks.bench_hot_paths import _gemini_text, build_resume_sizes, measure
+
+
+def render_pages(parsed_data, fit_pages: int, theme: str) -> int:
+    buffer = io.BytesIO()
+    build_pdf(parsed_data, buffer, fit_pages, theme)
+    buffer.seek(0)
+    return len(PdfReader(buffer).pages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PDF rendering per theme")
+    parser.add_argument("--themes", default=None, help="Comma separated themes (default: all registered)")
+    parser.add_argument("--fit-pages", type=int, default=2)
+    parser.add_argument("--budget-ms", type=float, default=None, help="Maximum median typical-resume render")
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    logging.getLogger(resume_service.__name__).setLevel(logging.WARNING)
+
+    themes = args.themes.split(",") if args.themes else pdf_themes.theme_names()
+    resumes = build_resume_sizes(parse_gemini_output_to_dict(_gemini_text("gemini_parse.json")))
+    width, height = resume_service._content_area()
+
+    print(f"{'theme':9} {'resume':8} {'styles':>8} {'story':>8} {'render':>9} {'pages':>5} "
+          f"{'fit render':>10} {'scale':>5} {'pages':>5}")
+    failures = []
+    for theme in themes:
+        compile_styles = measure(lambda: pdf_themes._build_stylesheet(pdf_themes.THEMES[theme], 1.0), args.min_time, args.repeat)
+        for size, data in resumes.items():
+            resume = normalize_resume(data)
+            story = measure(lambda: build_story(resume, 1.0, theme), args.min_time, args.repeat)
+            fixed = measure(lambda: build_pdf(data, io.BytesIO(), 0, theme), args.min_time, args.repeat)
+            fitted = measure(lambda: build_pdf(data, io.BytesIO(), args.fit_pages, theme), args.min_time, args.repeat)
+            scale, _ = fit_scale(resume, args.fit_pages, theme)
+            pages = render_pages(data, 0, theme)
+            fitted_pages = render_pages(data, args.fit_pages, theme)
+            print(f"{theme:9} {size:8} {compile_styles['median_us'] / 1000:6.2f}ms {story['median_us'] / 1000:6.1f}ms "
+                  f"{fixed['median_us'] / 1000:7.1f}ms {pages:5d} {fitted['median_us'] / 1000:8.1f}ms "
+                  f"{scale:5.2f} {fitted_pages:5d}")
+
+            for scale_checked, rendered in ((1.0, pages), (scale, fitted_pages)):
+                predicted = resume_service.count_pages(build_story(resume, scale_checked, theme), width, height)
+                if predicted != rendered:
+                    failures.append(f"{theme}/{size}: count_pages said {predicted} pages at scale {scale_checked}, rendered {rendered}")
+            if size == "typical" and args.budget_ms and fixed["median_us"] / 1000 > args.budget_ms:
+                failures.append(f"{theme}: typical render {fixed['median_us'] / 1000:.1f}ms is over {args.budget_ms:.0f}ms")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
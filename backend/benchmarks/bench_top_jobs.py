@@ -0,0 +1,79 @@
+"""
+Cost of keeping the best jobs of a stream with the bounded heap used by /jobs/top:
+
+    uv run python -m benchmarks.bench_top_jobs --jobs 100,1000,10000 --top-k 10
+
+Offers a stream of jobs with random scores, arriving in pages of ten, to TopJobs and
+takes a snapshot after every page, as stream_top_jobs does; for comparison, the
+same snapshots from a list of every scored job sorted after each page. Fails if the
+two pick different jobs, including which of equally scored jobs is kept.
+"""
+import sys
+import random
+import argparse
+from typing import List, Tuple
+
+from app.models.job_models import JobResult
+from app.services.top_jobs import TopJobs
+from benchmarks.bench_hot_paths import measure
+
+PAGE_SIZE = 10
+
+
+def heap_snapshots(stream: List[Tuple[float, JobResult]], top_k: int) -> List[List[JobResult]]:
+    top = TopJobs(top_k)
+    snapshots = []
+    for start in range(0, len(stream), PAGE_SIZE):
+        changed = False
+        for score, job in stream[start:start + PAGE_SIZE]:
+            changed = top.offer(score, job) or changed
+        if changed:
+            snapshots.append(top.best())
+    return snapshots
+
+
+def sorted_snapshots(stream: List[Tuple[float, JobResult]], top_k: int) -> List[List[JobResult]]:
+    """Every scored job kept in one list, sorted again after each page."""
+    scored: List[Tuple[float, int, JobResult]] = []
+    snapshots = []
+    previous = None
+    for start in range(0, len(stream), PAGE_SIZE):
+        scored.extend((score, start + offset, job) for offset, (score, job) in enumerate(stream[start:start + PAGE_SIZE]))
+        # Highest score first, earliest arrival first among equal scores
+        scored.sort(key=lambda entry: (-entry[0], entry[1]))
+        best = [job for _, _, job in scored[:top_k]]
+        if best != previous:
+            snapshots.append(best)
+            previous = best
+    return snapshots
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bounded top-k selection of streamed jobs")
+    parser.add_argument("--jobs", default="100,1000,10000", help="Comma separated stream lengths")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'jobs':>6} {'snapshots':>9} {'heap':>10} {'sorted':>10} {'speedup':>8}")
+    mismatches = 0
+    for count in (int(n) for n in args.jobs.split(",")):
+        rng = random.Random(count)
+        # Scores rounded to 0.1 like ats_score, so ties happen
+        stream = [(round(rng.uniform(20, 80), 1), JobResult(job_id=str(i), title=f"Job {i}")) for i in range(count)]
+        heap = heap_snapshots(stream, args.top_k)
+        reference = sorted_snapshots(stream, args.top_k)
+        mismatches += heap != reference
+
+        heap_time = measure(lambda: heap_snapshots(stream, args.top_k), args.min_time, args.repeat)
+        sorted_time = measure(lambda: sorted_snapshots(stream, args.top_k), args.min_time, args.repeat)
+        print(f"{count:6d} {len(heap):9d} {heap_time['median_us'] / 1000:8.2f}ms {sorted_time['median_us'] / 1000:8.2f}ms "
+              f"{sorted_time['median_us'] / heap_time['median_us']:7.1f}x")
+
+    print(f"\nThe heap and the sorted list disagreed on {mismatches} streams")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+Offline stand-in for the SerpApi and Gemini HTTP APIs.
+
+Replays recorded responses from benchmarks/fixtures with configurable latency
+and error injection, so the backend can be load tested without network access
+or API quota. Point the backend at it with:
+
+    SERPAPI_BASE_URL=http://127.0.0.1:8900 GEMINI_API_BASE_URL=http://127.0.0.1:8900 \\
+        uv run uvicorn main:app --port 8003
+
+and start the stand-in with:
+
+    uv run python -m benchmarks.fake_upstream --port 8900 \\
+        --serpapi-latency lognormal:6.0,0.4 --gemini-latency uniform:800,2500 --error-rate 0.02
+"""
+import os
+import json
+import random
+import re
+import asyncio
+import argparse
+import logging
+from typing import Callable, Dict
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+SERPAPI_PAGE_SIZE = 10
+
+# Statuses returned when an error is injected; mirrors what the real APIs throttle/fail with
+INJECTED_ERROR_STATUSES = [429, 500, 503]
+
+
+def load_fixture(name: str) -> dict:
+    """Load a recorded upstream response from the fixtures directory."""
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def parse_latency(spec: str, rng: random.Random) -> Callable[[], float]:
+    """
+    Build a latency sampler (returning seconds) from a spec string.
+
+    Supported specs, all in milliseconds:
+    - fixed:MS
+    - uniform:LOW,HIGH
+    - normal:MEAN,STDDEV
+    - lognormal:MU,SIGMA  (parameters of the underlying normal, in log-ms)
+    """
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",")] if args else []
+
+    if kind == "fixed":
+        return lambda: values[0] / 1000
+    if kind == "uniform":
+        return lambda: rng.uniform(values[0], values[1]) / 1000
+    if kind == "normal":
+        return lambda: max(0.0, rng.gauss(values[0], values[1])) / 1000
+    if kind == "lognormal":
+        return lambda: rng.lognormvariate(values[0], values[1]) / 1000
+    raise ValueError(f"Unknown latency spec: {spec}")
+
+
+def section_response(parse_response: dict, prompt: str) -> dict:
+    """The parse fixture cut down to the === SECTION === blocks named in the prompt."""
+    text = parse_response["candidates"][0]["content"]["parts"][0]["text"]
+    blocks = re.split(r"(?m)^(?==== [A-Z_]+ ===)", text)
+    kept = "".join(block for block in blocks if block.split("\n", 1)[0].strip() in prompt)
+    candidate = dict(parse_response["candidates"][0], content={"parts": [{"text": kept}], "role": "model"})
+    return dict(parse_response, candidates=[candidate])
+
+
+def repeat_experience(parse_response: dict, times: int) -> dict:
+    """The parse fixture with its experience entries repeated, for rendering multi-page PDFs."""
+    text = parse_response["candidates"][0]["content"]["parts"][0]["text"]
+    blocks = re.split(r"(?m)^(?==== [A-Z_]+ ===)", text)
+    for i, block in enumerate(blocks):
+        header, _, body = block.partition("\n")
+        if header.strip() == "=== PROFESSIONAL_EXPERIENCE ===":
+            blocks[i] = f"{header}\n" + "\n".join([body.strip()] * times) + "\n\n"
+    candidate = dict(parse_response["candidates"][0], content={"parts": [{"text": "".join(blocks)}], "role": "model"})
+    return dict(parse_response, candidates=[candidate])
+
+
+def create_app(
+    serpapi_latency: str = "fixed:0",
+    gemini_latency: str = "fixed:0",
+    error_rate: float = 0.0,
+    seed: int = 42,
+    parse_repeat: int = 1
+) -> FastAPI:
+    """Create the stand-in app with its own seeded RNG so runs are repeatable."""
+    rng = random.Random(seed)
+    latency: Dict[str, Callable[[], float]] = {
+        "serpapi": parse_latency(serpapi_latency, rng),
+        "gemini": parse_latency(gemini_latency, rng),
+    }
+    serpapi_jobs = load_fixture("serpapi_jobs.json")
+    gemini_tailor = load_fixture("gemini_tailor.json")
+    gemini_parse = load_fixture("gemini_parse.json")
+    if parse_repeat > 1:
+        gemini_parse = repeat_experience(gemini_parse, parse_repeat)
+
+    app = FastAPI(title="HirePilot upstream stand-in", docs_url=None, redoc_url=None)
+    app.state.counters = {"serpapi": 0, "gemini": 0, "errors": 0}
+
+    async def simulate(provider: str):
+        """Sleep for a sampled latency and maybe return an injected error response."""
+        app.state.counters[provider] += 1
+        await asyncio.sleep(latency[provider]())
+        if error_rate and rng.random() < error_rate:
+            app.state.counters["errors"] += 1
+            status_code = rng.choice(INJECTED_ERROR_STATUSES)
+            return JSONResponse(
+                status_code=status_code,
+                content={"error": {"code": status_code, "message": "Injected error from fake upstream"}}
+            )
+        return None
+
+    @app.get("/search.json")
+    async def serpapi_search(request: Request):
+        error = await simulate("serpapi")
+        if error:
+            return error
+
+        # google_jobs paginates with an opaque next_page_token; ours is just the offset
+        jobs = serpapi_jobs["jobs_results"]
+        offset = int(request.query_params.get("next_page_token") or 0)
+        page = jobs[offset:offset + SERPAPI_PAGE_SIZE]
+        body = {
+            "search_metadata": serpapi_jobs.get("search_metadata", {}),
+            "search_parameters": dict(request.query_params),
+            "jobs_results": page,
+        }
+        if offset + SERPAPI_PAGE_SIZE < len(jobs):
+            body["serpapi_pagination"] = {"next_page_token": str(offset + SERPAPI_PAGE_SIZE)}
+        return body
+
+    @app.post("/v1beta/models/{model_action}")
+    async def gemini_generate_content(model_action: str, request: Request):
+        error = await simulate("gemini")
+        if error:
+            return error
+
+        payload = await request.json()
+        prompt = "".join(
+            part.get("text", "")
+            for content in payload.get("contents", [])
+            for part in content.get("parts", [])
+        )
+        # The parse prompt asks for === SECTION === output; everything else is a tailoring call
+        if "=== PERSONAL_INFO ===" in prompt:
+            return gemini_parse
+        if "=== PROFESSIONAL_EXPERIENCE ===" in prompt:
+            # Section-level tailoring: answer with just the sections that were sent
+            return section_response(gemini_parse, prompt)
+        return gemini_tailor
+
+    @app.get("/__stats")
+    async def stats():
+        return app.state.counters
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the offline SerpApi/Gemini stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--serpapi-latency", default="fixed:0", help="Latency spec for SerpApi, e.g. lognormal:6.0,0.4")
+    parser.add_argument("--gemini-latency", default="fixed:0", help="Latency spec for Gemini, e.g. uniform:800,2500")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 429/500/503")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--parse-repeat", type=int, default=1,
+                        help="Repeat the parsed experience entries this many times to get longer PDFs")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    app = create_app(args.serpapi_latency, args.gemini_latency, args.error_rate, args.seed, args.parse_repeat)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
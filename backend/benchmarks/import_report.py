@@ -0,0 +1,111 @@
+"""
+Import-time report and cold-start budget check for the API workers.
+
+Imports `main` in fresh interpreters, reports the slowest modules from
+`python -X importtime`, the median cold import time, and the cost still
+deferred to the first request that needs the lazily imported SDKs:
+
+    uv run python -m benchmarks.import_report --budget-ms 800
+
+Exits non-zero when the median cold import exceeds the budget.
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COLD_IMPORT_SNIPPET = """
+import time, warnings
+warnings.simplefilter("ignore")
+start = time.perf_counter()
+import main
+print((time.perf_counter() - start) * 1000)
+"""
+
+DEFERRED_SNIPPET = """
+import json, warnings
+warnings.simplefilter("ignore")
+import main
+from app.services.warmup import preload_heavy_modules
+print(json.dumps(preload_heavy_modules()))
+"""
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, TRACE_EXPORTER="none")
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+
+
+def import_times() -> List[Tuple[str, int, int]]:
+    """(module, self_us, cumulative_us) for every module imported by main."""
+    result = _run("import main", "-X", "importtime", "-W", "ignore")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def cold_import_ms(runs: int) -> List[float]:
+    return [float(_run(COLD_IMPORT_SNIPPET).stdout.strip().splitlines()[-1]) for _ in range(runs)]
+
+
+def deferred_imports() -> Dict[str, float]:
+    return json.loads(_run(DEFERRED_SNIPPET).stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report worker import time against a cold-start budget")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters used for the cold import median")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest top-level packages to show")
+    parser.add_argument("--budget-ms", type=float, default=800.0, help="Cold import budget for `import main`")
+    parser.add_argument("--output", default=None, help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    rows = import_times()
+    # Roll modules up to their top-level package using self time, so nothing is double counted
+    packages: Dict[str, int] = {}
+    for name, self_us, _ in rows:
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+    slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]
+
+    print(f"{'package':30} {'import ms':>10}")
+    for package, self_us in slowest:
+        print(f"{package:30} {self_us / 1000:10.1f}")
+
+    cold = cold_import_ms(args.runs)
+    median = statistics.median(cold)
+    deferred = deferred_imports()
+
+    print(f"\nCold `import main`: median {median:.0f}ms over {args.runs} runs (budget {args.budget_ms:.0f}ms)")
+    print(f"Deferred to first use: {sum(deferred.values()):.0f}ms {deferred}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "cold_import_ms": cold,
+                "cold_import_median_ms": median,
+                "budget_ms": args.budget_ms,
+                "deferred_imports_ms": deferred,
+                "packages_ms": {package: self_us / 1000 for package, self_us in slowest},
+            }, f, indent=2)
+
+    if median > args.budget_ms:
+        print(f"Cold import exceeds the budget by {median - args.budget_ms:.0f}ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
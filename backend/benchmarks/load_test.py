@@ -0,0 +1,304 @@
+"""
+End-to-end load generator for the HirePilot API.
+
+Drives the main routes at a fixed concurrency and reports latency percentiles,
+throughput, error rate and per-worker CPU. Intended to run against the app
+pointed at the offline stand-in (benchmarks/fake_upstream.py):
+
+    uv run python -m benchmarks.load_test --base-url http://127.0.0.1:8003 \\
+        --concurrency 16 --duration 30 --server-pid $(pgrep -of "gunicorn main:app") \\
+        --output results.json
+
+Results are written as JSON so runs from two commits can be compared with
+--compare previous.json.
+"""
+import os
+import sys
+import json
+import math
+import time
+import asyncio
+import argparse
+import subprocess
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+API_KEYS = {"serpapi_key": "load-test", "gemini_api_key": "load-test"}
+
+
+def _fixture_text(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def _fixture_bytes(name: str) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+        return f.read()
+
+
+def _sample_job_description() -> str:
+    jobs = json.loads(_fixture_text("serpapi_jobs.json"))["jobs_results"]
+    return jobs[0]["description"]
+
+
+def build_scenarios() -> Dict[str, Callable[[httpx.AsyncClient], "asyncio.Future"]]:
+    """Map of endpoint name to a coroutine factory issuing one request."""
+    resume_text = _fixture_text("resume_typical.txt")
+    resume_pdf = _fixture_bytes("resume_typical.pdf")
+    job_description = _sample_job_description()
+
+    tailor_body = {
+        "resume_text": resume_text,
+        "job_description": job_description,
+        "job_title": "Backend Engineer",
+        "company_name": "Acme Corp",
+        "api_keys": API_KEYS,
+    }
+    upload_form = {
+        "job_description": job_description,
+        "job_title": "Backend Engineer",
+        "company_name": "Acme Corp",
+        "api_keys": json.dumps(API_KEYS),
+    }
+
+    return {
+        "jobs_search": lambda client: client.post("/api/v1/jobs/search", json={
+            "job_title": "Backend Engineer",
+            "location": "Austin, TX",
+            "job_count": 10,
+            "api_keys": API_KEYS,
+        }),
+        "jobs_search_multi": lambda client: client.post("/api/v1/jobs/search-multi", json={
+            "job_titles": ["Backend Engineer", "Python Developer"],
+            "locations": ["Austin, TX", "Seattle, WA", "Remote"],
+            "job_count": 10,
+            "api_keys": API_KEYS,
+        }),
+        "resume_tailor": lambda client: client.post("/api/v1/resume/tailor", json=tailor_body),
+        "resume_tailor_pdf": lambda client: client.post("/api/v1/resume/tailor-pdf", json=tailor_body),
+        "resume_upload_and_tailor_pdf": lambda client: client.post(
+            "/api/v1/resume/upload-and-tailor-pdf",
+            data=upload_form,
+            files={"file": ("resume.pdf", resume_pdf, "application/pdf")},
+        ),
+        "resume_extract_from_pdf": lambda client: client.post(
+            "/api/v1/resume/extract-from-pdf",
+            files={"file": ("resume.pdf", resume_pdf, "application/pdf")},
+        ),
+    }
+
+
+@dataclass
+class EndpointStats:
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+    status_counts: Dict[str, int] = field(default_factory=dict)
+    elapsed_s: float = 0.0
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(stats: EndpointStats) -> dict:
+    latencies = sorted(stats.latencies_ms)
+    total = len(latencies)
+    return {
+        "requests": total,
+        "errors": stats.errors,
+        "error_rate": round(stats.errors / total, 4) if total else 0.0,
+        "throughput_rps": round(total / stats.elapsed_s, 2) if stats.elapsed_s else 0.0,
+        "status_counts": stats.status_counts,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "mean": round(sum(latencies) / total, 2) if total else 0.0,
+            "max": round(latencies[-1], 2) if latencies else 0.0,
+        },
+    }
+
+
+async def run_endpoint(
+    client: httpx.AsyncClient,
+    request_factory: Callable,
+    concurrency: int,
+    duration: float,
+    max_requests: Optional[int]
+) -> EndpointStats:
+    """Run closed-loop workers against one endpoint until the duration or request cap is hit."""
+    stats = EndpointStats()
+    deadline = time.perf_counter() + duration
+    issued = 0
+
+    async def worker():
+        nonlocal issued
+        while time.perf_counter() < deadline and (max_requests is None or issued < max_requests):
+            issued += 1
+            start = time.perf_counter()
+            try:
+                response = await request_factory(client)
+                await response.aread()
+                status_key = str(response.status_code)
+                if response.status_code >= 400:
+                    stats.errors += 1
+            except httpx.HTTPError as e:
+                status_key = type(e).__name__
+                stats.errors += 1
+            stats.latencies_ms.append((time.perf_counter() - start) * 1000)
+            stats.status_counts[status_key] = stats.status_counts.get(status_key, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    stats.elapsed_s = time.perf_counter() - started
+    return stats
+
+
+def _process_tree(pid: int) -> List[int]:
+    """The server pid plus its direct children (gunicorn workers), Linux only."""
+    pids = [pid]
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                parent = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if parent == pid:
+            pids.append(int(entry))
+    return pids
+
+
+def _cpu_seconds(pid: int) -> Optional[float]:
+    """utime + stime of a process from /proc, in seconds."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def snapshot_cpu(server_pid: Optional[int]) -> Dict[int, float]:
+    if not server_pid:
+        return {}
+    snapshot = {}
+    for pid in _process_tree(server_pid):
+        cpu = _cpu_seconds(pid)
+        if cpu is not None:
+            snapshot[pid] = cpu
+    return snapshot
+
+
+def cpu_report(before: Dict[int, float], after: Dict[int, float], elapsed_s: float) -> dict:
+    report = {}
+    for pid, cpu_after in after.items():
+        used = cpu_after - before.get(pid, cpu_after)
+        report[str(pid)] = {
+            "cpu_seconds": round(used, 3),
+            "cpu_percent": round(100 * used / elapsed_s, 1) if elapsed_s else 0.0,
+        }
+    return report
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args) -> dict:
+    scenarios = build_scenarios()
+    selected = args.endpoints.split(",") if args.endpoints else list(scenarios)
+    unknown = [name for name in selected if name not in scenarios]
+    if unknown:
+        raise SystemExit(f"Unknown endpoints: {', '.join(unknown)}. Choose from: {', '.join(scenarios)}")
+
+    results = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "max_requests": args.requests,
+        },
+        "endpoints": {},
+    }
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        for name in selected:
+            cpu_before = snapshot_cpu(args.server_pid)
+            stats = await run_endpoint(client, scenarios[name], args.concurrency, args.duration, args.requests)
+            cpu_after = snapshot_cpu(args.server_pid)
+
+            summary = summarize(stats)
+            if args.server_pid:
+                summary["workers_cpu"] = cpu_report(cpu_before, cpu_after, stats.elapsed_s)
+            results["endpoints"][name] = summary
+
+            latency = summary["latency_ms"]
+            print(
+                f"{name:32} {summary['requests']:6d} req  {summary['throughput_rps']:8.2f} rps  "
+                f"p50 {latency['p50']:8.1f}ms  p95 {latency['p95']:8.1f}ms  p99 {latency['p99']:8.1f}ms  "
+                f"errors {summary['error_rate']:.2%}"
+            )
+    return results
+
+
+def compare(current: dict, previous: dict) -> None:
+    """Print per-endpoint deltas against an earlier results file."""
+    print(f"\nComparison against {previous['meta'].get('commit') or 'previous run'}:")
+    for name, summary in current["endpoints"].items():
+        old = previous.get("endpoints", {}).get(name)
+        if not old:
+            continue
+        deltas = []
+        for key in ("p50", "p95", "p99"):
+            before, after = old["latency_ms"][key], summary["latency_ms"][key]
+            change = (after - before) / before * 100 if before else 0.0
+            deltas.append(f"{key} {change:+6.1f}%")
+        rps_before, rps_after = old["throughput_rps"], summary["throughput_rps"]
+        rps_change = (rps_after - rps_before) / rps_before * 100 if rps_before else 0.0
+        print(f"{name:32} {'  '.join(deltas)}  rps {rps_change:+6.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the HirePilot API")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8003")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds to drive each endpoint")
+    parser.add_argument("--requests", type=int, default=None, help="Optional cap on requests per endpoint")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--endpoints", default=None, help="Comma-separated subset of endpoints to run")
+    parser.add_argument("--server-pid", type=int, default=None, help="Server (gunicorn master) pid for per-worker CPU")
+    parser.add_argument("--output", default=None, help="Write results JSON to this path")
+    parser.add_argument("--compare", default=None, help="Results JSON from an earlier run to diff against")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(results, json.load(f))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
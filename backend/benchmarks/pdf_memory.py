@@ -0,0 +1,141 @@
+"""
+Peak RSS of the API process under concurrent PDF generation:
+
+    uv run python -m benchmarks.fake_upstream --port 8900 --parse-repeat 200
+    uv run python -m benchmarks.pdf_memory --concurrency 32 --requests 256
+
+Starts uvicorn once per mode against the fake upstream, fires POST
+/generate-pdf-from-text requests with the given concurrency and reads the
+server's VmHWM (peak resident set) from /proc/<pid>/status:
+
+- memory: render cache off and a spool threshold no PDF reaches, so every PDF
+  is held in memory until sent, as before PDFs were spooled;
+- spooled: render cache off and a 64KB spool threshold, so larger PDFs are
+  rendered into temporary files on disk and streamed from there;
+- cached: the default render cache, where every request after the first is
+  answered from the cached file.
+
+--parse-repeat on the fake upstream makes the parsed resume longer, so the
+PDFs are large enough for the difference to show. Linux only.
+"""
+import os
+import sys
+import time
+import signal
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from typing import Dict
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+MODES = {
+    "memory": {"RENDER_CACHE_MAX_MB": "0", "PDF_SPOOL_MAX_KB": str(1024 * 1024)},
+    "spooled": {"RENDER_CACHE_MAX_MB": "0", "PDF_SPOOL_MAX_KB": "64"},
+    "cached": {},
+}
+
+
+def read_status(pid: int) -> Dict[str, int]:
+    """Current and peak resident set of one process in kB."""
+    memory = {}
+    with open(f"/proc/{pid}/status", encoding="utf-8") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("VmRSS", "VmHWM"):
+                memory[key] = int(rest.split()[0])
+    return memory
+
+
+def wait_for_server(base_url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/api/v1/resume/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"uvicorn did not start within {timeout:.0f}s")
+
+
+async def fire(base_url: str, resume_text: str, requests: int, concurrency: int) -> Dict[str, float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    sizes = []
+
+    async def one(client: httpx.AsyncClient, i: int):
+        payload = {
+            # A different text per request, so Gemini is asked to parse every one
+            "tailored_resume_text": f"{resume_text}\n{i}",
+            "job_title": "Backend Engineer",
+            "company_name": "Acme Corp",
+            "api_keys": {"serpapi_key": "bench", "gemini_api_key": "bench"},
+        }
+        async with semaphore:
+            response = await client.post(f"{base_url}/api/v1/resume/generate-pdf-from-text", json=payload)
+            response.raise_for_status()
+            sizes.append(len(response.content))
+
+    start = time.perf_counter()
+    async with httpx.AsyncClient(timeout=300, limits=httpx.Limits(max_connections=concurrency)) as client:
+        await asyncio.gather(*(one(client, i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    return {"seconds": elapsed, "pdf_kb": sum(sizes) / len(sizes) / 1024}
+
+
+def measure_mode(mode: str, args, resume_text: str) -> dict:
+    base_url = f"http://127.0.0.1:{args.port}"
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(
+            os.environ,
+            **MODES[mode],
+            TRACE_EXPORTER="none",
+            HIREPILOT_DATA_DIR=directory,
+            GEMINI_API_BASE_URL=args.upstream,
+        )
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port), "--log-level", "warning"],
+            cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            wait_for_server(base_url)
+            idle = read_status(server.pid)
+            run = asyncio.run(fire(base_url, resume_text, args.requests, args.concurrency))
+            loaded = read_status(server.pid)
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=30)
+    return {"idle_kb": idle["VmRSS"], "peak_kb": loaded["VmHWM"], **run}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak RSS of the API under concurrent PDF generation")
+    parser.add_argument("--requests", type=int, default=256)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--port", type=int, default=8951)
+    parser.add_argument("--modes", default="memory,spooled,cached", help="Comma separated modes to measure")
+    parser.add_argument("--upstream", default="http://127.0.0.1:8900", help="Fake upstream base URL")
+    args = parser.parse_args()
+
+    if not os.path.exists("/proc/self/status"):
+        print("/proc is not available; this report needs Linux")
+        return 1
+
+    with open(os.path.join(FIXTURES_DIR, "resume_typical.txt"), encoding="utf-8") as f:
+        resume_text = f.read()
+
+    print(f"{args.requests} PDFs, {args.concurrency} at a time\n")
+    print(f"{'mode':10} {'PDF size':>10} {'idle RSS':>10} {'peak RSS':>10} {'growth':>10} {'PDFs/s':>8}")
+    for mode in args.modes.split(","):
+        result = measure_mode(mode, args, resume_text)
+        print(f"{mode:10} {result['pdf_kb']:8.0f}KB {result['idle_kb'] / 1024:8.1f}MB {result['peak_kb'] / 1024:8.1f}MB "
+              f"{(result['peak_kb'] - result['idle_kb']) / 1024:8.1f}MB {args.requests / result['seconds']:8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+Memory-per-worker report for the gunicorn deployment, with and without preloading.
+
+Starts gunicorn once per mode (default and GUNICORN_PRELOAD=1), optionally warms
+every worker with a few requests against the fake upstream, then reads
+/proc/<pid>/smaps_rollup for the master and each worker:
+
+    uv run python -m benchmarks.worker_memory --workers 4 --warm-requests 20
+
+USS (private) is what each worker really costs; PSS splits shared pages fairly
+between the processes sharing them. Linux only.
+"""
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+import subprocess
+from typing import Dict, List
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+MODES = {
+    "default": {"GUNICORN_PRELOAD": "0"},
+    "preload": {"GUNICORN_PRELOAD": "1"},
+}
+SMAPS_FIELDS = {
+    "Rss": "rss_kb",
+    "Pss": "pss_kb",
+    "Shared_Clean": "shared_kb",
+    "Shared_Dirty": "shared_kb",
+    "Private_Clean": "uss_kb",
+    "Private_Dirty": "uss_kb",
+}
+
+
+def read_smaps_rollup(pid: int) -> Dict[str, int]:
+    """Rss, Pss, Shared and Private (USS) of one process in kB."""
+    memory = {"rss_kb": 0, "pss_kb": 0, "shared_kb": 0, "uss_kb": 0}
+    with open(f"/proc/{pid}/smaps_rollup", encoding="utf-8") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in SMAPS_FIELDS:
+                memory[SMAPS_FIELDS[key]] += int(rest.split()[0])
+    return memory
+
+
+def worker_pids(master_pid: int) -> List[int]:
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding="utf-8") as f:
+                # The ppid follows the parenthesised command name
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == master_pid:
+            pids.append(int(entry))
+    return sorted(pids)
+
+
+def wait_for_workers(base_url: str, master_pid: int, workers: int, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            healthy = httpx.get(f"{base_url}/api/v1/resume/health", timeout=1).status_code == 200
+            if healthy and len(worker_pids(master_pid)) >= workers:
+                # Give the remaining workers time to finish importing the app
+                time.sleep(2)
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"gunicorn did not start {workers} workers within {timeout:.0f}s")
+
+
+def warm_up(base_url: str, requests: int):
+    """Exercise the PDF pipeline so lazily built state is populated in the workers that serve it."""
+    with open(os.path.join(FIXTURES_DIR, "resume_typical.txt"), encoding="utf-8") as f:
+        resume_text = f.read()
+    payload = {
+        "resume_text": resume_text,
+        "job_description": "Senior Python engineer building FastAPI services.",
+        "job_title": "Backend Engineer",
+        "company_name": "Acme Corp",
+        "api_keys": {"serpapi_key": "bench", "gemini_api_key": "bench"},
+    }
+    with httpx.Client(timeout=60) as client:
+        for _ in range(requests):
+            client.post(f"{base_url}/api/v1/resume/tailor-pdf", json=payload)
+
+
+def measure_mode(mode: str, args) -> dict:
+    env = dict(
+        os.environ,
+        **MODES[mode],
+        TRACE_EXPORTER="none",
+        GEMINI_API_BASE_URL=args.upstream,
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "gunicorn", "main:app",
+            "-w", str(args.workers),
+            "-k", "uvicorn.workers.UvicornWorker",
+            "--bind", f"127.0.0.1:{args.port}",
+        ],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_for_workers(base_url, server.pid, args.workers)
+        if args.warm_requests:
+            warm_up(base_url, args.warm_requests)
+        master = read_smaps_rollup(server.pid)
+        workers = {pid: read_smaps_rollup(pid) for pid in worker_pids(server.pid)}
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=30)
+
+    totals = {key: sum(worker[key] for worker in workers.values()) for key in master}
+    return {
+        "master": master,
+        "workers": list(workers.values()),
+        "worker_totals": totals,
+        "mean_uss_kb": totals["uss_kb"] / max(len(workers), 1),
+        "total_pss_kb": totals["pss_kb"] + master["pss_kb"],
+    }
+
+
+def print_report(results: Dict[str, dict]):
+    print(f"\n{'mode':10} {'workers':>8} {'mean USS':>12} {'mean PSS':>12} {'mean RSS':>12} {'total PSS':>12}")
+    for mode, result in results.items():
+        count = max(len(result["workers"]), 1)
+        totals = result["worker_totals"]
+        print(
+            f"{mode:10} {len(result['workers']):8d} {result['mean_uss_kb'] / 1024:10.1f}MB "
+            f"{totals['pss_kb'] / count / 1024:10.1f}MB {totals['rss_kb'] / count / 1024:10.1f}MB "
+            f"{result['total_pss_kb'] / 1024:10.1f}MB"
+        )
+    if "default" in results and "preload" in results:
+        saved = results["default"]["total_pss_kb"] - results["preload"]["total_pss_kb"]
+        print(f"\nPreloading saves {saved / 1024:.1f}MB of total PSS across master and workers")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare gunicorn memory per worker with and without preloading")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8950)
+    parser.add_argument("--modes", default="default,preload", help="Comma separated modes to measure")
+    parser.add_argument("--warm-requests", type=int, default=0,
+                        help="PDF requests sent before measuring; needs the fake upstream running")
+    parser.add_argument("--upstream", default="http://127.0.0.1:8900", help="Fake upstream base URL used for warm-up")
+    parser.add_argument("--output", default=None, help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        print("smaps_rollup is not available; this report needs Linux 4.14 or newer")
+        return 1
+
+    results = {mode: measure_mode(mode, args) for mode in args.modes.split(",")}
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
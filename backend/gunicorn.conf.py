@@ -0,0 +1,55 @@
+# Gunicorn settings shared by the Procfile and start.sh.
+# Gunicorn loads ./gunicorn.conf.py automatically; command-line flags still take precedence.
+import gc
+import os
+import shutil
+import tempfile
+
+# GUNICORN_PRELOAD=1 imports the app and builds its immutable state (styles, SDK modules)
+# once in the master; forked workers then share those pages copy-on-write.
+preload_app = os.getenv("GUNICORN_PRELOAD", "0") == "1"
+
+# prometheus_client must see this before any worker imports it, so that every
+# worker writes its samples to files that /metrics can aggregate. The directory
+# is reset here because a preloaded app creates its metric files before on_starting.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "hirepilot-metrics"))
+shutil.rmtree(os.environ["PROMETHEUS_MULTIPROC_DIR"], ignore_errors=True)
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+if preload_app:
+    # Avoid leaving freed holes in pages that workers will share (see gc.freeze docs)
+    gc.disable()
+
+
+def on_starting(server):
+    """Optionally preload heavy SDKs and shared state in the master before any worker forks."""
+    # Import Gemini, ReportLab and PyPDF2 once in the master so every forked worker starts with them
+    if preload_app or os.getenv("WARMUP_PRELOAD", "0") == "1":
+        from app.services.warmup import preload_heavy_modules
+
+        timings = preload_heavy_modules()
+        server.log.info(f"Preloaded {', '.join(timings)} in {sum(timings.values()):.0f}ms")
+
+    if preload_app:
+        from app.services.warmup import preload_shared_state
+
+        built = preload_shared_state()
+        server.log.info(f"Built shared state before fork: {', '.join(built)}")
+
+
+def pre_fork(server, worker):
+    """Move everything the master allocated out of reach of the workers' garbage collector."""
+    if preload_app:
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    if preload_app:
+        gc.enable()
+
+
+def child_exit(server, worker):
+    """Drop live gauges of a worker that exited so in-flight counts stay correct."""
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
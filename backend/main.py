@@ -1,15 +1,37 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from app.routes import upload, jobs, resume
 import os
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
+# Load .env before the app modules read their settings from the environment
+load_dotenv()
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from app.routes import upload, jobs, resume, metrics, admin
+from app.services.compression import CompressionMiddleware
+from app.services.job_service import close_http_client
+from app.services.metrics import MetricsMiddleware
+from app.services.tracing import TracingMiddleware, configure_tracing
+from app.services.profiler import ProfilingMiddleware
+from app.services.search_refresher import start_search_refresher
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    refresher = start_search_refresher()
+    yield
+    if refresher:
+        refresher.cancel()
+    await close_http_client()
+
+
 app = FastAPI(
     title="HirePilot API",
     description="AI-powered job search and resume tailoring service",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -23,11 +45,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Content-Location", "X-Tailor-Draft", "X-Tailor-Similarity"],
 )
 
+app.add_middleware(CompressionMiddleware)
+
+configure_tracing()
+
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
+app.add_middleware(ProfilingMiddleware)
+
 app.include_router(upload.router)
 app.include_router(jobs.router)
 app.include_router(resume.router)
+app.include_router(metrics.router)
+app.include_router(admin.router)
 
 @app.get("/")
 async def root():
@@ -36,7 +69,6 @@ async def root():
 if __name__ == "__main__":
     import uvicorn
 
-    load_dotenv()
     host = os.getenv("HOST", "0.0.0.0")  # Default to all interfaces
     port = int(os.getenv("PORT", 8003))  # Default port 8003
 